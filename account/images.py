@@ -0,0 +1,178 @@
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+DEFAULT_THUMBNAIL_SIZES = (64, 256)
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+UPLOAD_DIRECTORY = "profile_pictures"
+
+# The formats every thumbnail is written in, by file extension.
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+# Downscale in integer steps with `Image.reduce` down to three times the target size before resampling.
+REDUCING_GAP = 3.0
+
+
+def get_thumbnail_sizes():
+    return getattr(settings, "PROFILE_PICTURE_THUMBNAIL_SIZES", DEFAULT_THUMBNAIL_SIZES)
+
+
+def get_max_size():
+    return getattr(settings, "PROFILE_PICTURE_MAX_SIZE", DEFAULT_MAX_SIZE)
+
+
+def get_max_upload_size():
+    return getattr(settings, "PROFILE_PICTURE_MAX_UPLOAD_SIZE", DEFAULT_MAX_UPLOAD_SIZE)
+
+
+def get_digest(file):
+    """
+    Returns the SHA-256 hex digest of a file, read in chunks so large uploads are never fully in memory.
+    """
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def get_paths(digest, sizes=None):
+    """
+    Returns the storage paths of the processed versions of a picture, derived from its content only.
+
+    Returns:
+        tuple: The path of the full size JPEG and a dict of thumbnail paths by size, then by extension.
+    """
+    directory = f"{UPLOAD_DIRECTORY}/{digest[:2]}/{digest}"
+    thumbnails = {
+        str(size): {extension: f"{directory}/{size}.{extension}" for extension in THUMBNAIL_FORMATS}
+        for size in sizes or get_thumbnail_sizes()
+    }
+    return f"{directory}/full.jpg", thumbnails
+
+
+def open_image(file, max_size):
+    """
+    Decodes a picture no larger than needed, upright and in RGB.
+
+    For JPEG files `draft` has the decoder scale by a power of two while decoding, so a 24 megapixel photo
+    is never decoded at full size. The EXIF orientation is applied since the metadata is dropped.
+    """
+    image = Image.open(file)
+    image.draft("RGB", (max_size, max_size))
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def encode(image, image_format, **options):
+    """
+    Encodes an image without any of the metadata of the upload (EXIF, GPS position, ICC profile, comments).
+    """
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def square(image, size):
+    """
+    Crops the center square of an image and downscales it to `size` pixels.
+    """
+    width, height = image.size
+    side = min(width, height)
+    box = ((width - side) // 2, (height - side) // 2, (width + side) // 2, (height + side) // 2)
+    return image.resize((size, size), Image.LANCZOS, box=box, reducing_gap=REDUCING_GAP)
+
+
+def render_picture(file, sizes=None, max_size=None):
+    """
+    Renders the full size version and the square thumbnails of a picture.
+
+    The picture is decoded once; each thumbnail is resampled from the previous, larger one, so the cost is
+    dominated by the first, bounded, decode.
+
+    Args:
+        file: The uploaded picture.
+        sizes (iterable, optional): The thumbnail sizes in pixels; `PROFILE_PICTURE_THUMBNAIL_SIZES`.
+        max_size (int, optional): The longest side of the full size version; `PROFILE_PICTURE_MAX_SIZE`.
+
+    Returns:
+        tuple: The full size JPEG and a dict of encoded thumbnails by size, then by extension.
+
+    Raises:
+        OSError: If the file is not a picture Pillow can decode.
+    """
+    sizes = sorted(sizes or get_thumbnail_sizes(), reverse=True)
+    max_size = max_size or get_max_size()
+    file.seek(0)
+    image = open_image(file, max_size)
+    image.thumbnail((max_size, max_size), Image.LANCZOS, reducing_gap=REDUCING_GAP)
+    image_format, options = THUMBNAIL_FORMATS["jpg"]
+    full = encode(image, image_format, **options)
+
+    thumbnails = {}
+    for size in sizes:
+        image = square(image, min(size, *image.size))
+        thumbnails[str(size)] = {
+            extension: encode(image, thumbnail_format, **thumbnail_options)
+            for extension, (thumbnail_format, thumbnail_options) in THUMBNAIL_FORMATS.items()
+        }
+    return full, thumbnails
+
+
+def save_once(path, content):
+    """
+    Writes a file unless its content-addressed path already exists.
+    """
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(content))
+
+
+def process_picture(file):
+    """
+    Stores the processed versions of a profile picture under paths derived from its content.
+
+    The same picture uploaded twice, by one user or many, is processed and stored once: the paths of an
+    already processed picture are returned without decoding it.
+
+    Args:
+        file: The uploaded picture, a `File`.
+
+    Returns:
+        tuple: The path of the full size version and a dict of thumbnail paths by size, then by extension.
+    """
+    full_path, thumbnail_paths = get_paths(get_digest(file))
+    if default_storage.exists(full_path) and all(default_storage.exists(path)
+                                                 for paths in thumbnail_paths.values() for path in paths.values()):
+        return full_path, thumbnail_paths
+
+    full, thumbnails = render_picture(file, sizes=[int(size) for size in thumbnail_paths])
+    for size, paths in thumbnail_paths.items():
+        for extension, path in paths.items():
+            save_once(path, thumbnails[size][extension])
+    save_once(full_path, full)
+    return full_path, thumbnail_paths
+
+
+def get_thumbnail_urls(thumbnails):
+    """
+    Maps the stored thumbnail paths of a profile to their URLs, without touching the storage.
+    """
+    return {
+        size: {extension: default_storage.url(path) for extension, path in paths.items()}
+        for size, paths in (thumbnails or {}).items()
+    }
@@ -0,0 +1,38 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+
+from account.images import process_picture
+from account.models import TeacherProfile
+from classroom.models import Classroom
+from classroom.response_cache import bump_generation
+from jobs.registry import job
+
+
+@job("account.process_profile_picture")
+def process_profile_picture(model, profile_id, name):
+    """
+    Replaces the uploaded profile picture of a profile by its processed, content-addressed versions.
+
+    The job is skipped if the profile is gone or its picture was replaced since the job was queued; the
+    raw upload is deleted once the profile points to the processed picture. The picture is written with a
+    bulk update, which sends no `post_save`, so the classrooms of a teacher are moved to a new generation
+    here, as their cached responses embed the teacher's thumbnails.
+
+    Args:
+        model (str): The label of the profile model, `account.teacherprofile` or `account.studentprofile`.
+        profile_id (str): The id of the profile.
+        name (str): The storage name of the uploaded picture.
+    """
+    profiles = apps.get_model(model).objects.filter(pk=profile_id, profile_picture=name)
+    profile = profiles.first()
+    if profile is None:
+        return {"skipped": True}
+
+    with profile.profile_picture.open("rb") as file:
+        full_path, thumbnails = process_picture(file)
+    if profiles.update(profile_picture=full_path, profile_picture_thumbnails=thumbnails):
+        if profiles.model is TeacherProfile:
+            bump_generation(*Classroom.objects.filter(teacher_id=profile.pk).values_list("id", flat=True))
+        if name != full_path:
+            default_storage.delete(name)
+    return {"profile_picture": full_path, "thumbnails": thumbnails}
@@ -0,0 +1,52 @@
+import re
+
+from account.images import UPLOAD_DIRECTORY
+from account.models import StudentProfile, TeacherProfile
+from classroom.membership import get_membership
+from classroom.models import Classroom, StudentClassroom
+
+# Processed pictures live in a directory named after their digest, see `account.images.get_paths`.
+PROCESSED_PICTURE_RE = re.compile(rf"^({UPLOAD_DIRECTORY}/[0-9a-f]{{2}}/[0-9a-f]{{64}}/)[^/]+$")
+
+
+def get_picture_lookup(name):
+    """
+    Returns the lookup of the profiles whose picture is the media file `name`.
+
+    A processed picture is matched by its directory, shared by its full size version (the value of the
+    field) and its thumbnails; a picture not processed yet is matched by its name.
+    """
+    match = PROCESSED_PICTURE_RE.match(name)
+    if match:
+        return {"profile_picture__startswith": match.group(1)}
+    return {"profile_picture": name}
+
+
+def can_view_picture(request, name):
+    """
+    Returns True if the request user may see the profile picture stored as `name`.
+
+    A picture is visible to its owner, to staff users and to the users sharing a classroom with its
+    owner. Identical pictures are stored once, so the file is visible if any of its owners is.
+
+    Returns:
+        bool: Whether the picture is visible, or None if no profile uses this file.
+    """
+    lookup = get_picture_lookup(name)
+    teacher_owners = dict(TeacherProfile.objects.filter(**lookup).values_list("id", "user_id"))
+    student_owners = dict(StudentProfile.objects.filter(**lookup).values_list("id", "user_id"))
+    if not teacher_owners and not student_owners:
+        return None
+
+    user = request.user
+    if user.is_staff or user.pk in teacher_owners.values() or user.pk in student_owners.values():
+        return True
+
+    classroom_ids = get_membership(request).classroom_ids
+    if not classroom_ids:
+        return False
+    return (
+        Classroom.objects.filter(teacher_id__in=teacher_owners, id__in=classroom_ids).exists()
+        or StudentClassroom.objects.filter(student_id__in=student_owners, classroom_id__in=classroom_ids,
+                                           classroom__is_deleting=False).exists()
+    )
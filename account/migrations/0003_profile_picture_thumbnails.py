@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='profile_picture_thumbnails',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Profile Picture Thumbnails'),
+        ),
+        migrations.AddField(
+            model_name='teacherprofile',
+            name='profile_picture_thumbnails',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Profile Picture Thumbnails'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0003_profile_picture_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='profile_picture',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='profile_pictures/', verbose_name='Profile Picture'),
+        ),
+        migrations.AlterField(
+            model_name='teacherprofile',
+            name='profile_picture',
+            field=models.ImageField(blank=True, db_index=True, null=True, upload_to='profile_pictures/', verbose_name='Profile Picture'),
+        ),
+    ]
@@ -13,7 +13,9 @@ class TeacherProfile(models.Model):
                                 related_name="teacher_profile")
     bio = models.TextField(_("Bio"), blank=True, null=True)
     date_of_birth = models.DateField(_("Date of Birth"), blank=True, null=True)
-    profile_picture = models.ImageField(_("Profile Picture"), upload_to='profile_pictures/', blank=True, null=True)
+    profile_picture = models.ImageField(_("Profile Picture"), upload_to='profile_pictures/', blank=True, null=True,
+                                        db_index=True)
+    profile_picture_thumbnails = models.JSONField(_("Profile Picture Thumbnails"), default=dict, blank=True)
     years_of_experience = models.PositiveIntegerField(_("Years of Experience"), blank=True, null=True)
 
     class Meta:
@@ -31,7 +33,9 @@ class StudentProfile(models.Model):
                                 related_name="student_profile")
     bio = models.TextField(_("Bio"), blank=True, null=True)
     date_of_birth = models.DateField(_("Date of Birth"), blank=True, null=True)
-    profile_picture = models.ImageField(_("Profile Picture"), upload_to='profile_pictures/', blank=True, null=True)
+    profile_picture = models.ImageField(_("Profile Picture"), upload_to='profile_pictures/', blank=True, null=True,
+                                        db_index=True)
+    profile_picture_thumbnails = models.JSONField(_("Profile Picture Thumbnails"), default=dict, blank=True)
 
     class Meta:
         verbose_name = _("Student Profile")
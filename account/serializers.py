@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.template.defaultfilters import filesizeformat
 from rest_framework import serializers
 
+from jobs.queue import enqueue
+from .images import get_max_upload_size, get_thumbnail_urls
 from .models import TeacherProfile, StudentProfile
 
 User = get_user_model()
@@ -15,6 +18,7 @@ class BaseProfileSerializer(serializers.ModelSerializer):
     user_last_login = serializers.DateTimeField(source="user.last_login", read_only=True)
     user_first_name = serializers.CharField(source="user.first_name", allow_blank=True, required=False)
     user_last_name = serializers.CharField(source="user.last_name", allow_blank=True, required=False)
+    profile_picture_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         abstract = True
@@ -31,6 +35,16 @@ class BaseProfileSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Not a valid string.")
         return value
 
+    def validate_profile_picture(self, value):
+        if value and value.size > get_max_upload_size():
+            raise serializers.ValidationError(
+                f"The picture must not be larger than {filesizeformat(get_max_upload_size())}."
+            )
+        return value
+
+    def get_profile_picture_thumbnails(self, obj) -> dict:
+        return get_thumbnail_urls(obj.profile_picture_thumbnails)
+
     def is_valid(self, raise_exception=False):
         self.invalid_fields = []
         for field in self.initial_data:
@@ -57,11 +71,20 @@ class BaseProfileSerializer(serializers.ModelSerializer):
                 user.last_name = user_data["last_name"]
             user.save()
 
+        # The thumbnails of a new picture are rendered by a background job, see `account.jobs`
+        picture_changed = "profile_picture" in validated_data
+        if picture_changed:
+            instance.profile_picture_thumbnails = {}
+
         # Update profile fields
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
 
+        if picture_changed and instance.profile_picture:
+            enqueue("account.process_profile_picture", {"model": instance._meta.label_lower, "profile_id": instance.pk,
+                                                        "name": instance.profile_picture.name}, user=instance.user)
+
         return instance
 
 
@@ -69,7 +92,7 @@ class TeacherProfileSerializer(BaseProfileSerializer):
     class Meta(BaseProfileSerializer.Meta):
         model = TeacherProfile
         fields = BaseProfileSerializer.Meta.fields + (
-            "id", "bio", "date_of_birth", "years_of_experience", "profile_picture",)
+            "id", "bio", "date_of_birth", "years_of_experience", "profile_picture", "profile_picture_thumbnails",)
         extra_kwargs = {
             "id": {
                 "read_only": True,
@@ -80,7 +103,8 @@ class TeacherProfileSerializer(BaseProfileSerializer):
 class StudentProfileSerializer(BaseProfileSerializer):
     class Meta(BaseProfileSerializer.Meta):
         model = StudentProfile
-        fields = BaseProfileSerializer.Meta.fields + ("id", "bio", "date_of_birth", "profile_picture")
+        fields = BaseProfileSerializer.Meta.fields + ("id", "bio", "date_of_birth", "profile_picture",
+                                                    "profile_picture_thumbnails")
         extra_kwargs = {
             "id": {
                 "read_only": True,
@@ -0,0 +1,116 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from rest_framework import status
+
+from account.images import get_digest, process_picture, render_picture
+from account.jobs import process_profile_picture
+from account.models import TeacherProfile
+from classroom.models import Classroom
+from classroom.response_cache import get_generation
+from classroom.serializers import TeacherProfileSerializerForClassroom
+from jobs.models import Job
+from jobs.queue import run_worker
+from .test_setup import TestSetup
+
+
+def build_picture(size=(1200, 800), image_format="JPEG", mode="RGB", exif=True):
+    image = Image.new(mode, size, "red")
+    options = {}
+    if exif:
+        metadata = Image.Exif()
+        metadata[0x0112] = 6  # Orientation: rotated 90 degrees clockwise
+        metadata[0x010F] = "Camera maker"
+        options["exif"] = metadata
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    buffer.name = f"picture.{image_format.lower()}"
+    buffer.seek(0)
+    return buffer
+
+
+@override_settings(PROFILE_PICTURE_THUMBNAIL_SIZES=(32, 128), PROFILE_PICTURE_MAX_SIZE=512)
+class ProfilePictureTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+    def test_render_picture_downscales_rotates_and_strips_metadata(self):
+        full, thumbnails = render_picture(build_picture())
+        image = Image.open(BytesIO(full))
+        self.assertEqual(image.size, (341, 512))
+        self.assertEqual(len(image.getexif()), 0)
+
+        self.assertEqual(set(thumbnails), {"32", "128"})
+        for size, encoded in thumbnails.items():
+            self.assertEqual(set(encoded), {"webp", "jpg"})
+            webp, jpeg = Image.open(BytesIO(encoded["webp"])), Image.open(BytesIO(encoded["jpg"]))
+            self.assertEqual((webp.format, jpeg.format), ("WEBP", "JPEG"))
+            self.assertEqual(webp.size, (int(size), int(size)))
+            self.assertEqual(len(jpeg.getexif()), 0)
+
+    def test_render_picture_flattens_transparency_and_never_upscales(self):
+        full, thumbnails = render_picture(build_picture((100, 60), "PNG", "RGBA", exif=False))
+        self.assertEqual(Image.open(BytesIO(full)).mode, "RGB")
+        self.assertEqual(Image.open(BytesIO(thumbnails["128"]["jpg"])).size, (60, 60))
+
+    def test_process_picture_stores_content_addressed_files_once(self):
+        picture = File(build_picture())
+        full_path, thumbnails = process_picture(picture)
+        self.assertIn(get_digest(picture), full_path)
+        self.assertTrue(default_storage.exists(full_path))
+        self.assertTrue(all(default_storage.exists(path) for paths in thumbnails.values() for path in paths.values()))
+
+        self.assertEqual(process_picture(File(build_picture())), (full_path, thumbnails))
+        self.assertNotEqual(process_picture(File(build_picture(size=(900, 900))))[0], full_path)
+
+    def test_upload_is_processed_by_a_background_job(self):
+        response = self.client.put(self.teachers_detail_url, data={"profile_picture": build_picture()},
+                                   format="multipart", headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["profile_picture_thumbnails"], {})
+        upload_name = TeacherProfile.objects.get(id=self.teacher_profile.id).profile_picture.name
+        job = Job.objects.get(name="account.process_profile_picture")
+        self.assertEqual(job.created_by, self.teacher)
+
+        run_worker(once=True)
+        profile = TeacherProfile.objects.get(id=self.teacher_profile.id)
+        self.assertTrue(profile.profile_picture.name.endswith("/full.jpg"))
+        self.assertFalse(default_storage.exists(upload_name))
+
+        response = self.client.get(self.teachers_detail_url,
+                                   headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        thumbnails = response.data["profile_picture_thumbnails"]
+        self.assertTrue(thumbnails["128"]["webp"].startswith("/media/profile_pictures/"))
+        self.assertEqual(TeacherProfileSerializerForClassroom(profile).data["profile_picture_thumbnails"], thumbnails)
+        self.assertNotIn("profile_picture", TeacherProfileSerializerForClassroom(profile).data)
+
+    def test_job_of_a_replaced_picture_is_skipped(self):
+        self.teacher_profile.profile_picture.save("old.jpg", ContentFile(build_picture().read()))
+        result = process_profile_picture("account.teacherprofile", str(self.teacher_profile.id), "other.jpg")
+        self.assertEqual(result, {"skipped": True})
+
+    def test_job_moves_the_teacher_classrooms_to_a_new_generation(self):
+        classroom = Classroom.objects.create(name="classroom", teacher=self.teacher_profile)
+        self.teacher_profile.profile_picture.save("upload.jpg", ContentFile(build_picture().read()))
+        generation = get_generation(classroom.id)
+        process_profile_picture("account.teacherprofile", str(self.teacher_profile.id),
+                                self.teacher_profile.profile_picture.name)
+        self.assertNotEqual(get_generation(classroom.id), generation)
+
+    @override_settings(PROFILE_PICTURE_MAX_UPLOAD_SIZE=100)
+    def test_upload_larger_than_the_limit(self):
+        response = self.client.put(self.teachers_detail_url, data={"profile_picture": build_picture()},
+                                   format="multipart", headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("profile_picture", response.data)
+        self.assertFalse(Job.objects.exists())
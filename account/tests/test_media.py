@@ -0,0 +1,120 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile, File
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from account.images import process_picture
+from account.models import StudentProfile, TeacherProfile
+from account.tests.test_images import build_picture
+from classroom.tests.test_setup import TestSetUp
+
+
+class ProfilePictureAPIViewTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        media_override = override_settings(MEDIA_ROOT=self.media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+
+        full_path, thumbnails = process_picture(File(build_picture()))
+        TeacherProfile.objects.filter(id=self.teacher_profile.id).update(profile_picture=full_path,
+                                                                         profile_picture_thumbnails=thumbnails)
+        self.thumbnail_url = reverse("media", kwargs={"path": thumbnails["64"]["webp"]})
+        self.student_profile.profile_picture.save("raw.jpg", ContentFile(build_picture().read()))
+        self.student_picture_url = reverse("media", kwargs={"path": self.student_profile.profile_picture.name})
+
+    def get(self, url, token, **headers):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token}", **headers})
+
+    def read(self, response):
+        return b"".join(response.streaming_content)
+
+    def test_view_with_unauthenticated_user(self):
+        self.assertEqual(self.client.get(self.thumbnail_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_picture_loaded_without_an_authorization_header(self):
+        # As an `<img src>` does, with the token in the URL.
+        response = self.client.get(self.thumbnail_url, {"access_token": self.student_access_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(self.read(response))
+        response = self.client.get(self.thumbnail_url, {"access_token": self.student2_access_token})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(self.thumbnail_url, {"access_token": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_unknown_file(self):
+        response = self.get(reverse("media", kwargs={"path": "profile_pictures/missing.jpg"}),
+                            self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.get(reverse("media", kwargs={"path": "../settings.py"}), self.admin_access_token)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_pictures_are_visible_to_classroom_co_members_only(self):
+        self.assertEqual(self.get(self.thumbnail_url, self.teacher_access_token).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(self.thumbnail_url, self.student_access_token).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(self.thumbnail_url, self.admin_access_token).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(self.thumbnail_url, self.student2_access_token).status_code,
+                         status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get(self.thumbnail_url, self.teacher2_access_token).status_code,
+                         status.HTTP_403_FORBIDDEN)
+
+        self.assertEqual(self.get(self.student_picture_url, self.teacher_access_token).status_code,
+                         status.HTTP_200_OK)
+        self.assertEqual(self.get(self.student_picture_url, self.teacher2_access_token).status_code,
+                         status.HTTP_403_FORBIDDEN)
+
+    def test_identical_pictures_are_visible_through_any_owner(self):
+        picture = TeacherProfile.objects.get(id=self.teacher_profile.id).profile_picture.name
+        StudentProfile.objects.filter(id=self.student2_profile.id).update(profile_picture=picture)
+        self.assertEqual(self.get(self.thumbnail_url, self.teacher2_access_token).status_code, status.HTTP_200_OK)
+
+    def test_repeated_load_is_not_modified(self):
+        response = self.get(self.thumbnail_url, self.student_access_token, Accept="image/webp")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        body = self.read(response)
+        self.assertEqual(int(response["Content-Length"]), len(body))
+
+        etag = response["ETag"]
+        response = self.get(self.thumbnail_url, self.student_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_range_requests(self):
+        full = self.read(self.get(self.thumbnail_url, self.teacher_access_token))
+
+        response = self.get(self.thumbnail_url, self.teacher_access_token, Range="bytes=10-19")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(full)}")
+        self.assertEqual(self.read(response), full[10:20])
+
+        response = self.get(self.thumbnail_url, self.teacher_access_token, Range="bytes=-5")
+        self.assertEqual(self.read(response), full[-5:])
+
+        response = self.get(self.thumbnail_url, self.teacher_access_token, Range=f"bytes={len(full)}-")
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(full)}")
+
+        response = self.get(self.thumbnail_url, self.teacher_access_token, Range="bytes=0-9", If_Range='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.read(response), full)
+
+    def test_transfer_is_delegated_to_the_front_proxy(self):
+        path = TeacherProfile.objects.get(id=self.teacher_profile.id).profile_picture_thumbnails["64"]["webp"]
+        with override_settings(MEDIA_SENDFILE_HEADER="X-Accel-Redirect"):
+            response = self.get(self.thumbnail_url, self.student_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{path}")
+        self.assertNotIn("Content-Type", response)
+        self.assertEqual(response.content, b"")
+
+        with override_settings(MEDIA_SENDFILE_HEADER="X-Sendfile"):
+            response = self.get(self.thumbnail_url, self.student_access_token)
+        self.assertEqual(response["X-Sendfile"], f"{self.media_root}/{path}")
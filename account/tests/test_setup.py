@@ -10,6 +10,10 @@ from ..models import TeacherProfile, StudentProfile
 
 User = get_user_model()
 
+# A cache outside the database, like Redis in production, for the tests counting the queries of cache hits
+# or sending concurrent requests, which would lock the cache table of an SQLite test database.
+MEMORY_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 
 class TestSetup(APITestCase):
     def setUp(self):
@@ -1,18 +1,24 @@
 from django.contrib.auth import get_user_model
+from django.db.models import F
 from django.http import Http404
 from django_filters import rest_framework as filters
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from account.filters import TeacherProfileFilter, StudentProfileFilter
+from account.media import can_view_picture
 from account.models import TeacherProfile, StudentProfile
 from account.permissions import IsProfileOwnerOrReadOnly
 from account.serializers import TeacherProfileSerializer, StudentProfileSerializer
+from authuser.authentication import get_query_parameter_authenticators
 from authuser.serializers import ErrorResponseSerializer
+from quiz_room_hub.media import serve_media
+from quiz_room_hub.pagination import DateJoinedCursorPagination
 
 User = get_user_model()
 
@@ -36,6 +42,7 @@ class TeacherProfileListAPIView(ListAPIView):
         queryset: The queryset used to retrieve the teacher profiles.
         serializer_class: The serializer class used to serialize the teacher profile data.
         permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the most recently joined users first.
         filter_backends: The list of filter backends used for filtering teacher profiles.
         filterset_class: The filter set class used to define the filter criteria.
 
@@ -50,9 +57,10 @@ class TeacherProfileListAPIView(ListAPIView):
         - `200 OK`: Successfully retrieved the list of teacher profiles.
         - `403 Forbidden`: If the user does not have the required permissions to access the view.
     """
-    queryset = TeacherProfile.objects.all()
+    queryset = TeacherProfile.objects.select_related("user").annotate(date_joined=F("user__date_joined"))
     serializer_class = TeacherProfileSerializer
     permission_classes = [IsAuthenticated, IsAdminUser, ]
+    pagination_class = DateJoinedCursorPagination
     filter_backends = [filters.DjangoFilterBackend, ]
     filterset_class = TeacherProfileFilter
 
@@ -209,6 +217,7 @@ class StudentProfileListAPIView(ListAPIView):
         queryset: The queryset of StudentProfile instances to be listed.
         serializer_class: The serializer class used to serialize the student profile data.
         permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the most recently joined users first.
         filter_backends: The filter backends used to filter the queryset.
         filterset_class: The filterset class used to filter student profiles based on query parameters.
 
@@ -220,9 +229,10 @@ class StudentProfileListAPIView(ListAPIView):
         - `401 Unauthorized`: If the user is not authenticated.
         - `403 Forbidden`: If the user does not have admin privileges.
     """
-    queryset = StudentProfile.objects.all()
+    queryset = StudentProfile.objects.select_related("user").annotate(date_joined=F("user__date_joined"))
     serializer_class = StudentProfileSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = DateJoinedCursorPagination
     filter_backends = [filters.DjangoFilterBackend, ]
     filterset_class = StudentProfileFilter
 
@@ -315,3 +325,65 @@ class StudentProfileRetrieveUpdateDestroyAPIView(APIView):
         user = User.objects.get(id=student_profile.user.id)
         user.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfilePictureAPIView(APIView):
+    """
+    API view serving the profile pictures stored under MEDIA_URL.
+
+    The picture is served only if the authenticated user can see its owner's profile in a classroom, see
+    `account.media.can_view_picture`. The file itself is sent by the front proxy (`X-Accel-Redirect` or
+    `X-Sendfile`) when `MEDIA_SENDFILE_HEADER` is set, or streamed by Django with a strong ETag and range
+    support otherwise, see `quiz_room_hub.media.serve_media`.
+
+    Besides the Authorization header, the access token is accepted in the `access_token` query parameter,
+    as the browsers loading a picture with `<img src>` send no header.
+
+    Permissions:
+    - `IsAuthenticated`: Ensures that the user is logged in.
+
+    Methods:
+    - `get`: Handles `GET` requests to retrieve a profile picture or one of its thumbnails.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_authenticators(self):
+        return get_query_parameter_authenticators()
+
+    def perform_content_negotiation(self, request, force=False):
+        # Browsers ask for pictures with `Accept: image/*`, which no renderer matches; the errors are JSON.
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        responses={
+            (200, "application/octet-stream"): bytes,
+            (206, "application/octet-stream"): bytes,
+            304: None,
+            403: ErrorResponseSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, path, *args, **kwargs):
+        """
+        Handle GET requests to retrieve a profile picture.
+
+        Args:
+            request: The HTTP request object.
+            path (str): The name of the file under MEDIA_ROOT.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            HttpResponse: The picture, a 304 if the client's copy is current, or a response delegating the
+            transfer to the front proxy.
+
+        Raises:
+            Http404: If no profile uses the file or the file does not exist.
+            PermissionDenied: If the user shares no classroom with the owner of the picture.
+        """
+        visible = can_view_picture(request, path)
+        if visible is None:
+            raise Http404
+        if not visible:
+            raise PermissionDenied
+        return serve_media(request, path)
@@ -6,4 +6,5 @@ class AuthuserConfig(AppConfig):
     name = 'authuser'
 
     def ready(self):
+        import authuser.checks
         import authuser.signals
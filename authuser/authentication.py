@@ -0,0 +1,133 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .revocation import revocation_list
+from .tokens import USER_CLAIMS
+
+User = get_user_model()
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Opt-in JWT authentication that builds the user from the token claims instead of loading it.
+
+    Tokens issued by `authuser.tokens.RoleRefreshToken` carry the user's email, role flags and profile
+    ids. The user is rebuilt as a `User` instance whose other fields are deferred, so it can be used in
+    queries and comparisons like a loaded user, and any deferred field is fetched on first access.
+    Tokens missing one of the claims fall back to the regular database lookup.
+
+    Deactivated and deleted users are rejected through the in-memory `revocation_list`.
+
+    Enable it per view with `authentication_classes` or globally in
+    `REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"]`.
+    """
+
+    def get_user(self, validated_token):
+        if all(claim in validated_token for claim in USER_CLAIMS):
+            user = self.get_user_from_claims(validated_token)
+        else:
+            user = super().get_user(validated_token)
+
+        if revocation_list.is_revoked(user.pk):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def get_user_from_claims(self, validated_token):
+        values = {
+            api_settings.USER_ID_FIELD: validated_token[api_settings.USER_ID_CLAIM],
+            "email": validated_token["email"],
+            "is_teacher": validated_token["is_teacher"],
+            "is_staff": validated_token["is_staff"],
+            "is_superuser": validated_token["is_superuser"],
+            "is_active": True,
+        }
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+        user = User.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
+
+        # Read by `classroom.membership.load_membership` to skip the profile lookup.
+        user.teacher_profile_id = self.get_profile_id(validated_token, "teacher_profile_id")
+        user.student_profile_id = self.get_profile_id(validated_token, "student_profile_id")
+        return user
+
+    @staticmethod
+    def get_profile_id(validated_token, claim):
+        value = validated_token[claim]
+        return uuid.UUID(value) if value else None
+
+
+class QueryParameterJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication reading the access token from the `access_token` query parameter.
+
+    Meant for endpoints consumed by browser APIs that cannot send an Authorization header, such as
+    `EventSource`; list it after the header based classes so the header takes precedence. Tokens in URLs
+    may end up in access logs, so keep it off the regular endpoints.
+    """
+    query_parameter = "access_token"
+
+    def authenticate(self, request):
+        raw_token = request.GET.get(self.query_parameter)
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+def get_query_parameter_authenticators():
+    """
+    Returns the configured authenticators followed by a `QueryParameterJWTAuthentication`, for the endpoints
+    browsers reach without an Authorization header.
+    """
+    authenticators = [authentication() for authentication in drf_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    authenticators.append(QueryParameterJWTAuthentication())
+    return authenticators
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication for the async views of `quiz_room_hub.async_views`.
+
+    Behaves like `JWTAuthentication`, the default authentication class, but loads the user with the async
+    ORM so that authenticating a request does not block the event loop. The token itself is checked in
+    memory, as access tokens are not looked up in the blacklist.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        """
+        Loads the user of a validated token, with the same checks as `JWTAuthentication.get_user`.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
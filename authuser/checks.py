@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.core.checks import Error, Tags, register
+from django.db.models import Q
+
+
+def get_role_mismatches():
+    """
+    Returns the users whose `role` disagrees with the profile tables.
+
+    A user with the teacher role must have a `TeacherProfile` and no `StudentProfile`, a user with the
+    student role must have a `StudentProfile` and no `TeacherProfile`, and staff members and superusers
+    must have no profile at all.
+    """
+    User = get_user_model()
+    no_role = Q(is_staff=True) | Q(is_superuser=True)
+    teacher_role = ~no_role & Q(is_teacher=True)
+    student_role = ~no_role & Q(is_teacher=False)
+    return User.objects.filter(
+        (teacher_role & (Q(teacher_profile__isnull=True) | Q(student_profile__isnull=False)))
+        | (student_role & (Q(student_profile__isnull=True) | Q(teacher_profile__isnull=False)))
+        | (no_role & (Q(teacher_profile__isnull=False) | Q(student_profile__isnull=False)))
+    )
+
+
+@register(Tags.database)
+def check_role_consistency(app_configs=None, databases=None, **kwargs):
+    """
+    Reports users whose `is_teacher` flag disagrees with their profile.
+
+    Role permissions (`classroom.permissions.IsTeacher`, `IsStudent`) trust the flag, so any mismatch
+    would grant or deny access incorrectly. Runs with `manage.py check --database default` and `migrate`.
+    """
+    if not databases:
+        return []
+
+    errors = []
+    for database in databases:
+        emails = list(get_role_mismatches().using(database).values_list("email", flat=True)[:10])
+        if emails:
+            errors.append(
+                Error(
+                    "The role of some users disagrees with their profile: %s." % ", ".join(emails),
+                    hint="Fix the is_teacher, is_staff and is_superuser flags or the profile of these users.",
+                    id="authuser.E001",
+                )
+            )
+    return errors
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def sync_is_teacher_with_profiles(apps, schema_editor):
+    """
+    Aligns the `is_teacher` flag with the profile each user actually has, so role checks can rely on it.
+    """
+    User = apps.get_model("authuser", "User")
+    User.objects.filter(teacher_profile__isnull=False, is_teacher=False).update(is_teacher=True)
+    User.objects.filter(student_profile__isnull=False, is_teacher=True).update(is_teacher=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authuser', '0001_initial'),
+        ('account', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_is_teacher_with_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-17 05:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authuser', '0003_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeletedUser',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='User id')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Deleted at')),
+            ],
+            options={
+                'verbose_name': 'Deleted user',
+                'verbose_name_plural': 'Deleted users',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['is_active'], name='user_is_active_idx'),
+        ),
+    ]
@@ -6,6 +6,9 @@ from .managers import UserManager
 
 
 class User(AbstractUser):
+    TEACHER = "teacher"
+    STUDENT = "student"
+
     username = None
     email = models.EmailField(_("Email Address"), unique=True)
     is_teacher = models.BooleanField(_("Teacher Status"), default=False)
@@ -15,5 +18,42 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["-date_joined", "-id"], name="user_date_joined_idx"),
+            models.Index(fields=["is_active"], name="user_is_active_idx"),
+        ]
+
     def __str__(self):
         return self.email
+
+    @property
+    def role(self):
+        """
+        The role of the user, derived from the `is_teacher` flag without querying the profile tables.
+
+        Staff members and superusers never get a profile (see `authuser.signals`), so they have no role.
+        The `authuser.E001` database check guarantees that the flag and the profile tables agree.
+        """
+        if self.is_staff or self.is_superuser:
+            return None
+        return self.TEACHER if self.is_teacher else self.STUDENT
+
+
+class DeletedUser(models.Model):
+    """
+    Tombstone of a deleted user, which lets every process reject the tokens still issued to the user.
+
+    Tombstones are only kept as long as an access token issued before the deletion may be valid, see
+    `authuser.revocation`.
+    """
+
+    user_id = models.BigIntegerField(_("User id"), primary_key=True)
+    deleted_at = models.DateTimeField(_("Deleted at"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = _("Deleted user")
+        verbose_name_plural = _("Deleted users")
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.deleted_at}"
@@ -0,0 +1,92 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import DeletedUser
+
+DEFAULT_REFRESH_INTERVAL = 30
+
+
+def get_tombstone_cutoff():
+    """
+    Returns the deletion time before which the access tokens of a deleted user have all expired.
+    """
+    return timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+
+
+def record_deletion(user_id):
+    """
+    Stores the tombstone of a deleted user, and drops the tombstones no token can outlive anymore.
+    """
+    DeletedUser.objects.filter(deleted_at__lt=get_tombstone_cutoff()).delete()
+    DeletedUser.objects.create(user_id=user_id)
+
+
+class RevocationList:
+    """
+    In-memory set of user ids whose tokens must be rejected even though they are validly signed.
+
+    The ids of the inactive users and the tombstones of the users deleted within the access token lifetime
+    (`DeletedUser`) are reloaded from the database at most once per refresh interval, and the set is
+    updated immediately in this process by `authuser.signals` when a user is deactivated, reactivated or
+    deleted. Only these ids are held, not the ids of every user. A single thread reloads the set at a time:
+    the others keep using the previous set meanwhile, or wait for the first one to be loaded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._user_ids = set()
+        self._loaded_at = None
+
+    def get_refresh_interval(self):
+        return getattr(settings, "JWT_REVOCATION_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+
+    def is_stale(self):
+        loaded_at = self._loaded_at
+        return loaded_at is None or time.monotonic() - loaded_at > self.get_refresh_interval()
+
+    def reload(self):
+        with self._reload_lock:
+            self._reload()
+
+    def _reload(self):
+        user_ids = set(get_user_model().objects.filter(is_active=False).values_list("id", flat=True))
+        user_ids.update(DeletedUser.objects.filter(deleted_at__gte=get_tombstone_cutoff())
+                        .values_list("user_id", flat=True))
+        with self._lock:
+            self._user_ids = user_ids
+            self._loaded_at = time.monotonic()
+
+    def refresh(self):
+        """
+        Reloads the set once it is older than the refresh interval, unless another thread already does.
+        """
+        if not self._reload_lock.acquire(blocking=self._loaded_at is None):
+            return
+        try:
+            # Another thread may have reloaded the set while this one waited for the lock.
+            if self.is_stale():
+                self._reload()
+        finally:
+            self._reload_lock.release()
+
+    def is_revoked(self, user_id):
+        if self.is_stale():
+            self.refresh()
+        return user_id in self._user_ids
+
+    def revoke(self, user_id):
+        with self._lock:
+            self._user_ids.add(user_id)
+
+    def restore(self, user_id):
+        with self._lock:
+            self._user_ids.discard(user_id)
+
+
+revocation_list = RevocationList()
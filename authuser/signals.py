@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from account.models import TeacherProfile, StudentProfile
+from classroom.membership import load_membership
+from events.activity import publish_access_revoked
+from .revocation import record_deletion, revocation_list
 
 
 @receiver(post_save, sender=get_user_model())
@@ -15,3 +18,24 @@ def create_user_profile(sender, instance, created, **kwargs):
                     TeacherProfile.objects.create(user=instance)
                 else:
                     StudentProfile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=get_user_model())
+def sync_revocation_list(sender, instance, **kwargs):
+    if instance.is_active:
+        revocation_list.restore(instance.pk)
+    else:
+        revocation_list.revoke(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_inactive_user_streams(sender, instance, created, **kwargs):
+    # Deleted users lose their classrooms and enrollments by cascade, which ends their streams.
+    if not created and not instance.is_active:
+        publish_access_revoked(load_membership(instance).classroom_ids, instance.pk)
+
+
+@receiver(post_delete, sender=get_user_model())
+def revoke_deleted_user(sender, instance, **kwargs):
+    record_deletion(instance.pk)
+    revocation_list.revoke(instance.pk)
@@ -0,0 +1,138 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.models import TeacherProfile
+from authuser.authentication import StatelessJWTAuthentication
+from authuser.models import DeletedUser
+from authuser.revocation import RevocationList, revocation_list
+from authuser.tests.test_setup import TestSetup
+from classroom.membership import load_membership
+
+
+class StatelessJWTAuthenticationTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        self.authentication = StatelessJWTAuthentication()
+        self.user = self.User.objects.create_user(email=self.email, password=self.password, is_teacher=True)
+        response = self.client.post(self.login_url, self.user_data)
+        self.access_token = response.data["tokens"]["access"]
+        revocation_list.reload()
+
+    def authenticate(self, token):
+        request = self.factory.get("/", headers={"Authorization": f"Bearer {token}"})
+        return self.authentication.authenticate(request)
+
+    def test_user_is_built_from_claims_without_queries(self):
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(self.access_token)
+            self.assertEqual(user.pk, self.user.pk)
+            self.assertEqual(user.email, self.email)
+            self.assertEqual(user.role, self.User.TEACHER)
+            self.assertEqual(user, self.user)
+        self.assertEqual(token["email"], self.email)
+
+    def test_profile_id_claim_is_used_by_membership(self):
+        user, _ = self.authenticate(self.access_token)
+        self.assertEqual(user.teacher_profile_id, TeacherProfile.objects.get(user=self.user).id)
+        self.assertIsNone(user.student_profile_id)
+        # Only the classrooms query is left, the profile comes from the token.
+        with self.assertNumQueries(1):
+            membership = load_membership(user)
+        self.assertEqual(membership.teacher_id, user.teacher_profile_id)
+
+    def test_deferred_fields_are_loaded_on_access(self):
+        self.User.objects.filter(pk=self.user.pk).update(first_name="Ada")
+        user, _ = self.authenticate(self.access_token)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Ada")
+
+    def test_token_without_claims_falls_back_to_database(self):
+        token = RefreshToken.for_user(self.user).access_token
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(str(token))
+        self.assertEqual(user, self.user)
+        self.assertFalse(hasattr(user, "teacher_profile_id"))
+
+    def test_deactivated_user_is_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.access_token)
+
+    def test_deactivation_is_picked_up_on_reload(self):
+        self.User.objects.filter(pk=self.user.pk).update(is_active=False)
+        revocation_list.reload()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.access_token)
+
+    def test_deleted_user_is_rejected(self):
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.access_token)
+
+    def test_deletion_is_kept_on_reload(self):
+        self.user.delete()
+        revocation_list.reload()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.access_token)
+
+    def test_deletion_by_another_process_is_picked_up_on_reload(self):
+        # The deletion signal only reaches the process that deleted the user.
+        with mock.patch.object(revocation_list, "revoke"):
+            self.user.delete()
+        self.authenticate(self.access_token)
+        revocation_list.reload()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.access_token)
+
+    def test_user_created_by_another_process_is_accepted(self):
+        # Created without signals, as this process's revocation list does not hear about it.
+        user, = self.User.objects.bulk_create([self.User(email="new@example.com", is_teacher=True)])
+        self.assertFalse(revocation_list.is_revoked(user.pk))
+
+    def test_reload_only_holds_revoked_ids(self):
+        inactive = self.User.objects.create_user(email="inactive@example.com", password=self.password,
+                                                 is_active=False)
+        deleted = self.User.objects.create_user(email="deleted@example.com", password=self.password)
+        deleted_id = deleted.pk
+        deleted.delete()
+        revocation_list.reload()
+        self.assertEqual(revocation_list._user_ids, {inactive.pk, deleted_id})
+
+    def test_expired_tombstones_are_dropped(self):
+        self.user.delete()
+        # Every access token of the user expired since the deletion.
+        DeletedUser.objects.update(deleted_at=timezone.now() - timedelta(days=1))
+        revocation_list.reload()
+        self.assertFalse(revocation_list.is_revoked(self.user.pk))
+
+        self.User.objects.create_user(email="other@example.com", password=self.password).delete()
+        self.assertEqual(DeletedUser.objects.count(), 1)
+
+    def test_a_single_thread_reloads_at_a_time(self):
+        revocations = RevocationList()
+        revocations.reload()
+        revocations._loaded_at -= revocations.get_refresh_interval() + 1
+        reloading = threading.Event()
+        release = threading.Event()
+
+        def slow_reload():
+            reloading.set()
+            release.wait(timeout=5)
+
+        with mock.patch.object(revocations, "_reload", side_effect=slow_reload) as reload:
+            thread = threading.Thread(target=revocations.is_revoked, args=(self.user.pk,))
+            thread.start()
+            reloading.wait(timeout=5)
+            # The other threads use the previous set instead of reloading it again or waiting.
+            self.assertFalse(revocations.is_revoked(self.user.pk))
+            release.set()
+            thread.join()
+        self.assertEqual(reload.call_count, 1)
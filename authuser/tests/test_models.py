@@ -5,6 +5,8 @@ from django.db.utils import IntegrityError
 from faker import Faker
 from rest_framework.test import APITestCase
 
+from authuser.checks import check_role_consistency, get_role_mismatches
+
 
 class UserModelTests(APITestCase):
     def setUp(self):
@@ -40,3 +42,46 @@ class UserModelTests(APITestCase):
         date_joined = user.date_joined
         date_now = datetime.datetime.now(tz=datetime.timezone.utc)
         self.assertTrue(date_now - date_joined < datetime.timedelta(seconds=1))
+
+    def test_role_of_teacher(self):
+        user = self.User.objects.create_user(email=self.email, password=self.password, is_teacher=True)
+        self.assertEqual(user.role, self.User.TEACHER)
+
+    def test_role_of_student(self):
+        user = self.User.objects.create_user(email=self.email, password=self.password)
+        self.assertEqual(user.role, self.User.STUDENT)
+
+    def test_role_of_superuser(self):
+        user = self.User.objects.create_superuser(email=self.email, password=self.password)
+        self.assertIsNone(user.role)
+
+
+class RoleConsistencyCheckTests(APITestCase):
+    def setUp(self):
+        self.User = get_user_model()
+        self.fake = Faker()
+        self.teacher = self.User.objects.create_user(email=self.fake.email(), password=self.fake.password(),
+                                                     is_teacher=True)
+        self.student = self.User.objects.create_user(email=self.fake.email(), password=self.fake.password())
+        self.admin = self.User.objects.create_superuser(email=self.fake.email(), password=self.fake.password())
+        return super().setUp()
+
+    def test_consistent_users_pass_the_check(self):
+        self.assertFalse(get_role_mismatches().exists())
+        self.assertEqual(check_role_consistency(databases=["default"]), [])
+
+    def test_flag_disagreeing_with_profile_is_reported(self):
+        self.User.objects.filter(pk=self.student.pk).update(is_teacher=True)
+        self.assertEqual(list(get_role_mismatches()), [self.student])
+        errors = check_role_consistency(databases=["default"])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].id, "authuser.E001")
+        self.assertIn(self.student.email, errors[0].msg)
+
+    def test_staff_user_with_profile_is_reported(self):
+        self.User.objects.filter(pk=self.teacher.pk).update(is_staff=True)
+        self.assertEqual(list(get_role_mismatches()), [self.teacher])
+
+    def test_check_is_skipped_without_databases(self):
+        self.User.objects.filter(pk=self.student.pk).update(is_teacher=True)
+        self.assertEqual(check_role_consistency(), [])
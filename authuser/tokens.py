@@ -0,0 +1,27 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from account.models import StudentProfile, TeacherProfile
+
+# Claims `authuser.authentication.StatelessJWTAuthentication` needs to rebuild the user without a query.
+USER_CLAIMS = ("email", "is_teacher", "is_staff", "is_superuser", "teacher_profile_id", "student_profile_id",)
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's identity and role claims.
+
+    The claims are copied to every access token derived from it, so they survive token refreshes.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        teacher_profile_id = TeacherProfile.objects.filter(user=user).values_list("id", flat=True).first()
+        student_profile_id = StudentProfile.objects.filter(user=user).values_list("id", flat=True).first()
+        token["email"] = user.email
+        token["is_teacher"] = user.is_teacher
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["teacher_profile_id"] = str(teacher_profile_id) if teacher_profile_id else None
+        token["student_profile_id"] = str(student_profile_id) if student_profile_id else None
+        return token
@@ -10,6 +10,7 @@ from datetime import datetime
 from datetime import timezone
 
 from .serializers import RegisterUserSerializer, LoginUserSerializer, ErrorResponseSerializer
+from .tokens import RoleRefreshToken
 
 User = get_user_model()
 
@@ -134,7 +135,7 @@ class LoginUserView(APIView):
         user = serializer.save()
         user.last_login = datetime.now(tz=timezone.utc)
         user.save()
-        token = RefreshToken.for_user(user)
+        token = RoleRefreshToken.for_user(user)
         data = serializer.data
         data["tokens"] = {"refresh": str(token), "access": str(token.access_token)}
         return Response(data, status=status.HTTP_200_OK)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Classroom, StudentClassroom
+from .models import Classroom, ClassroomDeletion, StudentClassroom
 
 admin.site.register(Classroom)
 admin.site.register(StudentClassroom)
+admin.site.register(ClassroomDeletion)
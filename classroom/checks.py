@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Cache backends keeping their entries in the memory of each process.
+PROCESS_LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs=None, **kwargs):
+    """
+    Reports a default cache local to each process.
+
+    Classroom memberships (`classroom.membership`), the generations of the cached classroom responses
+    (`classroom.response_cache`) and quiz analytics (`quiz.analytics`) are cached in the default cache and
+    invalidated by the process making the write, a web worker or a `run_jobs` worker. With a per-process
+    cache, the other processes keep granting access and serving responses from stale entries until they
+    expire.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if backend in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [
+            Error(
+                "The default cache (%s) is local to each process, so cache invalidations do not reach the "
+                "other web and job workers." % backend,
+                hint="Use a cache shared between processes: Redis (set REDIS_URL), Memcached or the database "
+                     "cache.",
+                id="classroom.E001",
+            )
+        ]
+    return []
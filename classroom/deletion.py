@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from classroom.membership import invalidate_memberships
+from events.activity import publish_access_revoked
+from jobs.queue import enqueue
+from classroom.models import Classroom, ClassroomDeletion, StudentClassroom
+from post.models import Comment, CoursePost
+from quiz.analytics import invalidate_analytics
+from quiz.models import Answer, LeaderboardEntry, Question, Quiz, StudentAnswer, StudentQuiz
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Every model hanging off a classroom with the lookup from it to the classroom id, children first so
+# that no batch deletes a row still referenced by a later step.
+PURGE_STEPS = (
+    (StudentAnswer, "answer__question__quiz__classroom_id"),
+    (Answer, "question__quiz__classroom_id"),
+    (Question, "quiz__classroom_id"),
+    (StudentQuiz, "quiz__classroom_id"),
+    (LeaderboardEntry, "classroom_id"),
+    (Quiz, "classroom_id"),
+    (Comment, "post__classroom_id"),
+    (CoursePost, "classroom_id"),
+    (StudentClassroom, "classroom_id"),
+)
+
+
+def get_batch_size():
+    return getattr(settings, "CLASSROOM_PURGE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+def request_deletion(classroom, user=None):
+    """
+    Marks a classroom as being deleted and queues the purge of its rows.
+
+    From then on the classroom is hidden by `Classroom.objects` and has no members, so every endpoint
+    treats it as gone and its event streams end, while its rows are purged by the `classroom.purge` job
+    (see `classroom.jobs`) in a `run_jobs` worker. The job is queued in the same transaction, so no
+    request is left without one.
+
+    Args:
+        classroom (Classroom): The classroom to delete.
+        user (User, optional): The user requesting the deletion, who can follow the job.
+
+    Returns:
+        ClassroomDeletion: The record tracking the progress of the purge.
+    """
+    with transaction.atomic():
+        Classroom.all_objects.filter(pk=classroom.pk).update(is_deleting=True)
+        publish_access_revoked([classroom.pk])
+        deletion, created = ClassroomDeletion.objects.get_or_create(classroom_id=classroom.pk,
+                                                                    defaults={"teacher_id": classroom.teacher_id})
+        if created:
+            enqueue("classroom.purge", {"classroom_id": classroom.pk}, user=user)
+    classroom.is_deleting = True
+    return deletion
+
+
+def count_rows(classroom_id):
+    """
+    Returns the number of rows the purge of a classroom deletes, the classroom included.
+    """
+    return 1 + sum(model.objects.filter(**{lookup: classroom_id}).count() for model, lookup in PURGE_STEPS)
+
+
+def delete_batch(model, lookup, classroom_id, batch_size):
+    """
+    Deletes up to `batch_size` rows of a model belonging to a classroom and returns how many were deleted.
+
+    The primary keys are selected first since MySQL cannot limit a DELETE with a subquery. `_raw_delete`
+    then issues a single DELETE without loading the rows nor sending signals; `purge_classroom` deletes
+    children first and performs the cache invalidation of the signal receivers itself.
+    """
+    pks = list(model.objects.filter(**{lookup: classroom_id}).values_list("pk", flat=True)[:batch_size])
+    if not pks:
+        return 0
+    return model.objects.filter(pk__in=pks)._raw_delete(DEFAULT_DB_ALIAS)
+
+
+def purge_classroom(deletion, batch_size=None):
+    """
+    Deletes a classroom and everything attached to it in bounded batches.
+
+    Each batch runs in its own short transaction and adds its row count to the deletion record, so the
+    progress can be polled while the purge runs and an interrupted purge simply resumes where it stopped.
+
+    Args:
+        deletion (ClassroomDeletion): The record of the classroom to purge.
+        batch_size (int, optional): The maximum number of rows deleted per statement.
+    """
+    batch_size = batch_size or get_batch_size()
+    classroom_id = deletion.classroom_id
+    records = ClassroomDeletion.objects.filter(pk=classroom_id)
+
+    if deletion.total_rows is None:
+        deletion.total_rows = count_rows(classroom_id)
+    deletion.status = ClassroomDeletion.RUNNING
+    deletion.save(update_fields=["total_rows", "status"])
+
+    quiz_ids = list(Quiz.objects.filter(classroom_id=classroom_id).values_list("id", flat=True))
+    student_user_ids = list(StudentClassroom.objects.filter(classroom_id=classroom_id)
+                            .values_list("student__user_id", flat=True))
+
+    for model, lookup in PURGE_STEPS:
+        deleted = batch_size
+        while deleted == batch_size:
+            with transaction.atomic():
+                deleted = delete_batch(model, lookup, classroom_id, batch_size)
+                if deleted:
+                    records.update(deleted_rows=F("deleted_rows") + deleted)
+
+    # Nothing references the classroom anymore, so the regular delete only removes its own row.
+    deleted, _ = Classroom.all_objects.filter(pk=classroom_id).delete()
+    records.update(status=ClassroomDeletion.DONE, completed_at=timezone.now(),
+                   deleted_rows=F("deleted_rows") + deleted)
+
+    for quiz_id in quiz_ids:
+        invalidate_analytics(quiz_id)
+    invalidate_memberships(student_user_ids)
+    deletion.refresh_from_db()
+
@@ -0,0 +1,16 @@
+from classroom.deletion import purge_classroom
+from classroom.models import ClassroomDeletion
+from jobs.registry import job
+
+
+@job("classroom.purge")
+def purge(classroom_id, batch_size=None):
+    """
+    Purges a classroom whose deletion was requested, see `classroom.deletion.purge_classroom`.
+
+    A retried purge resumes where the previous attempt stopped.
+    """
+    deletion = ClassroomDeletion.objects.get(classroom_id=classroom_id)
+    if deletion.status != ClassroomDeletion.DONE:
+        purge_classroom(deletion, batch_size=batch_size)
+    return {"classroom_id": classroom_id, "deleted_rows": deletion.deleted_rows}
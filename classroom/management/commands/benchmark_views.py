@@ -0,0 +1,108 @@
+import asyncio
+import statistics
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from authuser.tokens import RoleRefreshToken
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ("Compares the throughput of a sync endpoint served over WSGI and over ASGI with the throughput of "
+            "its async variant served over ASGI.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("sync_path", help="The path of the sync endpoint, e.g. /api/classrooms/<id>/.")
+        parser.add_argument("async_path", help="The path of its async variant, e.g. /api/classrooms/<id>/async/.")
+        parser.add_argument("--email", help="Authenticate the requests as this user.")
+        parser.add_argument("--requests", type=int, default=500, help="Number of requests per run.")
+        parser.add_argument("--concurrency", type=int, default=20,
+                            help="Number of requests in flight: WSGI threads or ASGI tasks.")
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options["email"]:
+            try:
+                user = User.objects.get(email=options["email"])
+            except User.DoesNotExist:
+                raise CommandError("User does not exist.")
+            headers["Authorization"] = f"Bearer {RoleRefreshToken.for_user(user).access_token}"
+
+        requests, concurrency = options["requests"], options["concurrency"]
+        if requests < 1 or concurrency < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+        # Each worker sends its share of the requests one after the other.
+        shares = [requests // concurrency + (index < requests % concurrency) for index in range(concurrency)]
+
+        runs = (
+            ("WSGI, sync view", lambda: self.run_wsgi(options["sync_path"], headers, shares)),
+            ("ASGI, sync view", lambda: asyncio.run(self.run_asgi(options["sync_path"], headers, shares))),
+            ("ASGI, async view", lambda: asyncio.run(self.run_asgi(options["async_path"], headers, shares))),
+        )
+        for label, run in runs:
+            started = time.perf_counter()
+            results = run()
+            elapsed = time.perf_counter() - started
+            self.report(label, results, elapsed)
+
+    def run_wsgi(self, path, headers, shares):
+        """
+        Sends the requests through Django's WSGI request handler, from one thread per worker, like a
+        threaded WSGI server.
+        """
+        results = []
+
+        def work(count):
+            client = Client()
+            for _ in range(count):
+                results.append(self.timed(client.get, path, headers))
+            connections.close_all()
+
+        threads = [threading.Thread(target=work, args=(count,)) for count in shares if count]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    async def run_asgi(self, path, headers, shares):
+        """
+        Sends the requests through Django's ASGI request handler, from one task per worker on a single event
+        loop, like a single ASGI server worker.
+        """
+        async def work(count):
+            client = AsyncClient()
+            return [await self.atimed(client.get, path, headers) for _ in range(count)]
+
+        batches = await asyncio.gather(*(work(count) for count in shares if count))
+        return [result for batch in batches for result in batch]
+
+    @staticmethod
+    def timed(get, path, headers):
+        started = time.perf_counter()
+        response = get(path, headers=headers)
+        return response.status_code, time.perf_counter() - started
+
+    @staticmethod
+    async def atimed(get, path, headers):
+        started = time.perf_counter()
+        response = await get(path, headers=headers)
+        return response.status_code, time.perf_counter() - started
+
+    def report(self, label, results, elapsed):
+        latencies = sorted(latency * 1000 for _, latency in results)
+        median = statistics.median(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        statuses = ", ".join(f"{code}: {count}" for code, count in sorted(Counter(code for code, _ in results).items()))
+        throughput = len(results) / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{label}: {len(results)} requests in {elapsed:.2f}s ({throughput:.0f} requests/sec), "
+            f"p50 {median:.1f}ms, p95 {p95:.1f}ms, statuses {statuses}."
+        )
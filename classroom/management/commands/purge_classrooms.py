@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from classroom.deletion import get_batch_size, purge_classroom
+from classroom.models import ClassroomDeletion
+
+
+class Command(BaseCommand):
+    help = "Purges the classrooms whose deletion was requested, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--classroom-id", help="Only purge this classroom.")
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Maximum number of rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        deletions = ClassroomDeletion.objects.exclude(status=ClassroomDeletion.DONE).order_by("requested_at")
+        if options["classroom_id"]:
+            try:
+                deletions = [deletions.get(classroom_id=options["classroom_id"])]
+            except (ClassroomDeletion.DoesNotExist, ValueError):
+                raise CommandError("No pending deletion for this classroom.")
+
+        batch_size = options["batch_size"] or get_batch_size()
+        purged = 0
+        for deletion in deletions:
+            started = time.perf_counter()
+            purge_classroom(deletion, batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+            purged += 1
+            self.stdout.write(
+                f"Purged classroom {deletion.classroom_id}: {deletion.deleted_rows} rows in {elapsed:.2f}s."
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} classrooms."))
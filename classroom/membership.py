@@ -0,0 +1,188 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from account.models import StudentProfile, TeacherProfile
+from classroom.models import Classroom, StudentClassroom
+
+User = get_user_model()
+
+CACHE_KEY_PREFIX = "classroom-membership"
+DEFAULT_CACHE_TIMEOUT = 60
+
+# Attribute used to memoize the membership on the request for its whole lifetime.
+REQUEST_ATTRIBUTE = "_classroom_membership"
+
+
+class Membership:
+    """
+    Snapshot of the role and classroom memberships of a single user.
+
+    Attributes:
+        teacher_id: The id of the user's `TeacherProfile`, or None.
+        student_id: The id of the user's `StudentProfile`, or None.
+        classroom_ids: The ids of the classrooms the user owns (teachers) or is enrolled in (students).
+    """
+
+    def __init__(self, teacher_id=None, student_id=None, classroom_ids=()):
+        self.teacher_id = teacher_id
+        self.student_id = student_id
+        self.classroom_ids = frozenset(classroom_ids)
+
+    @property
+    def is_teacher(self):
+        return self.teacher_id is not None
+
+    @property
+    def is_student(self):
+        return self.student_id is not None
+
+    def is_member(self, classroom):
+        """
+        Returns True if the user is the teacher of the classroom or a student enrolled in it.
+
+        Classrooms whose deletion was requested have no members anymore.
+        """
+        if classroom.is_deleting:
+            return False
+        if self.teacher_id is not None and classroom.teacher_id == self.teacher_id:
+            return True
+        return classroom.pk in self.classroom_ids
+
+    def is_owner(self, classroom):
+        """
+        Returns True if the user is the teacher who created the classroom, unless its deletion was requested.
+        """
+        return not classroom.is_deleting and self.teacher_id is not None and classroom.teacher_id == self.teacher_id
+
+    def to_cache(self):
+        return {
+            "teacher_id": self.teacher_id,
+            "student_id": self.student_id,
+            "classroom_ids": tuple(self.classroom_ids),
+        }
+
+
+def get_cache_key(user_id):
+    return f"{CACHE_KEY_PREFIX}:{user_id}"
+
+
+def get_cache_timeout():
+    return getattr(settings, "CLASSROOM_MEMBERSHIP_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def load_membership(user):
+    """
+    Loads the membership of a user from the database.
+
+    Costs at most two queries: one to resolve the user's profile (picked from the user's role, and
+    skipped when the profile id came with the token claims) and one to collect the classrooms attached
+    to it.
+    """
+    role = getattr(user, "role", None)
+    if role == User.TEACHER:
+        teacher_id = getattr(user, "teacher_profile_id", None)
+        if teacher_id is None:
+            teacher_id = TeacherProfile.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+        classroom_ids = Classroom.objects.filter(teacher_id=teacher_id).values_list("id", flat=True)
+        return Membership(teacher_id=teacher_id, classroom_ids=classroom_ids)
+
+    if role == User.STUDENT:
+        student_id = getattr(user, "student_profile_id", None)
+        if student_id is None:
+            student_id = StudentProfile.objects.filter(user_id=user.pk).values_list("id", flat=True).first()
+        classroom_ids = StudentClassroom.objects.filter(student_id=student_id).values_list("classroom_id",
+                                                                                           flat=True)
+        return Membership(student_id=student_id, classroom_ids=classroom_ids)
+
+    return Membership()
+
+
+def get_membership(request):
+    """
+    Returns the membership of the request user.
+
+    The membership is resolved once per request and memoized on the request object. Across requests it is
+    served from a short-lived per-user cache entry that is invalidated by `classroom.signals` whenever a
+    profile, a classroom or an enrollment of the user changes.
+    """
+    membership = getattr(request, REQUEST_ATTRIBUTE, None)
+    if membership is not None:
+        return membership
+
+    user = request.user
+    if not user or not user.is_authenticated:
+        membership = Membership()
+    else:
+        key = get_cache_key(user.pk)
+        cached = cache.get(key)
+        if cached is not None:
+            membership = Membership(**cached)
+        else:
+            membership = load_membership(user)
+            cache.set(key, membership.to_cache(), get_cache_timeout())
+
+    setattr(request, REQUEST_ATTRIBUTE, membership)
+    return membership
+
+
+async def aload_membership(user):
+    """
+    Async version of `load_membership`, running the same queries with the async ORM.
+    """
+    role = getattr(user, "role", None)
+    if role == User.TEACHER:
+        teacher_id = getattr(user, "teacher_profile_id", None)
+        if teacher_id is None:
+            teacher_id = await TeacherProfile.objects.filter(user_id=user.pk).values_list("id", flat=True).afirst()
+        classroom_ids = [pk async for pk in Classroom.objects.filter(teacher_id=teacher_id).values_list("id",
+                                                                                                     flat=True)]
+        return Membership(teacher_id=teacher_id, classroom_ids=classroom_ids)
+
+    if role == User.STUDENT:
+        student_id = getattr(user, "student_profile_id", None)
+        if student_id is None:
+            student_id = await StudentProfile.objects.filter(user_id=user.pk).values_list("id", flat=True).afirst()
+        classroom_ids = [pk async for pk in StudentClassroom.objects.filter(student_id=student_id).values_list(
+            "classroom_id", flat=True)]
+        return Membership(student_id=student_id, classroom_ids=classroom_ids)
+
+    return Membership()
+
+
+async def aget_membership(request):
+    """
+    Async version of `get_membership`, sharing its per-request memo and its cache entries.
+    """
+    membership = getattr(request, REQUEST_ATTRIBUTE, None)
+    if membership is not None:
+        return membership
+
+    user = request.user
+    if not user or not user.is_authenticated:
+        membership = Membership()
+    else:
+        key = get_cache_key(user.pk)
+        cached = await cache.aget(key)
+        if cached is not None:
+            membership = Membership(**cached)
+        else:
+            membership = await aload_membership(user)
+            await cache.aset(key, membership.to_cache(), get_cache_timeout())
+
+    setattr(request, REQUEST_ATTRIBUTE, membership)
+    return membership
+
+
+def invalidate_membership(user_id):
+    """
+    Drops the cached membership of the given user so the next request reloads it.
+    """
+    cache.delete(get_cache_key(user_id))
+
+
+def invalidate_memberships(user_ids):
+    """
+    Drops the cached memberships of several users at once.
+    """
+    cache.delete_many([get_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('classroom', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classroom',
+            index=models.Index(fields=['teacher', '-created_at', '-id'], name='classroom_teacher_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentclassroom',
+            index=models.Index(fields=['student', '-date_joined', '-id'], name='student_classroom_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentclassroom',
+            index=models.Index(fields=['classroom', '-date_joined', '-id'], name='classroom_students_joined_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:51
+
+import django.db.models.deletion
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('classroom', '0002_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='classroom',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='classroom',
+            name='is_deleting',
+            field=models.BooleanField(default=False, verbose_name='Classroom is being deleted'),
+        ),
+        migrations.CreateModel(
+            name='ClassroomDeletion',
+            fields=[
+                ('classroom_id', models.UUIDField(editable=False, primary_key=True, serialize=False, verbose_name='Classroom id')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done')], default='pending', max_length=10, verbose_name='Status')),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True, verbose_name='Rows to delete')),
+                ('deleted_rows', models.PositiveIntegerField(default=0, verbose_name='Deleted rows')),
+                ('requested_at', models.DateTimeField(auto_now_add=True, verbose_name='Requested at')),
+                ('completed_at', models.DateTimeField(blank=True, null=True, verbose_name='Completed at')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='classroom_deletions', to='account.teacherprofile', verbose_name='Teacher')),
+            ],
+            options={
+                'verbose_name': 'Classroom deletion',
+                'verbose_name_plural': 'Classroom deletions',
+                'indexes': [models.Index(fields=['status', 'requested_at'], name='classroom_deletion_status_idx')],
+            },
+        ),
+    ]
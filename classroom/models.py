@@ -6,17 +6,34 @@ from django.utils.translation import gettext_lazy as _
 from account.models import TeacherProfile, StudentProfile
 
 
+class ActiveClassroomManager(models.Manager):
+    """
+    Manager hiding the classrooms whose deletion was requested, see `classroom.deletion`.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleting=False)
+
+
 class Classroom(models.Model):
     id = models.UUIDField(_("Classroom id"), primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(_("Classroom name"), max_length=200, blank=False, null=False)
     teacher = models.ForeignKey(TeacherProfile, on_delete=models.CASCADE, related_name="classrooms",
                                 verbose_name=_("Teacher"))
     created_at = models.DateTimeField(_("Classroom created at"), auto_now_add=True)
+    is_deleting = models.BooleanField(_("Classroom is being deleted"), default=False)
+
+    # The first manager is the default one, so the admin and related lookups still see every classroom.
+    all_objects = models.Manager()
+    objects = ActiveClassroomManager()
 
     class Meta:
         verbose_name = _("Classroom")
         verbose_name_plural = _("Classrooms")
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["teacher", "-created_at", "-id"], name="classroom_teacher_created_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -42,6 +59,46 @@ class StudentClassroom(models.Model):
                 name="student-classroom",
             ),
         ]
+        indexes = [
+            models.Index(fields=["student", "-date_joined", "-id"], name="student_classroom_joined_idx"),
+            models.Index(fields=["classroom", "-date_joined", "-id"], name="classroom_students_joined_idx"),
+        ]
 
     def __str__(self):
         return f"{self.student}-{self.classroom.name}"
+
+
+class ClassroomDeletion(models.Model):
+    """
+    Progress of the purge of a classroom.
+
+    The record is keyed by the id of the classroom rather than a foreign key so that it outlives the
+    classroom and still reports the purge as done once every row is gone.
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (DONE, _("Done")),
+    )
+
+    classroom_id = models.UUIDField(_("Classroom id"), primary_key=True, editable=False)
+    teacher = models.ForeignKey(TeacherProfile, on_delete=models.CASCADE, related_name="classroom_deletions",
+                                verbose_name=_("Teacher"))
+    status = models.CharField(_("Status"), max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    total_rows = models.PositiveIntegerField(_("Rows to delete"), null=True, blank=True)
+    deleted_rows = models.PositiveIntegerField(_("Deleted rows"), default=0)
+    requested_at = models.DateTimeField(_("Requested at"), auto_now_add=True)
+    completed_at = models.DateTimeField(_("Completed at"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Classroom deletion")
+        verbose_name_plural = _("Classroom deletions")
+        indexes = [
+            models.Index(fields=["status", "requested_at"], name="classroom_deletion_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.classroom_id} -> {self.status}"
@@ -1,7 +1,10 @@
+from django.contrib.auth import get_user_model
 from rest_framework.permissions import BasePermission
 
-from account.models import StudentProfile, TeacherProfile
-from classroom.models import StudentClassroom
+from classroom.membership import aget_membership, get_membership
+from quiz_room_hub.async_views import AsyncBasePermission
+
+User = get_user_model()
 
 
 class IsClassroomMember(BasePermission):
@@ -12,10 +15,8 @@ class IsClassroomMember(BasePermission):
     1. The user is the teacher who created the classroom.
     2. The user is a student who is a member of the classroom.
 
-    This class assumes the presence of the following models:
-    - `Classroom`: A model representing a classroom, with a foreign key to the teacher.
-    - `StudentProfile`: A model representing the profile of a student, with a one-to-one link to the user.
-    - `StudentClassroom`: A model representing the many-to-many relationship between students and classrooms.
+    The check is answered from the request user's `Membership` (see `classroom.membership`), which is
+    resolved once per request, so repeated checks within a request do not hit the database.
     """
 
     def has_object_permission(self, request, view, obj):
@@ -31,19 +32,7 @@ class IsClassroomMember(BasePermission):
             bool: True if the user is the teacher who created the classroom or a student member of the classroom,
                   False otherwise.
         """
-        # Check if the user is the teacher who created the classroom
-        if obj.teacher.user == request.user:
-            return True
-
-        # Check if the user is a student in the classroom
-        try:
-            # Retrieve the student's profile based on the user
-            student = StudentProfile.objects.get(user=request.user)
-            # Check if the student is enrolled in the classroom
-            return StudentClassroom.objects.filter(classroom=obj, student=student).exists()
-        except StudentProfile.DoesNotExist:
-            # If the student's profile does not exist, the user is not a student
-            return False
+        return get_membership(request).is_member(obj)
 
 
 class IsClassroomOwner(BasePermission):
@@ -52,8 +41,8 @@ class IsClassroomOwner(BasePermission):
 
     The user is granted permission if they are the teacher who created the classroom.
 
-    This class assumes the presence of the following model:
-    - `Classroom`: A model representing a classroom, with a foreign key to the teacher.
+    The check compares the classroom's `teacher_id` with the request user's `Membership`, so it does not
+    load the classroom's teacher.
     """
 
     def has_object_permission(self, request, view, obj):
@@ -69,18 +58,35 @@ class IsClassroomOwner(BasePermission):
             bool: True if the user is the teacher who created the classroom,
                   False otherwise.
         """
-        # Check if the user is the teacher who created the classroom
-        return request.user == obj.teacher.user
+        return get_membership(request).is_owner(obj)
+
+
+class AsyncIsClassroomMember(AsyncBasePermission):
+    """
+    Async version of `IsClassroomMember`, for the views based on `AsyncAPIView`.
+
+    The membership is resolved by `aget_membership`, which shares its cache entries with the sync views.
+    """
+
+    async def has_object_permission(self, request, view, obj):
+        return (await aget_membership(request)).is_member(obj)
+
+
+class AsyncIsClassroomOwner(AsyncBasePermission):
+    """
+    Async version of `IsClassroomOwner`, for the views based on `AsyncAPIView`.
+    """
+
+    async def has_object_permission(self, request, view, obj):
+        return (await aget_membership(request)).is_owner(obj)
 
 
 class IsStudent(BasePermission):
     """
     Permission class to check if a user is a student.
 
-    The user is granted permission if they have a corresponding `StudentProfile`.
-
-    This class assumes the presence of the following model:
-    - `StudentProfile`: A model representing the profile of a student, with a one-to-one link to the user.
+    The user is granted permission if their role is `User.STUDENT`. The role is derived from the
+    authenticated user's flags, so no profile query is needed.
     """
 
     def has_permission(self, request, view):
@@ -91,20 +97,17 @@ class IsStudent(BasePermission):
             request: The HTTP request object.
             view: The view that is being accessed.
         Returns:
-            bool: True if the user has a `StudentProfile`, False otherwise.
+            bool: True if the user is a student, False otherwise.
         """
-        # Check if the user has a StudentProfile
-        return StudentProfile.objects.filter(user=request.user).exists()
+        return getattr(request.user, "role", None) == User.STUDENT
 
 
 class IsTeacher(BasePermission):
     """
     Permission class to check if a user is a teacher.
 
-    The user is granted permission if they have a corresponding `TeacherProfile`.
-
-    This class assumes the presence of the following model:
-    - `TeacherProfile`: A model representing the profile of a teacher, with a one-to-one link to the user.
+    The user is granted permission if their role is `User.TEACHER`. The role is derived from the
+    authenticated user's flags, so no profile query is needed.
     """
 
     def has_permission(self, request, view):
@@ -116,10 +119,9 @@ class IsTeacher(BasePermission):
             view: The view that is being accessed.
 
         Returns:
-            bool: True if the user has a `TeacherProfile`, False otherwise.
+            bool: True if the user is a teacher, False otherwise.
         """
-        # Check if the user has a TeacherProfile
-        return TeacherProfile.objects.filter(user=request.user).exists()
+        return getattr(request.user, "role", None) == User.TEACHER
 
 
 IsStudentOrTeacher = IsStudent | IsTeacher
@@ -0,0 +1,161 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework import status
+from rest_framework.response import Response
+
+from classroom.membership import get_membership
+
+GENERATION_KEY_PREFIX = "classroom-generation"
+RESPONSE_KEY_PREFIX = "classroom-response"
+METRICS_KEY_PREFIX = "classroom-response-metrics"
+DEFAULT_CACHE_TIMEOUT = 300
+
+# Counters kept per cached endpoint; the latencies are summed in microseconds.
+METRICS = ("hits", "misses", "hit_time", "miss_time")
+
+# Names of the endpoints using `ClassroomResponseCacheMixin`, for the metrics report.
+endpoints = set()
+
+
+def get_cache_timeout():
+    return getattr(settings, "CLASSROOM_RESPONSE_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def get_generation_key(classroom_id):
+    return f"{GENERATION_KEY_PREFIX}:{classroom_id}"
+
+
+def get_generation(classroom_id):
+    """
+    Returns the current generation of a classroom, the version of everything readable under it.
+
+    A missing counter, never set or evicted, starts from the current time in microseconds rather than 1,
+    so it never goes back to a generation whose responses may still be cached.
+    """
+    key = get_generation_key(classroom_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(*classroom_ids):
+    """
+    Moves classrooms to a new generation, so the responses cached for the previous one are never read
+    again and simply expire. Costs one cache increment per classroom whatever the number of entries.
+    """
+    for classroom_id in classroom_ids:
+        try:
+            cache.incr(get_generation_key(classroom_id))
+        except ValueError:
+            # No counter: the next read starts a new generation anyway.
+            pass
+
+
+def increment(key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        if not cache.add(key, delta, timeout=None):
+            cache.incr(key, delta)
+
+
+def record(endpoint, hit, elapsed):
+    """
+    Counts a hit or a miss of an endpoint and its latency.
+    """
+    outcome, latency = ("hits", "hit_time") if hit else ("misses", "miss_time")
+    increment(f"{METRICS_KEY_PREFIX}:{endpoint}:{outcome}")
+    increment(f"{METRICS_KEY_PREFIX}:{endpoint}:{latency}", int(elapsed * 1_000_000))
+
+
+def get_metrics():
+    """
+    Returns the hit ratio and the mean latencies, in milliseconds, of every cached endpoint.
+    """
+    keys = [f"{METRICS_KEY_PREFIX}:{endpoint}:{metric}" for endpoint in sorted(endpoints) for metric in METRICS]
+    values = cache.get_many(keys)
+    metrics = []
+    for endpoint in sorted(endpoints):
+        hits, misses, hit_time, miss_time = (values.get(f"{METRICS_KEY_PREFIX}:{endpoint}:{metric}", 0)
+                                             for metric in METRICS)
+        metrics.append({
+            "endpoint": endpoint,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "mean_hit_latency_ms": round(hit_time / hits / 1000, 3) if hits else None,
+            "mean_miss_latency_ms": round(miss_time / misses / 1000, 3) if misses else None,
+        })
+    return metrics
+
+
+def reset_metrics():
+    cache.delete_many([f"{METRICS_KEY_PREFIX}:{endpoint}:{metric}" for endpoint in endpoints for metric in METRICS])
+
+
+class ClassroomResponseCacheMixin:
+    """
+    Mixin for read endpoints scoped to a classroom that caches their response data.
+
+    The data is cached per endpoint, full path (so each page and filter has its own entry), classroom
+    generation and role of the user in the classroom. Writes under the classroom bump its generation (see
+    `classroom.signals`, `quiz.signals` and `post.signals`) instead of deleting entries, so invalidation is a
+    single increment and stale entries are left to expire after `CLASSROOM_RESPONSE_CACHE_TIMEOUT` seconds.
+
+    List views define `get_classroom`, which loads the classroom and checks its permissions, and have their
+    `list` cached; other views call `get_cached_response` with the checked classroom and a function
+    computing the response data. Hits and misses are counted with their latency, see `get_metrics`, and
+    reported to the client by the `X-Cache` and `Server-Timing` headers.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        endpoints.add(cls.__name__)
+
+    @cached_property
+    def classroom(self):
+        return self.get_classroom()
+
+    def get_classroom(self):
+        raise NotImplementedError("Views caching their list must define `get_classroom`.")
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self.get_cached_response(self.classroom, lambda: parent.list(request, *args, **kwargs).data)
+
+    def get_response_cache_key(self, classroom):
+        role = "owner" if get_membership(self.request).is_owner(classroom) else "member"
+        path = hashlib.md5(self.request.get_full_path().encode()).hexdigest()
+        return f"{RESPONSE_KEY_PREFIX}:{type(self).__name__}:{path}:{get_generation(classroom.pk)}:{role}"
+
+    def get_cached_response(self, classroom, get_data):
+        """
+        Returns the cached response data for the classroom's current generation, computing it on a miss.
+
+        Args:
+            classroom (Classroom): The classroom the endpoint reads from, its access already checked.
+            get_data (callable): Computes the response data.
+
+        Returns:
+            Response: A 200 response with the data.
+        """
+        started = time.perf_counter()
+        key = self.get_response_cache_key(classroom)
+        data = cache.get(key)
+        hit = data is not None
+        if not hit:
+            data = get_data()
+            cache.set(key, data, get_cache_timeout())
+        elapsed = time.perf_counter() - started
+        record(type(self).__name__, hit, elapsed)
+
+        response = Response(data, status=status.HTTP_200_OK)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        response["Server-Timing"] = f"cache;desc={response['X-Cache'].lower()};dur={elapsed * 1000:.3f}"
+        return response
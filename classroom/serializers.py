@@ -1,8 +1,11 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from account.models import StudentProfile, TeacherProfile
+from account.models import StudentProfile
 from account.serializers import TeacherProfileSerializer, StudentProfileSerializer
-from .models import Classroom, StudentClassroom
+from .models import Classroom, ClassroomDeletion, StudentClassroom
+
+User = get_user_model()
 
 
 class TeacherProfileSerializerForClassroom(TeacherProfileSerializer):
@@ -62,7 +65,7 @@ class StudentClassroomSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Classroom matching query does not exist.")
 
         user = self.context['request'].user
-        if TeacherProfile.objects.filter(user=user).exists():
+        if user.role == User.TEACHER:
             student_id = self.context['request'].data.get('student_id')
             if not student_id:
                 raise serializers.ValidationError("student_id is required for teachers.")
@@ -77,3 +80,28 @@ class StudentClassroomSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("This student is already enrolled in the specified classroom.")
 
         return StudentClassroom.objects.create(student=student, classroom=classroom, **validated_data)
+
+
+class ClassroomDeletionSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ClassroomDeletion
+        fields = ("classroom_id", "status", "total_rows", "deleted_rows", "progress", "requested_at", "completed_at",)
+        read_only_fields = fields
+
+    def get_progress(self, obj) -> float | None:
+        if obj.status == ClassroomDeletion.DONE:
+            return 100.0
+        if not obj.total_rows:
+            return None
+        return round(min(obj.deleted_rows / obj.total_rows, 1) * 100, 2)
+
+
+class ResponseCacheMetricsSerializer(serializers.Serializer):
+    endpoint = serializers.CharField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    hit_ratio = serializers.FloatField(allow_null=True)
+    mean_hit_latency_ms = serializers.FloatField(allow_null=True)
+    mean_miss_latency_ms = serializers.FloatField(allow_null=True)
@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account.models import StudentProfile, TeacherProfile
+from events.activity import publish_access_revoked
+from .membership import invalidate_membership
+from .models import Classroom, StudentClassroom
+from .response_cache import bump_generation
+
+
+@receiver(post_save, sender=TeacherProfile)
+@receiver(post_delete, sender=TeacherProfile)
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def invalidate_profile_membership(sender, instance, **kwargs):
+    invalidate_membership(instance.user_id)
+
+
+@receiver(post_save, sender=Classroom)
+@receiver(post_delete, sender=Classroom)
+def invalidate_teacher_membership(sender, instance, **kwargs):
+    user_id = TeacherProfile.objects.filter(id=instance.teacher_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        invalidate_membership(user_id)
+
+
+@receiver(post_save, sender=StudentClassroom)
+@receiver(post_delete, sender=StudentClassroom)
+def invalidate_student_membership(sender, instance, **kwargs):
+    user_id = StudentProfile.objects.filter(id=instance.student_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        invalidate_membership(user_id)
+
+
+@receiver(post_delete, sender=StudentClassroom)
+def revoke_unenrolled_student_streams(sender, instance, **kwargs):
+    user_id = StudentProfile.objects.filter(id=instance.student_id).values_list("user_id", flat=True).first()
+    if user_id is not None:
+        publish_access_revoked([instance.classroom_id], user_id)
+
+
+@receiver(post_delete, sender=Classroom)
+def revoke_deleted_classroom_streams(sender, instance, **kwargs):
+    publish_access_revoked([instance.pk])
+
+
+@receiver(post_save, sender=Classroom)
+@receiver(post_delete, sender=Classroom)
+def bump_classroom_generation(sender, instance, **kwargs):
+    bump_generation(instance.pk)
+
+
+@receiver(post_save, sender=StudentClassroom)
+@receiver(post_delete, sender=StudentClassroom)
+def bump_enrollment_generation(sender, instance, **kwargs):
+    bump_generation(instance.classroom_id)
+
+
+@receiver(post_save, sender=TeacherProfile)
+def bump_teacher_classrooms_generation(sender, instance, **kwargs):
+    # Classroom responses embed the profile of their teacher.
+    bump_generation(*Classroom.objects.filter(teacher_id=instance.pk).values_list("id", flat=True))
@@ -0,0 +1,118 @@
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from account.models import TeacherProfile
+from account.tests.test_setup import MEMORY_CACHES
+from classroom.membership import aget_membership, get_cache_key
+from classroom.models import Classroom
+from classroom.tests.test_setup import TestSetUp
+
+User = get_user_model()
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class AsyncClassroomRetrieveAPIViewTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.async_detail_url = reverse("classroom:classrooms-detail-async", kwargs={"pk": self.classroom1_id})
+
+    async def get(self, url, token=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return await self.async_client.get(url, headers=headers)
+
+    async def test_view_matches_the_sync_endpoint(self):
+        response = await self.get(self.async_detail_url, self.student_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        sync_response = await sync_to_async(self.client.get)(
+            self.classrooms_detail_url, headers={"Authorization": f"Bearer {self.student_access_token}"})
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_errors_match_the_sync_endpoint(self):
+        unknown_url = reverse("classroom:classrooms-detail-async", kwargs={"pk": self.teacher_profile.id})
+        cases = [
+            (self.async_detail_url, None, status.HTTP_401_UNAUTHORIZED),
+            (self.async_detail_url, "invalid", status.HTTP_401_UNAUTHORIZED),
+            (self.async_detail_url, self.student2_access_token, status.HTTP_403_FORBIDDEN),
+            (unknown_url, self.student_access_token, status.HTTP_404_NOT_FOUND),
+        ]
+        for url, token, code in cases:
+            with self.subTest(token=token, code=code):
+                response = await self.get(url, token)
+                self.assertEqual(response.status_code, code)
+                self.assertIn("detail", response.json())
+        response = await self.get(self.async_detail_url)
+        self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+    async def test_inactive_user_is_rejected(self):
+        await User.objects.filter(pk=self.student.pk).aupdate(is_active=False)
+        response = await self.get(self.async_detail_url, self.student_access_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def count_queries(self, url, token):
+        """
+        Returns the response to a request and the number of queries it ran.
+
+        The request handler resets the query log, so the queries are counted by an execute wrapper, installed
+        from the thread the ORM runs in, as the database connection is only reachable from there.
+        """
+        executed = []
+
+        def count(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        wrapper = await sync_to_async(lambda: connection.execute_wrapper(count))()
+        await sync_to_async(wrapper.__enter__)()
+        try:
+            response = await self.get(url, token)
+        finally:
+            await sync_to_async(wrapper.__exit__)(None, None, None)
+        return response, len(executed)
+
+    async def test_membership_is_shared_with_the_sync_views(self):
+        response, queries = await self.count_queries(self.async_detail_url, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The user, the teacher's profile and classrooms, and the classroom with its teacher.
+        self.assertEqual(queries, 4)
+        self.assertIsNotNone(await cache.aget(get_cache_key(self.teacher.pk)))
+
+        response, queries = await self.count_queries(self.async_detail_url, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, 2)
+
+    async def test_membership_of_a_student(self):
+        request = type("Request", (), {"user": self.student})()
+        membership = await aget_membership(request)
+        self.assertEqual(membership.student_id, self.student_profile.id)
+        self.assertEqual(membership.classroom_ids, {self.classroom1.id, self.classroom3.id})
+        self.assertIs(await aget_membership(request), membership)
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class BenchmarkViewsCommandTests(TransactionTestCase):
+    def setUp(self):
+        self.teacher = User.objects.create_user(email="teacher@example.com", password="password", is_teacher=True)
+        self.classroom = Classroom.objects.create(name="classroom",
+                                                  teacher=TeacherProfile.objects.get(user=self.teacher))
+
+    def test_benchmark_reports_each_run(self):
+        out = StringIO()
+        call_command("benchmark_views", reverse("classroom:classrooms-detail", kwargs={"pk": self.classroom.id}),
+                     reverse("classroom:classrooms-detail-async", kwargs={"pk": self.classroom.id}),
+                     "--email", self.teacher.email, "--requests", "6", "--concurrency", "4", stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual([line.split(":")[0] for line in lines],
+                         ["WSGI, sync view", "ASGI, sync view", "ASGI, async view"])
+        for line in lines:
+            self.assertIn("6 requests", line)
+            self.assertIn("statuses 200: 6.", line)
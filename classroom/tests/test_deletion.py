@@ -0,0 +1,189 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from classroom.deletion import count_rows, purge_classroom, request_deletion
+from classroom.membership import Membership
+from classroom.models import Classroom, ClassroomDeletion, StudentClassroom
+from classroom.tests.test_setup import TestSetUp
+from jobs.models import Job
+from jobs.queue import run_worker
+from post.models import Comment, CoursePost
+from quiz.models import Answer, LeaderboardEntry, Question, Quiz, StudentAnswer, StudentQuiz
+
+User = get_user_model()
+
+
+class ClassroomDeletionTests(TestSetUp):
+    def populate(self, classroom, students=2, quizzes=2):
+        """
+        Fills a classroom with posts, comments, quizzes, answers, submissions and enrollments.
+        """
+        profiles = []
+        for _ in range(students):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            StudentClassroom.objects.create(student=user.student_profile, classroom=classroom)
+            profiles.append(user.student_profile)
+
+        post = CoursePost.objects.create(title="post", content="content", classroom=classroom)
+        for profile in profiles:
+            Comment.objects.create(content="comment", post=post, user=profile.user)
+
+        for index in range(quizzes):
+            quiz = Quiz.objects.create(title=f"quiz {index}", classroom=classroom)
+            question = Question.objects.create(description="question", quiz=quiz)
+            valid = Answer.objects.create(description="valid", is_valid=True, question=question)
+            Answer.objects.create(description="invalid", is_valid=False, question=question)
+            for profile in profiles:
+                StudentAnswer.objects.create(student=profile, answer=valid)
+                StudentQuiz.objects.create(student=profile, quiz=quiz, mark=Decimal("100"))
+
+    def remaining_rows(self, classroom):
+        return {
+            "students": StudentClassroom.objects.filter(classroom=classroom).count(),
+            "posts": CoursePost.objects.filter(classroom=classroom).count(),
+            "comments": Comment.objects.filter(post__classroom=classroom).count(),
+            "quizzes": Quiz.objects.filter(classroom=classroom).count(),
+            "questions": Question.objects.filter(quiz__classroom=classroom).count(),
+            "answers": Answer.objects.filter(question__quiz__classroom=classroom).count(),
+            "student_answers": StudentAnswer.objects.filter(answer__question__quiz__classroom=classroom).count(),
+            "submissions": StudentQuiz.objects.filter(quiz__classroom=classroom).count(),
+            "leaderboard": LeaderboardEntry.objects.filter(classroom=classroom).count(),
+        }
+
+    def test_request_deletion_hides_the_classroom(self):
+        deletion = request_deletion(self.classroom1)
+        self.assertEqual(deletion.status, ClassroomDeletion.PENDING)
+        self.assertFalse(Classroom.objects.filter(id=self.classroom1.id).exists())
+        self.assertTrue(Classroom.all_objects.filter(id=self.classroom1.id, is_deleting=True).exists())
+
+        membership = Membership(teacher_id=self.teacher_profile.id, classroom_ids=[self.classroom1.id])
+        self.assertFalse(membership.is_owner(self.classroom1))
+        self.assertFalse(membership.is_member(self.classroom1))
+        self.assertEqual(request_deletion(self.classroom1), deletion)
+
+    def test_purge_deletes_every_descendant_in_batches(self):
+        self.populate(self.classroom1)
+        self.populate(self.classroom2)
+        kept = self.remaining_rows(self.classroom2)
+        total = count_rows(self.classroom1.id)
+
+        deletion = request_deletion(self.classroom1)
+        purge_classroom(deletion, batch_size=2)
+
+        self.assertEqual(deletion.status, ClassroomDeletion.DONE)
+        self.assertEqual(deletion.total_rows, total)
+        self.assertEqual(deletion.deleted_rows, total)
+        self.assertIsNotNone(deletion.completed_at)
+        self.assertFalse(Classroom.all_objects.filter(id=self.classroom1.id).exists())
+        self.assertEqual(set(self.remaining_rows(self.classroom1).values()), {0})
+        self.assertEqual(self.remaining_rows(self.classroom2), kept)
+
+    def test_purge_query_count_depends_on_batches_not_rows(self):
+        self.populate(self.classroom1, students=2)
+        self.populate(self.classroom3, students=6)
+        self.assertLess(count_rows(self.classroom1.id), count_rows(self.classroom3.id))
+
+        query_counts = []
+        for classroom in (self.classroom1, self.classroom3):
+            deletion = request_deletion(classroom)
+            with CaptureQueriesContext(connection) as context:
+                purge_classroom(deletion, batch_size=1000)
+            query_counts.append(len(context.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_purge_classrooms_command(self):
+        self.populate(self.classroom1)
+        request_deletion(self.classroom1)
+        out = StringIO()
+        call_command("purge_classrooms", "--batch-size", "3", stdout=out)
+        self.assertIn(f"Purged classroom {self.classroom1.id}", out.getvalue())
+        self.assertIn("Purged 1 classrooms.", out.getvalue())
+        self.assertEqual(ClassroomDeletion.objects.get().status, ClassroomDeletion.DONE)
+
+        call_command("purge_classrooms", stdout=out)
+        self.assertIn("Purged 0 classrooms.", out.getvalue())
+
+    def test_request_deletion_queues_one_purge_job(self):
+        self.populate(self.classroom1)
+        request_deletion(self.classroom1, user=self.teacher)
+        request_deletion(self.classroom1, user=self.teacher)
+        job = Job.objects.get()
+        self.assertEqual((job.name, job.status, job.created_by), ("classroom.purge", Job.PENDING, self.teacher))
+
+        self.assertEqual(run_worker(once=True), 1)
+        job.refresh_from_db()
+        deletion = ClassroomDeletion.objects.get()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, {"classroom_id": str(self.classroom1.id), "deleted_rows": deletion.deleted_rows})
+        self.assertEqual(deletion.status, ClassroomDeletion.DONE)
+        self.assertFalse(any(self.remaining_rows(self.classroom1).values()))
+
+
+class ClassroomDeletionAPIViewTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.classrooms_deletion_url = reverse("classroom:classrooms-deletion", kwargs={"pk": self.classroom1.id})
+
+    def delete_classroom(self):
+        return self.client.delete(self.classrooms_detail_url,
+                                  headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+
+    def get_progress(self, token):
+        return self.client.get(self.classrooms_deletion_url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.classrooms_deletion_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_without_deletion(self):
+        self.assertEqual(self.get_progress(self.teacher_access_token).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_non_owner_users(self):
+        self.delete_classroom()
+        self.assertEqual(self.get_progress(self.teacher2_access_token).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get_progress(self.student_access_token).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deleted_classroom_is_gone_for_its_members(self):
+        self.delete_classroom()
+        response = self.client.get(self.classrooms_detail_url,
+                                   headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(self.classrooms_list_url,
+                                   headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        self.assertNotIn(str(self.classroom1.id), [classroom["id"] for classroom in response.data["results"]])
+        self.assertEqual(self.delete_classroom().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deleted_classroom_enrollments_are_not_listed(self):
+        self.delete_classroom()
+        for token in (self.teacher_access_token, self.student_access_token):
+            response = self.client.get(self.students_classrooms_list_url, headers={"Authorization": f"Bearer {token}"})
+            classroom_ids = {enrollment["classroom"]["id"] for enrollment in response.data["results"]}
+            self.assertEqual(classroom_ids, {str(self.classroom3.id)})
+
+    def test_deleted_classroom_quizzes_are_not_listed(self):
+        Quiz.objects.create(title="deleted", classroom=self.classroom1)
+        kept = Quiz.objects.create(title="kept", classroom=self.classroom3)
+        self.delete_classroom()
+        response = self.client.get(reverse("quiz:quiz:quizzes-list"),
+                                   headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        self.assertEqual([quiz["id"] for quiz in response.data["results"]], [str(kept.id)])
+
+    def test_view_reports_progress_until_done(self):
+        self.delete_classroom()
+        response = self.get_progress(self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], ClassroomDeletion.PENDING)
+        self.assertIsNone(response.data["progress"])
+
+        purge_classroom(ClassroomDeletion.objects.get(classroom_id=self.classroom1.id))
+        response = self.get_progress(self.teacher_access_token)
+        self.assertEqual(response.data["status"], ClassroomDeletion.DONE)
+        self.assertEqual(response.data["progress"], 100.0)
+        self.assertEqual(response.data["deleted_rows"], response.data["total_rows"])
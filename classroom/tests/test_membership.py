@@ -0,0 +1,108 @@
+from django.core.cache import cache, caches
+from django.test import override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from account.tests.test_setup import MEMORY_CACHES
+from classroom.checks import check_shared_cache
+from classroom.membership import get_membership, get_cache_key
+from classroom.models import Classroom, StudentClassroom
+from classroom.permissions import IsClassroomMember, IsClassroomOwner, IsStudent, IsTeacher
+from classroom.tests.test_setup import TestSetUp
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class MembershipTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.factory = APIRequestFactory()
+        cache.clear()
+
+    def get_request(self, user):
+        request = Request(self.factory.get("/"))
+        request.user = user
+        return request
+
+    def test_student_membership(self):
+        membership = get_membership(self.get_request(self.student))
+        self.assertEqual(membership.student_id, self.student_profile.id)
+        self.assertIsNone(membership.teacher_id)
+        self.assertEqual(membership.classroom_ids, {self.classroom1.id, self.classroom3.id})
+
+    def test_teacher_membership(self):
+        membership = get_membership(self.get_request(self.teacher))
+        self.assertEqual(membership.teacher_id, self.teacher_profile.id)
+        self.assertIsNone(membership.student_id)
+        self.assertEqual(membership.classroom_ids, {self.classroom1.id, self.classroom3.id})
+
+    def test_admin_membership_is_empty(self):
+        membership = get_membership(self.get_request(self.admin))
+        self.assertFalse(membership.is_teacher)
+        self.assertFalse(membership.is_student)
+        self.assertFalse(membership.classroom_ids)
+
+    def test_permission_checks_do_not_query_once_resolved(self):
+        request = self.get_request(self.student)
+        get_membership(request)
+        with self.assertNumQueries(0):
+            self.assertTrue(IsClassroomMember().has_object_permission(request, None, self.classroom1))
+            self.assertFalse(IsClassroomMember().has_object_permission(request, None, self.classroom2))
+            self.assertFalse(IsClassroomOwner().has_object_permission(request, None, self.classroom1))
+
+    def test_membership_is_served_from_cache_across_requests(self):
+        get_membership(self.get_request(self.teacher))
+        self.assertIsNotNone(cache.get(get_cache_key(self.teacher.pk)))
+        with self.assertNumQueries(0):
+            membership = get_membership(self.get_request(self.teacher))
+        self.assertTrue(membership.is_owner(self.classroom1))
+        self.assertFalse(membership.is_owner(self.classroom2))
+
+    def test_enrollment_invalidates_cached_membership(self):
+        get_membership(self.get_request(self.student))
+        StudentClassroom.objects.create(student=self.student_profile, classroom=self.classroom2)
+        self.assertIsNone(cache.get(get_cache_key(self.student.pk)))
+        membership = get_membership(self.get_request(self.student))
+        self.assertIn(self.classroom2.id, membership.classroom_ids)
+
+    def test_unenrollment_invalidates_cached_membership(self):
+        get_membership(self.get_request(self.student))
+        self.student_classroom1.delete()
+        membership = get_membership(self.get_request(self.student))
+        self.assertNotIn(self.classroom1.id, membership.classroom_ids)
+
+    def test_classroom_creation_invalidates_teacher_membership(self):
+        get_membership(self.get_request(self.teacher))
+        classroom = Classroom.objects.create(name=self.fake.name(), teacher=self.teacher_profile)
+        membership = get_membership(self.get_request(self.teacher))
+        self.assertIn(classroom.id, membership.classroom_ids)
+
+    def test_role_permissions_do_not_query(self):
+        with self.assertNumQueries(0):
+            self.assertTrue(IsTeacher().has_permission(self.get_request(self.teacher), None))
+            self.assertFalse(IsTeacher().has_permission(self.get_request(self.student), None))
+            self.assertTrue(IsStudent().has_permission(self.get_request(self.student), None))
+            self.assertFalse(IsStudent().has_permission(self.get_request(self.admin), None))
+            self.assertFalse(IsTeacher().has_permission(self.get_request(self.admin), None))
+
+
+class SharedMembershipCacheTests(TestSetUp):
+    """
+    Runs against the configured cache, shared between the web and job workers.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_invalidation_reaches_the_other_workers(self):
+        self.assertEqual(check_shared_cache(), [])
+        # A connection of its own to the configured cache, as another worker process holds.
+        other_worker = caches.create_connection("default")
+        request = Request(APIRequestFactory().get("/"))
+        request.user = self.student
+        get_membership(request)
+        key = get_cache_key(self.student.pk)
+        self.assertEqual(set(other_worker.get(key)["classroom_ids"]), {self.classroom1.id, self.classroom3.id})
+
+        self.student_classroom1.delete()
+        self.assertIsNone(other_worker.get(key))
@@ -0,0 +1,123 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from classroom.checks import check_shared_cache
+from classroom.models import StudentClassroom
+from classroom.response_cache import bump_generation, get_generation
+from post.models import CoursePost
+from quiz.models import Answer, Question, Quiz
+from quiz.tests.test_setup_views import QuizTestSetup
+
+
+class ClassroomResponseCacheTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.classroom2_detail_url = reverse("classroom:classrooms-detail", kwargs={"pk": self.classroom2.id})
+        self.posts_list_url = reverse("post:posts-list", kwargs={"classroom_id": str(self.classroom2.id)})
+        self.cache_metrics_url = reverse("classroom:classrooms-cache-metrics")
+
+    def get(self, url, token=None):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token or self.student2_access_token}"})
+
+    def assertCache(self, url, expected, token=None):
+        response = self.get(url, token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], expected)
+        self.assertIn(f"cache;desc={expected.lower()};dur=", response["Server-Timing"])
+        return response
+
+    def test_generation_is_bumped_in_place(self):
+        generation = get_generation(self.classroom2.id)
+        bump_generation(self.classroom2.id)
+        self.assertEqual(get_generation(self.classroom2.id), generation + 1)
+
+        cache.clear()
+        self.assertGreater(get_generation(self.classroom2.id), generation + 1)
+        bump_generation(self.classroom1_id)  # no counter yet
+
+    def test_hit_serves_the_same_data_with_fewer_queries(self):
+        with CaptureQueriesContext(connection) as miss_context:
+            miss = self.assertCache(self.questions_list_url, "MISS")
+        with CaptureQueriesContext(connection) as hit_context:
+            hit = self.assertCache(self.questions_list_url, "HIT")
+        self.assertEqual(hit.data, miss.data)
+        self.assertLess(len(hit_context.captured_queries), len(miss_context.captured_queries))
+
+    def test_entries_are_per_role_and_path(self):
+        self.assertCache(self.classroom2_detail_url, "MISS")
+        self.assertCache(self.classroom2_detail_url, "MISS", self.teacher2_access_token)
+        self.assertCache(self.classroom2_detail_url, "HIT", self.teacher2_access_token)
+        self.assertCache(f"{self.questions_list_url}?page_size=1", "MISS")
+        self.assertCache(self.questions_list_url, "MISS")
+
+    def test_access_is_checked_before_the_cache(self):
+        self.assertCache(self.quizzes_detail_url, "MISS")
+        self.assertEqual(self.get(self.quizzes_detail_url, self.student_access_token).status_code,
+                         status.HTTP_403_FORBIDDEN)
+
+    def test_writes_under_the_classroom_invalidate_its_responses(self):
+        urls = [self.classroom2_detail_url, self.posts_list_url, self.questions_list_url, self.quizzes_detail_url]
+        other_url = reverse("classroom:classrooms-detail", kwargs={"pk": self.classroom1_id})
+        writes = [
+            lambda: CoursePost.objects.create(title="post", content="content", classroom=self.classroom2),
+            lambda: Quiz.objects.filter(id=self.quiz.id).first().save(),
+            lambda: Question.objects.create(description="question", quiz=self.quiz),
+            lambda: Answer.objects.filter(id=self.answer.id).first().save(),
+            lambda: StudentClassroom.objects.create(student=self.student3_profile, classroom=self.classroom2),
+            lambda: self.classroom2.teacher.save(),
+            lambda: self.classroom2.save(),
+        ]
+        self.assertCache(other_url, "MISS", self.teacher_access_token)
+        for write in writes:
+            for url in urls:
+                self.get(url)
+            write()
+            for url in urls:
+                self.assertCache(url, "MISS")
+        self.assertCache(other_url, "HIT", self.teacher_access_token)
+
+    def test_responses_reflect_updates(self):
+        self.assertCache(self.quizzes_detail_url, "MISS")
+        response = self.client.put(self.quizzes_detail_url, data={"title": "renamed", "classroom_id": str(
+            self.classroom2.id)}, headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.assertCache(self.quizzes_detail_url, "MISS").data["title"], "renamed")
+
+    def test_metrics_view(self):
+        self.assertEqual(self.get(self.cache_metrics_url, self.teacher2_access_token).status_code,
+                         status.HTTP_403_FORBIDDEN)
+        for _ in range(3):
+            self.get(self.questions_list_url)
+
+        response = self.get(self.cache_metrics_url, self.admin_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = {entry["endpoint"]: entry for entry in response.data}
+        self.assertEqual(set(metrics), {"ClassroomRetrieveUpdateDestroyAPIView", "CoursePostListAPIView",
+                                        "QuestionListAPIView", "QuizRetrieveUpdateDestroyAPIView"})
+        questions = metrics["QuestionListAPIView"]
+        self.assertEqual((questions["hits"], questions["misses"], questions["hit_ratio"]), (2, 1, 0.6667))
+        self.assertGreater(questions["mean_miss_latency_ms"], 0)
+        self.assertIsNone(metrics["CoursePostListAPIView"]["hit_ratio"])
+
+        response = self.client.delete(self.cache_metrics_url,
+                                      headers={"Authorization": f"Bearer {self.admin_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        metrics = {entry["endpoint"]: entry for entry in self.get(self.cache_metrics_url, self.admin_access_token).data}
+        self.assertEqual(metrics["QuestionListAPIView"]["hits"], 0)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_is_reported(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}):
+            errors = check_shared_cache()
+        self.assertEqual([error.id for error in errors], ["classroom.E001"])
+
+    def test_shared_cache_passes(self):
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache",
+                                                   "LOCATION": "cache"}}):
+            self.assertEqual(check_shared_cache(), [])
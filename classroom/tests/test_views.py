@@ -1,6 +1,6 @@
 from rest_framework import status
 
-from classroom.models import Classroom, StudentClassroom
+from classroom.models import Classroom, ClassroomDeletion, StudentClassroom
 from classroom.tests.test_setup import TestSetUp
 
 
@@ -158,7 +158,8 @@ class ClassroomDestroyAPIViewTests(TestSetUp):
     def test_view_with_authenticated_classroom_owner_user(self):
         response = self.client.delete(self.classrooms_detail_url,
                                       headers={"Authorization": f"Bearer {self.teacher_access_token}"})
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["status"], ClassroomDeletion.PENDING)
         self.assertFalse(Classroom.objects.filter(id=self.classroom1_id).exists())
 
 
@@ -262,7 +263,7 @@ class StudentClassroomListAPIViewTests(TestSetUp):
         response = self.client.get(self.students_classrooms_list_url,
                                    headers={"Authorization": f"Bearer {self.student3_access_token}"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data["results"], [])
 
     def test_view_with_authenticated_teacher(self):
         response = self.client.get(self.students_classrooms_list_url,
@@ -273,7 +274,7 @@ class StudentClassroomListAPIViewTests(TestSetUp):
         response = self.client.get(self.students_classrooms_list_url,
                                    headers={"Authorization": f"Bearer {self.teacher3_access_token}"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data["results"], [])
 
 
 class StudentClassroomRetrieveAPIViewTests(TestSetUp):
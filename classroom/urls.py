@@ -1,6 +1,8 @@
 from django.urls import path
 
-from .views import (ClassroomListAPIView, ClassroomCreateAPIView, ClassroomRetrieveUpdateDestroyAPIView,
+from .views import (AsyncClassroomRetrieveAPIView, ClassroomListAPIView, ClassroomCreateAPIView,
+                    ClassroomRetrieveUpdateDestroyAPIView,
+                    ClassroomDeletionAPIView, ResponseCacheMetricsAPIView,
                     StudentClassroomListAPIView,
                     StudentClassroomCreateAPIView, StudentClassroomRetrieveDestroyAPIView)
 
@@ -10,6 +12,9 @@ urlpatterns = [
     path("classrooms/", ClassroomListAPIView.as_view(), name="classrooms-list"),
     path("classrooms/create/", ClassroomCreateAPIView.as_view(), name="classrooms-create"),
     path("classrooms/<uuid:pk>/", ClassroomRetrieveUpdateDestroyAPIView.as_view(), name="classrooms-detail"),
+    path("classrooms/<uuid:pk>/async/", AsyncClassroomRetrieveAPIView.as_view(), name="classrooms-detail-async"),
+    path("classrooms/<uuid:pk>/deletion/", ClassroomDeletionAPIView.as_view(), name="classrooms-deletion"),
+    path("classrooms/cache-metrics/", ResponseCacheMetricsAPIView.as_view(), name="classrooms-cache-metrics"),
     path("students-classrooms/", StudentClassroomListAPIView.as_view(), name="students-classrooms-list"),
     path("students-classrooms/create/", StudentClassroomCreateAPIView.as_view(), name="students-classrooms-create"),
     path("students-classrooms/<uuid:student_id>/<uuid:classroom_id>/", StudentClassroomRetrieveDestroyAPIView.as_view(),
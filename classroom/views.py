@@ -1,17 +1,28 @@
+from django.contrib.auth import get_user_model
 from django.http import Http404
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.generics import CreateAPIView, ListAPIView
-from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from account.models import StudentProfile, TeacherProfile
 from authuser.serializers import ErrorResponseSerializer
-from .models import Classroom, StudentClassroom
-from .permissions import (IsClassroomMember, IsClassroomOwner, IsTeacher, IsStudentOrTeacher, )
-from .serializers import ClassroomSerializer, StudentClassroomSerializer
+from .deletion import request_deletion
+from .membership import get_membership
+from .models import Classroom, ClassroomDeletion, StudentClassroom
+from .permissions import (AsyncIsClassroomMember, IsClassroomMember, IsClassroomOwner, IsTeacher,
+                          IsStudentOrTeacher, )
+from .response_cache import ClassroomResponseCacheMixin, get_metrics, reset_metrics
+from quiz_room_hub.async_views import AsyncAPIView, AsyncIsAuthenticated
+from quiz_room_hub.pagination import DateJoinedCursorPagination
+from .serializers import (ClassroomSerializer, ClassroomDeletionSerializer, ResponseCacheMetricsSerializer,
+                          StudentClassroomSerializer)
+
+User = get_user_model()
 
 
 class ClassroomListAPIView(ListAPIView):
@@ -41,8 +52,7 @@ class ClassroomListAPIView(ListAPIView):
         Returns:
             QuerySet: A queryset of classrooms filtered by the authenticated teacher.
         """
-        teacher = TeacherProfile.objects.get(user=self.request.user)
-        return Classroom.objects.filter(teacher=teacher)
+        return Classroom.objects.filter(teacher__user=self.request.user)
 
 
 class ClassroomCreateAPIView(CreateAPIView):
@@ -80,13 +90,14 @@ class ClassroomCreateAPIView(CreateAPIView):
         serializer.save(teacher=teacher)
 
 
-class ClassroomRetrieveUpdateDestroyAPIView(APIView):
+class ClassroomRetrieveUpdateDestroyAPIView(ClassroomResponseCacheMixin, APIView):
     """
     API view to retrieve, update, or delete a specific classroom.
 
     This view is accessible to authenticated users who are either members of the classroom
     (students or the teacher who created it) or the owner of the classroom (the teacher who
-    created it).
+    created it). The classroom details are cached until the classroom or its teacher's profile
+    changes, see `ClassroomResponseCacheMixin`.
 
     Permissions:
     - `IsAuthenticated`: Ensures that the user is logged in.
@@ -102,7 +113,7 @@ class ClassroomRetrieveUpdateDestroyAPIView(APIView):
     - `get_object`: Retrieves the classroom object based on the provided `pk`.
     - `get`: Handles `GET` requests to retrieve the classroom details.
     - `put`: Handles `PUT` requests to update the classroom details.
-    - `delete`: Handles `DELETE` requests to delete the classroom.
+    - `delete`: Handles `DELETE` requests to request the deletion of the classroom.
     """
 
     def get_permissions(self):
@@ -162,8 +173,7 @@ class ClassroomRetrieveUpdateDestroyAPIView(APIView):
         """
         self.check_permissions(request)
         classroom = self.get_object(pk)
-        serializer = ClassroomSerializer(classroom)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self.get_cached_response(classroom, lambda: ClassroomSerializer(classroom).data)
 
     @extend_schema(
         request=ClassroomSerializer,
@@ -198,7 +208,7 @@ class ClassroomRetrieveUpdateDestroyAPIView(APIView):
 
     @extend_schema(
         responses={
-            204: None,
+            202: ClassroomDeletionSerializer,
             404: ErrorResponseSerializer,
         },
     )
@@ -206,6 +216,10 @@ class ClassroomRetrieveUpdateDestroyAPIView(APIView):
         """
         Handle DELETE requests to delete a specific classroom.
 
+        The classroom is marked as being deleted and immediately hidden, while its posts, quizzes,
+        submissions and enrollments are purged in bounded batches by a background job, run by the
+        `run_jobs` command. The progress of the purge is exposed by `ClassroomDeletionAPIView`.
+
         Args:
             request: The HTTP request object.
             pk (uuid): Primary key of the classroom to delete.
@@ -213,15 +227,67 @@ class ClassroomRetrieveUpdateDestroyAPIView(APIView):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            Response: Response object with status HTTP_204_NO_CONTENT.
+            Response: Response object with status HTTP_202_ACCEPTED containing the deletion progress.
 
         Raises:
             Http404: If the classroom with the provided `pk` does not exist.
         """
         self.check_permissions(request)
         classroom = self.get_object(pk)
-        classroom.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        deletion = request_deletion(classroom, user=request.user)
+        serializer = ClassroomDeletionSerializer(deletion)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class ClassroomDeletionAPIView(APIView):
+    """
+    API view to follow the deletion of a classroom.
+
+    This view returns the status of the purge of a classroom whose deletion was requested, with the
+    number of rows deleted so far out of the rows to delete. It keeps answering once the classroom is
+    gone. The user must be authenticated and the teacher who owned the classroom.
+
+    Permissions:
+    - `IsAuthenticated`: Ensures that the user is logged in.
+    - `IsTeacher`: Ensures that the user has a `TeacherProfile`.
+
+    Methods:
+    - `get`: Handles `GET` requests to retrieve the deletion progress.
+    """
+    permission_classes = [IsAuthenticated, IsTeacher]
+
+    @extend_schema(
+        responses={
+            200: ClassroomDeletionSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, pk, *args, **kwargs):
+        """
+        Handle GET requests to retrieve the progress of the deletion of a classroom.
+
+        Args:
+            request: The HTTP request object.
+            pk (uuid): Primary key of the deleted classroom.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: Response object containing the deletion progress.
+
+        Raises:
+            Http404: If no deletion was requested for the classroom.
+            PermissionDenied: If the user did not own the classroom.
+        """
+        try:
+            deletion = ClassroomDeletion.objects.get(classroom_id=pk)
+        except ClassroomDeletion.DoesNotExist:
+            raise Http404
+
+        if deletion.teacher_id != get_membership(request).teacher_id:
+            raise PermissionDenied
+        serializer = ClassroomDeletionSerializer(deletion)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class StudentClassroomListAPIView(ListAPIView):
@@ -243,6 +309,7 @@ class StudentClassroomListAPIView(ListAPIView):
     """
     serializer_class = StudentClassroomSerializer
     permission_classes = [IsAuthenticated, IsStudentOrTeacher]
+    pagination_class = DateJoinedCursorPagination
 
     def get_queryset(self):
         """
@@ -254,13 +321,12 @@ class StudentClassroomListAPIView(ListAPIView):
           including student details for each classroom.
         """
         user = self.request.user
-        if StudentProfile.objects.filter(user=user).exists():
-            student = StudentProfile.objects.get(user=user)
-            return StudentClassroom.objects.filter(student=student)
+        # Classrooms whose deletion was requested are hidden until they are purged.
+        queryset = StudentClassroom.objects.filter(classroom__is_deleting=False)
+        if user.role == User.STUDENT:
+            return queryset.filter(student__user=user)
         else:  # user is a teacher
-            teacher = TeacherProfile.objects.get(user=user)
-            classrooms = teacher.classrooms.all()
-            return StudentClassroom.objects.filter(classroom__in=classrooms)
+            return queryset.filter(classroom__teacher__user=user)
 
 
 class StudentClassroomCreateAPIView(APIView):
@@ -331,10 +397,9 @@ class StudentClassroomCreateAPIView(APIView):
         """
         user = self.request.user
 
-        if TeacherProfile.objects.filter(user=user).exists():
+        if user.role == User.TEACHER:
             classroom_id = serializer.validated_data['classroom']['id']
-            teacher = TeacherProfile.objects.get(user=user)
-            if not Classroom.objects.filter(id=classroom_id, teacher=teacher).exists():
+            if not Classroom.objects.filter(id=classroom_id, teacher__user=user).exists():
                 raise ValidationError("Not a valid classroom.")
         serializer.save()
 
@@ -453,3 +518,117 @@ class StudentClassroomRetrieveDestroyAPIView(APIView):
         student_classroom = self.get_object(student_id, classroom_id)
         student_classroom.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ResponseCacheMetricsAPIView(APIView):
+    """
+    API view to monitor the response cache of the classroom read endpoints.
+
+    For every endpoint using `ClassroomResponseCacheMixin`, this view returns the number of cache hits and
+    misses, the hit ratio and the mean latency of hits and misses in milliseconds, counted since the last
+    reset. The view is accessible only to admin users.
+
+    Permissions:
+    - `IsAuthenticated`: Ensures that the user is logged in.
+    - `IsAdminUser`: Ensures that the user is a staff member.
+
+    Methods:
+    - `get`: Handles `GET` requests to retrieve the metrics.
+    - `delete`: Handles `DELETE` requests to reset the metrics.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @extend_schema(
+        responses={
+            200: ResponseCacheMetricsSerializer(many=True),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET requests to retrieve the response cache metrics.
+
+        Args:
+            request: The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: Response object containing the metrics of each endpoint.
+        """
+        serializer = ResponseCacheMetricsSerializer(get_metrics(), many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        responses={
+            204: None,
+        },
+    )
+    def delete(self, request, *args, **kwargs):
+        """
+        Handle DELETE requests to reset the response cache metrics.
+
+        Args:
+            request: The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: Response object with status HTTP_204_NO_CONTENT.
+        """
+        reset_metrics()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncClassroomRetrieveAPIView(AsyncAPIView):
+    """
+    Async variant of the `GET` endpoint of `ClassroomRetrieveUpdateDestroyAPIView`.
+
+    Under ASGI, the request is served without being handed to a worker thread: the user, the membership and
+    the classroom are loaded with the async ORM. The classroom is read with its teacher and the teacher's
+    user in a single query. Unlike the sync endpoint, the response is not cached.
+
+    Permissions:
+    - `AsyncIsAuthenticated`: Ensures that the user is logged in.
+    - `AsyncIsClassroomMember`: Allows access if the user is a member of the classroom.
+
+    Methods:
+    - `get_object`: Retrieves the classroom object based on the provided `pk`.
+    - `get`: Handles `GET` requests to retrieve the classroom details.
+    """
+    permission_classes = [AsyncIsAuthenticated, AsyncIsClassroomMember]
+
+    async def get_object(self, pk):
+        """
+        Retrieve the classroom object based on the provided primary key (`pk`) and check its permissions.
+
+        Args:
+            pk (uuid): Primary key of the classroom to retrieve.
+
+        Returns:
+            Classroom: The retrieved classroom object.
+
+        Raises:
+            Http404: If the classroom with the provided `pk` does not exist.
+        """
+        try:
+            classroom = await Classroom.objects.select_related("teacher__user").aget(id=pk)
+        except Classroom.DoesNotExist:
+            raise Http404
+        await self.check_object_permissions(self.request, classroom)
+        return classroom
+
+    async def get(self, request, pk, *args, **kwargs):
+        """
+        Handle GET requests to retrieve the details of a specific classroom.
+
+        Args:
+            request: The HTTP request object.
+            pk (uuid): Primary key of the classroom to retrieve.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: Response object containing serialized classroom data.
+        """
+        classroom = await self.get_object(pk)
+        return Response(ClassroomSerializer(classroom).data, status=status.HTTP_200_OK)
@@ -0,0 +1,44 @@
+from django.db import transaction
+
+from .bus import Event, get_bus
+
+# Published to end the event streams of members who lost access; never sent to the clients.
+ACCESS_REVOKED = "access.revoked"
+
+
+def get_classroom_channel(classroom_id):
+    return f"classroom:{classroom_id}"
+
+
+def publish_classroom_event(classroom_id, event_type, **data):
+    """
+    Publishes an event on the activity stream of a classroom once the current transaction commits.
+
+    The events only identify what changed; clients fetch the resource itself, so the stream never
+    carries data its subscribers could not read anyway. A failing bus does not fail the request that
+    made the change.
+
+    Args:
+        classroom_id (UUID): The classroom the change happened in.
+        event_type (str): The kind of change, such as `post.created`.
+        **data: The payload of the event.
+    """
+    event = Event(event_type, {"classroom_id": classroom_id, **data})
+    transaction.on_commit(lambda: get_bus().publish(get_classroom_channel(classroom_id), event), robust=True)
+
+
+def publish_access_revoked(classroom_ids, user_id=None):
+    """
+    Ends the event streams of a user in classrooms they lost access to, once the current transaction commits.
+
+    The `access.revoked` event is published on the activity stream of each classroom, where the streams
+    of the user end on receiving it (see `events.views`) and the others skip it, so open streams never
+    poll the database to find out their access was revoked.
+
+    Args:
+        classroom_ids (iterable): The classrooms the user lost access to.
+        user_id (int, optional): The user, or None when the classrooms themselves are gone and every
+            stream on them ends.
+    """
+    for classroom_id in classroom_ids:
+        publish_classroom_event(classroom_id, ACCESS_REVOKED, user_id=user_id)
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+class LocalBrokerSubscription:
+    """
+    Async iterator over the messages a `LocalBroker` received on one channel.
+    """
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, message)
+
+    async def aclose(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """
+    In-memory stand-in for a publish/subscribe broker.
+
+    Messages are passed as the serialized strings a real broker would carry, to every subscription of
+    the channel whatever the bus it belongs to, so several `BrokerEventBus` sharing one `LocalBroker`
+    behave like processes sharing a Redis server. Meant for tests and development.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    async def subscribe(self, channel):
+        subscription = LocalBrokerSubscription(self, channel)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions[subscription.channel].discard(subscription)
+            if not self._subscriptions[subscription.channel]:
+                del self._subscriptions[subscription.channel]
+
+
+class RedisBrokerSubscription:
+    """
+    Async iterator over the messages of a Redis pub/sub channel.
+    """
+
+    def __init__(self, pubsub):
+        self.pubsub = pubsub
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            if message is not None:
+                return message["data"]
+
+    async def aclose(self):
+        await self.pubsub.aclose()
+
+
+class RedisBroker:
+    """
+    Broker relaying the events through Redis pub/sub, to share them between processes and nodes.
+
+    Requires the `redis` package, which is not installed by default.
+
+    Args:
+        url (str): The URL of the Redis server.
+    """
+
+    def __init__(self, url="redis://localhost:6379/0"):
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:
+            raise ImproperlyConfigured("RedisBroker requires the redis package.") from exc
+        self.client = redis.Redis.from_url(url)
+        self.async_client = redis.asyncio.Redis.from_url(url, decode_responses=True)
+
+    def publish(self, channel, message):
+        self.client.publish(channel, message)
+
+    async def subscribe(self, channel):
+        pubsub = self.async_client.pubsub()
+        await pubsub.subscribe(channel)
+        return RedisBrokerSubscription(pubsub)
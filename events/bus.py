@@ -0,0 +1,310 @@
+import asyncio
+import json
+import threading
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+DEFAULT_BUS = "events.bus.InProcessEventBus"
+DEFAULT_MAX_PENDING = 100
+
+# Put in the queue of a subscription to wake its reader up once it is closed.
+CLOSED = object()
+
+
+class SubscriptionClosed(Exception):
+    """
+    Raised when reading from a subscription that was closed, because its reader fell behind or its
+    broker connection was lost. Events may have been missed, so the reader should resynchronize.
+    """
+
+
+class Event:
+    """
+    A message published on a channel of the bus.
+
+    Attributes:
+        type (str): The kind of event, such as `post.created`.
+        data (dict): The JSON serializable payload.
+        id (str): A unique id, sent to the clients so they can discard duplicates.
+    """
+
+    def __init__(self, type, data, id=None):
+        self.type = type
+        self.data = data
+        self.id = id or uuid.uuid4().hex
+
+    def to_message(self):
+        return json.dumps({"id": self.id, "type": self.type, "data": self.data}, cls=DjangoJSONEncoder)
+
+    @classmethod
+    def from_message(cls, message):
+        return cls(**json.loads(message))
+
+    @cached_property
+    def frame(self):
+        """
+        The event in the server-sent events format, rendered once however many streams send it.
+        """
+        data = json.dumps(self.data, cls=DjangoJSONEncoder)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n".encode()
+
+
+class Subscription:
+    """
+    The events of one channel received by one reader, buffered in an asyncio queue.
+
+    Events are put from any thread through the event loop the subscription was opened on, so
+    publishers running in sync code (views, signal handlers) never block on a reader. A reader falling
+    more than `max_pending` events behind is closed rather than buffered without bound.
+
+    Use it as an async context manager::
+
+        async with get_bus().subscribe(channel) as subscription:
+            event = await subscription.get(timeout=15)
+    """
+
+    def __init__(self, bus, channel, max_pending):
+        self.bus = bus
+        self.channel = channel
+        self.queue = asyncio.Queue(max_pending)
+        self.loop = None
+        self.closed = False
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        ready = self.bus.add(self)
+        if ready is not None:
+            try:
+                # Shared by the subscriptions opened while the broker subscription is pending.
+                await asyncio.shield(ready)
+            except BaseException:
+                self.bus.remove(self)
+                raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.bus.remove(self)
+
+    def put(self, event):
+        """
+        Queues an event for the reader; thread-safe.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The event loop of the reader is closed.
+            self.bus.remove(self)
+
+    def close(self):
+        """
+        Wakes the reader up with `SubscriptionClosed`; thread-safe.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self._close)
+        except RuntimeError:
+            self.bus.remove(self)
+
+    def _put(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._close()
+
+    def _close(self):
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(CLOSED)
+
+    async def get(self, timeout=None):
+        """
+        Returns the next event, or None if none was published within `timeout` seconds.
+
+        Raises:
+            SubscriptionClosed: If the subscription was closed.
+        """
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is CLOSED:
+            raise SubscriptionClosed
+        return event
+
+
+class InProcessEventBus:
+    """
+    Event bus fanning events out to the subscriptions of the current process.
+
+    Enough for a single node; every process only sees the events published in it, so deployments with
+    several workers use `BrokerEventBus`.
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, channel):
+        return Subscription(self, channel, self.max_pending)
+
+    def add(self, subscription):
+        """
+        Registers an opened subscription.
+
+        Returns:
+            Awaitable: Completed once the subscription receives events, or None if it already does.
+        """
+        with self._lock:
+            self._subscriptions[subscription.channel].add(subscription)
+
+    def remove(self, subscription):
+        """
+        Unregisters a subscription.
+
+        Returns:
+            bool: True if it was the last subscription of its channel.
+        """
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is None or subscription not in subscriptions:
+                return False
+            subscriptions.discard(subscription)
+            if subscriptions:
+                return False
+            del self._subscriptions[subscription.channel]
+            return True
+
+    def count(self, channel):
+        """
+        Returns the number of subscriptions to a channel in this process.
+        """
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    def publish(self, channel, event):
+        self.deliver(channel, event)
+
+    def deliver(self, channel, event):
+        """
+        Hands an event to every local subscription of the channel.
+        """
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def close_channel(self, channel):
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.close()
+
+
+class BrokerEventBus(InProcessEventBus):
+    """
+    Event bus publishing through a message broker, so events reach the subscriptions of every process.
+
+    Each process holds a single broker subscription per channel, opened with the first local
+    subscription and closed with the last one, and fans the messages it receives out locally. Thousands
+    of streams on a channel therefore share one broker subscription.
+
+    Args:
+        broker: A broker instance, or the dotted path of its class, see `events.brokers`.
+        max_pending (int): Events buffered per subscription before a slow reader is closed.
+        **options: Arguments of the broker class when `broker` is a path.
+    """
+
+    def __init__(self, broker="events.brokers.LocalBroker", max_pending=DEFAULT_MAX_PENDING, **options):
+        super().__init__(max_pending)
+        self.broker = import_string(broker)(**options) if isinstance(broker, str) else broker
+        self._listeners = {}
+
+    def add(self, subscription):
+        with self._lock:
+            self._subscriptions[subscription.channel].add(subscription)
+            listener = self._listeners.get(subscription.channel)
+            if listener is None:
+                ready = subscription.loop.create_future()
+                task = subscription.loop.create_task(self.listen(subscription.channel, ready))
+                listener = self._listeners[subscription.channel] = (task, ready)
+        return listener[1]
+
+    def remove(self, subscription):
+        last = super().remove(subscription)
+        if last:
+            with self._lock:
+                listener = self._listeners.pop(subscription.channel, None)
+            if listener is not None:
+                task = listener[0]
+                try:
+                    task.get_loop().call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    # The event loop is closed, and the task with it.
+                    pass
+        return last
+
+    def publish(self, channel, event):
+        self.broker.publish(channel, event.to_message())
+
+    async def listen(self, channel, ready):
+        """
+        Relays the broker messages of a channel to the local subscriptions until cancelled.
+
+        If the broker connection fails, the local subscriptions are closed so their readers resynchronize.
+        """
+        try:
+            broker_subscription = await self.broker.subscribe(channel)
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        except Exception as exc:
+            # Raised to the subscriptions waiting to open.
+            if not ready.done():
+                ready.set_exception(exc)
+            self.drop_listener(channel)
+            return
+        if not ready.done():
+            ready.set_result(None)
+        try:
+            async for message in broker_subscription:
+                self.deliver(channel, Event.from_message(message))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # The next subscriptions open a new broker subscription.
+            self.drop_listener(channel)
+            self.close_channel(channel)
+        finally:
+            await broker_subscription.aclose()
+
+    def drop_listener(self, channel):
+        with self._lock:
+            listener = self._listeners.get(channel)
+            if listener is not None and listener[0] is asyncio.current_task():
+                del self._listeners[channel]
+
+
+@lru_cache(maxsize=None)
+def get_bus():
+    """
+    Returns the event bus of the process, built from the `EVENTS_BUS` and `EVENTS_BUS_OPTIONS` settings.
+    """
+    bus_class = import_string(getattr(settings, "EVENTS_BUS", DEFAULT_BUS))
+    return bus_class(**getattr(settings, "EVENTS_BUS_OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_bus(setting, **kwargs):
+    if setting in ("EVENTS_BUS", "EVENTS_BUS_OPTIONS"):
+        get_bus.cache_clear()
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from events.brokers import LocalBroker
+from events.bus import BrokerEventBus, Event, InProcessEventBus, SubscriptionClosed, get_bus
+
+
+class FailingBroker(LocalBroker):
+    async def subscribe(self, channel):
+        subscription = await super().subscribe(channel)
+        self.failing = subscription
+        return subscription
+
+    def fail(self):
+        self.failing.loop.call_soon_threadsafe(self.failing.queue.put_nowait, "not json")
+
+
+class InProcessEventBusTests(SimpleTestCase):
+    def setUp(self):
+        self.bus = InProcessEventBus(max_pending=3)
+
+    async def test_events_are_delivered_to_the_channel_subscribers(self):
+        async with self.bus.subscribe("a") as first, self.bus.subscribe("a") as second, \
+                self.bus.subscribe("b") as other:
+            event = Event("post.created", {"id": 1})
+            thread = threading.Thread(target=self.bus.publish, args=("a", event))
+            thread.start()
+            thread.join()
+            self.assertIs(await first.get(timeout=1), event)
+            self.assertIs(await second.get(timeout=1), event)
+            self.assertIsNone(await other.get(timeout=0.01))
+            self.assertEqual(self.bus.count("a"), 2)
+        self.assertEqual(self.bus.count("a"), 0)
+
+    async def test_slow_subscriber_is_closed(self):
+        async with self.bus.subscribe("a") as subscription:
+            for index in range(4):
+                self.bus.publish("a", Event("post.created", {"id": index}))
+            await asyncio.sleep(0)
+            with self.assertRaises(SubscriptionClosed):
+                await subscription.get(timeout=1)
+
+    def test_frame(self):
+        event = Event("post.created", {"id": 1}, id="abc")
+        self.assertEqual(event.frame, b'id: abc\nevent: post.created\ndata: {"id": 1}\n\n')
+
+    @override_settings(EVENTS_BUS="events.bus.BrokerEventBus", EVENTS_BUS_OPTIONS={"max_pending": 5})
+    def test_bus_is_built_from_settings(self):
+        self.assertIsInstance(get_bus(), BrokerEventBus)
+        self.assertEqual(get_bus().max_pending, 5)
+        self.assertIs(get_bus(), get_bus())
+
+
+class BrokerEventBusTests(SimpleTestCase):
+    def setUp(self):
+        self.broker = LocalBroker()
+        self.bus = BrokerEventBus(self.broker)
+        self.other_bus = BrokerEventBus(self.broker)
+
+    async def test_events_reach_the_subscribers_of_other_processes(self):
+        async with self.bus.subscribe("a") as subscription:
+            self.other_bus.publish("a", Event("quiz.created", {"title": "quiz"}, id="abc"))
+            event = await subscription.get(timeout=1)
+        self.assertEqual((event.id, event.type, event.data), ("abc", "quiz.created", {"title": "quiz"}))
+
+    async def test_channel_subscribers_share_one_broker_subscription(self):
+        async with self.bus.subscribe("a") as first, self.bus.subscribe("a") as second:
+            self.assertEqual(len(self.broker._subscriptions["a"]), 1)
+            self.other_bus.publish("a", Event("post.created", {}))
+            self.assertIsNotNone(await first.get(timeout=1))
+            self.assertIsNotNone(await second.get(timeout=1))
+            listener = self.bus._listeners["a"][0]
+        await asyncio.wait([listener])
+        self.assertNotIn("a", self.broker._subscriptions)
+
+    async def test_broker_failure_closes_the_subscriptions(self):
+        broker = FailingBroker()
+        bus = BrokerEventBus(broker)
+        async with bus.subscribe("a") as subscription:
+            broker.fail()
+            with self.assertRaises(SubscriptionClosed):
+                await subscription.get(timeout=1)
+        self.assertEqual(bus._listeners, {})
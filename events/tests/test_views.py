@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import uuid
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from account.models import TeacherProfile
+from authuser.tokens import RoleRefreshToken
+from classroom.deletion import request_deletion
+from classroom.models import Classroom
+from classroom.tests.test_setup import TestSetUp
+from events.activity import get_classroom_channel
+from events.bus import get_bus
+from post.models import Comment, CoursePost
+from quiz.importer import import_quiz
+from quiz_room_hub.asgi import application
+
+User = get_user_model()
+
+
+class ClassroomEventStreamViewTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.events_url = reverse("events:classroom-events", kwargs={"classroom_id": self.classroom1_id})
+
+    async def open(self, url=None, token=None, **headers):
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        return await self.async_client.get(url or self.events_url, headers=headers)
+
+    async def read(self, content):
+        return await anext(content)
+
+    async def disconnect(self, content):
+        # The ASGI handler cancels the response when the client disconnects.
+        read = asyncio.ensure_future(anext(content))
+        await asyncio.sleep(0.01)
+        read.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await read
+
+    def create_in_transaction(self, create):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create()
+
+    async def test_stream_requires_classroom_membership(self):
+        response = await self.open()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = await self.open(token=self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = await self.open(reverse("events:classroom-events", kwargs={"classroom_id": uuid.uuid4()}),
+                                   token=self.student_access_token)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = await self.open(f"{self.events_url}?access_token=invalid")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_requires_asgi(self):
+        response = self.client.get(self.events_url, headers={"Authorization": f"Bearer {self.student_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    async def test_members_receive_the_classroom_activity(self):
+        response = await self.open(token=self.student_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        content = aiter(response)
+        self.assertIn(b"event: ready", await self.read(content))
+
+        post = await sync_to_async(self.create_in_transaction)(
+            lambda: CoursePost.objects.create(title="title", content="content", classroom=self.classroom1))
+        frame = await self.read(content)
+        self.assertIn(b"event: post.created\n", frame)
+        self.assertIn(f'"id": "{post.id}"'.encode(), frame)
+
+        comment = await sync_to_async(self.create_in_transaction)(
+            lambda: Comment.objects.create(content="content", post=post, user=self.teacher))
+        self.assertIn(f'"id": "{comment.id}"'.encode(), await self.read(content))
+
+        await sync_to_async(self.create_in_transaction)(lambda: import_quiz(self.classroom1, "imported", []))
+        self.assertIn(b'"title": "imported"', await self.read(content))
+
+        await sync_to_async(self.create_in_transaction)(
+            lambda: CoursePost.objects.create(title="other", content="content", classroom=self.classroom2))
+        channel = get_classroom_channel(self.classroom1_id)
+        self.assertEqual(get_bus().count(channel), 1)
+        await self.disconnect(content)
+        self.assertEqual(get_bus().count(channel), 0)
+
+    @override_settings(EVENTS_KEEPALIVE_INTERVAL=0.01)
+    async def test_token_in_query_and_keepalive(self):
+        response = await self.open(f"{self.events_url}?access_token={self.teacher_access_token}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = aiter(response)
+        await self.read(content)
+        self.assertEqual(await self.read(content), b": keepalive\n\n")
+        await self.disconnect(content)
+
+    @override_settings(EVENTS_KEEPALIVE_INTERVAL=0.01)
+    async def test_stream_ends_when_the_token_expires(self):
+        response = await self.open(token=self.student_access_token)
+        content = aiter(response)
+        await self.read(content)
+        self.assertEqual(await self.read(content), b": keepalive\n\n")
+        with mock.patch("events.views.time") as clock:
+            clock.time.return_value = AccessToken(self.student_access_token)["exp"]
+            with self.assertRaises(StopAsyncIteration):
+                await self.read(content)
+        self.assertEqual(get_bus().count(get_classroom_channel(self.classroom1_id)), 0)
+
+    async def test_stream_ends_when_the_student_is_unenrolled(self):
+        response = await self.open(token=self.student_access_token)
+        content = aiter(response)
+        await self.read(content)
+        teacher_content = aiter(await self.open(token=self.teacher_access_token))
+        await self.read(teacher_content)
+
+        await sync_to_async(self.create_in_transaction)(self.student_classroom1.delete)
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(content)
+        # The revocation is not sent to the other members.
+        post = await sync_to_async(self.create_in_transaction)(
+            lambda: CoursePost.objects.create(title="title", content="content", classroom=self.classroom1))
+        self.assertIn(f'"id": "{post.id}"'.encode(), await self.read(teacher_content))
+        await self.disconnect(teacher_content)
+
+    async def test_stream_ends_when_the_user_is_deactivated_or_deleted(self):
+        content = aiter(await self.open(token=self.teacher_access_token))
+        await self.read(content)
+        self.teacher.is_active = False
+        await sync_to_async(self.create_in_transaction)(self.teacher.save)
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(content)
+
+        content = aiter(await self.open(token=self.student_access_token))
+        await self.read(content)
+        await sync_to_async(self.create_in_transaction)(lambda: User.objects.get(pk=self.student.pk).delete())
+        with self.assertRaises(StopAsyncIteration):
+            await self.read(content)
+
+    async def test_streams_end_when_the_classroom_is_deleted(self):
+        contents = [aiter(await self.open(token=token))
+                    for token in (self.teacher_access_token, self.student_access_token)]
+        for content in contents:
+            await self.read(content)
+        await sync_to_async(self.create_in_transaction)(lambda: request_deletion(self.classroom1))
+        for content in contents:
+            with self.assertRaises(StopAsyncIteration):
+                await self.read(content)
+        self.assertEqual(get_bus().count(get_classroom_channel(self.classroom1_id)), 0)
+
+
+class ClassroomEventStreamThreadTests(TransactionTestCase):
+    """
+    Opens streams through the ASGI application, whose handler, unlike the test client, keeps a thread
+    for the sync code of each request.
+    """
+
+    def setUp(self):
+        teacher = User.objects.create_user(email="teacher@example.com", password="password", is_teacher=True)
+        classroom = Classroom.objects.create(name="classroom", teacher=TeacherProfile.objects.get(user=teacher))
+        self.token = str(RoleRefreshToken.for_user(teacher).access_token)
+        self.path = reverse("events:classroom-events", kwargs={"classroom_id": classroom.id})
+
+    async def open(self, disconnected):
+        """
+        Sends a request opening a stream to the ASGI application and returns once the stream started.
+        """
+        started = asyncio.Event()
+        received = []
+
+        async def receive():
+            if not received:
+                received.append(True)
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                started.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": self.path, "raw_path": self.path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {self.token}".encode())],
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+        task = asyncio.create_task(application(scope, receive, send))
+        await started.wait()
+        return task
+
+    def test_open_streams_hold_no_thread(self):
+        async def open_streams():
+            disconnected = asyncio.Event()
+            threads = threading.active_count()
+            tasks = [await self.open(disconnected) for _ in range(20)]
+            await asyncio.sleep(0.05)
+            self.assertEqual(threading.active_count(), threads)
+            self.assertEqual(get_bus().count(get_classroom_channel(self.path.split("/")[3])), 20)
+            disconnected.set()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(open_streams())
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import ClassroomEventStreamView
+
+app_name = "events"
+
+urlpatterns = [
+    path("classrooms/<uuid:classroom_id>/events/", ClassroomEventStreamView.as_view(), name="classroom-events"),
+]
@@ -0,0 +1,171 @@
+import time
+
+from asgiref.sync import SyncToAsync, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.translation import gettext_lazy as _
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.request import Request
+
+from authuser.authentication import get_query_parameter_authenticators
+from classroom.membership import get_membership
+from classroom.models import Classroom
+from .activity import ACCESS_REVOKED, get_classroom_channel
+from .bus import SubscriptionClosed, get_bus
+
+DEFAULT_KEEPALIVE_INTERVAL = 15
+
+# Milliseconds an `EventSource` waits before reconnecting after the stream ends.
+RECONNECT_DELAY = 3000
+
+READY_FRAME = f"retry: {RECONNECT_DELAY}\nevent: ready\ndata: {{}}\n\n".encode()
+KEEPALIVE_FRAME = b": keepalive\n\n"
+
+
+def get_keepalive_interval():
+    return getattr(settings, "EVENTS_KEEPALIVE_INTERVAL", DEFAULT_KEEPALIVE_INTERVAL)
+
+
+def close_connections():
+    for connection in connections.all(initialized_only=True):
+        # Closing a connection in a transaction, as tests run in one, would abort it.
+        if not connection.in_atomic_block:
+            connection.close()
+
+
+async def release_request_thread():
+    """
+    Closes the database connections of the request's thread and shuts the thread down.
+
+    Django's ASGI handler runs the sync code of a request, from the `request_started` receivers to the
+    middleware processing the response, on a thread kept for the request until its response ends. A
+    stream no longer needs it once its body is being sent, so the thread and its connections are
+    released instead of being held as long as the stream stays open; sync code running at the end of the
+    request gets a new thread.
+    """
+    await sync_to_async(close_connections)()
+    context = SyncToAsync.thread_sensitive_context.get(None)
+    executor = SyncToAsync.context_to_thread_executor.pop(context, None) if context is not None else None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+class ClassroomEventStreamView(View):
+    """
+    Async view streaming the activity of a classroom as server-sent events.
+
+    Members of the classroom receive a `post.created`, `comment.created` or `quiz.created` event as soon
+    as one is committed (see `events.activity`), instead of polling the list endpoints. The stream starts
+    with a `ready` event, after which clients should refresh what they display, conditionally (see
+    `quiz_room_hub.conditional`), since events published while disconnected are not replayed. It ends
+    when the client falls too far behind or the bus loses its broker, and `EventSource` then reconnects.
+
+    Authentication and the membership check run in a single thread hop when the stream opens, and the
+    request's thread and database connections are released once the stream starts (see
+    `release_request_thread`). An open stream is then a coroutine waiting on its subscription, so a
+    worker holds thousands of them without a thread or a connection each. A comment is sent every
+    `EVENTS_KEEPALIVE_INTERVAL` seconds to keep idle connections open through proxies.
+
+    The stream of a user ends when the user is deactivated, deleted or unenrolled, on the `access.revoked`
+    event published on the classroom's channel (see `events.activity.publish_access_revoked`), and when
+    the access token expires; the client reconnects with a fresh token, as the expired one is rejected.
+
+    The access token is read from the Authorization header or, for `EventSource` which cannot send
+    headers, from the `access_token` query parameter. Streaming needs an ASGI server, see
+    `quiz_room_hub.asgi`.
+
+    Methods:
+        get(request, classroom_id):
+            Handles GET requests opening the event stream of the classroom.
+
+        authorize(request, classroom_id):
+            Authenticates the request and checks the user is a member of the classroom.
+
+        stream(channel, user_id, expires_at):
+            Yields the frames of the stream.
+    """
+
+    async def get(self, request, classroom_id):
+        """
+        Handles GET requests opening the event stream of the classroom.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            classroom_id (UUID): The ID of the classroom.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream` response, or a JSON error response with a 401,
+            403, 404 or, outside of ASGI, 501 status.
+        """
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse({"detail": _("Event streams require an ASGI server.")},
+                                status=status.HTTP_501_NOT_IMPLEMENTED)
+        try:
+            user, token = await sync_to_async(self.authorize)(request, classroom_id)
+        except APIException as exc:
+            return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+
+        expires_at = token.get("exp") if token is not None else None
+        frames = self.stream(get_classroom_channel(classroom_id), user.pk, expires_at)
+        response = StreamingHttpResponse(frames, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # Disables the response buffering of nginx.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def authorize(self, request, classroom_id):
+        """
+        Authenticates the request and checks the user is a member of the classroom.
+
+        Returns:
+            tuple: The authenticated user and the validated access token.
+
+        Raises:
+            NotAuthenticated: If no valid access token was given.
+            NotFound: If the classroom does not exist.
+            PermissionDenied: If the user is not a member of the classroom.
+        """
+        drf_request = Request(request, authenticators=get_query_parameter_authenticators())
+        if not drf_request.user or not drf_request.user.is_authenticated:
+            raise NotAuthenticated
+        classroom = Classroom.objects.filter(id=classroom_id).first()
+        if classroom is None:
+            raise NotFound
+        if not get_membership(drf_request).is_member(classroom):
+            raise PermissionDenied
+        return drf_request.user, drf_request.auth
+
+    async def stream(self, channel, user_id, expires_at=None):
+        """
+        Yields the frames of the stream: `ready`, then the events of the channel and keep-alive comments.
+
+        The stream ends at `expires_at`, the expiry timestamp of the access token, and on an
+        `access.revoked` event for the user or for every member. The subscription is closed when the
+        client disconnects, as the ASGI handler then cancels the response.
+        """
+        await release_request_thread()
+        keepalive_interval = get_keepalive_interval()
+        async with get_bus().subscribe(channel) as subscription:
+            yield READY_FRAME
+            while True:
+                timeout = keepalive_interval
+                if expires_at is not None:
+                    timeout = min(timeout, expires_at - time.time())
+                    if timeout <= 0:
+                        return
+                try:
+                    event = await subscription.get(timeout=timeout)
+                except SubscriptionClosed:
+                    return
+                if event is None:
+                    if expires_at is not None and expires_at <= time.time():
+                        return
+                    yield KEEPALIVE_FRAME
+                elif event.type != ACCESS_REVOKED:
+                    yield event.frame
+                elif event.data["user_id"] in (None, user_id):
+                    return
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.models import Job
+from jobs.queue import run_worker
+
+
+class Command(BaseCommand):
+    help = "Runs the queued background jobs, polling the database for new ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=1, help="Number of jobs run at the same time.")
+        parser.add_argument("--poll-interval", type=float, default=None,
+                            help="Seconds to wait when the queue is empty; JOBS_POLL_INTERVAL by default.")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is left to run.")
+
+    def report(self, job):
+        message = f"Job {job.id} ({job.name}) {job.status} after {job.attempts} attempt(s)."
+        if job.status == Job.SUCCEEDED:
+            self.stdout.write(self.style.SUCCESS(message))
+        elif job.status == Job.FAILED:
+            self.stdout.write(self.style.ERROR(message))
+        else:
+            self.stdout.write(self.style.WARNING(f"{message} Retrying after {job.run_after.isoformat()}."))
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("The concurrency must be at least 1.")
+        try:
+            processed = run_worker(concurrency=options["concurrency"], poll_interval=options["poll_interval"],
+                                   once=options["once"], on_job_done=self.report)
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} jobs."))
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+def start_heartbeats(apps, schema_editor):
+    """
+    Dates the heartbeat of the jobs running during the upgrade from their start, as their worker did not beat yet.
+    """
+    Job = apps.get_model("jobs", "Job")
+    Job.objects.filter(status="running").update(heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Last heartbeat'),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+User = get_user_model()
+
+
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (SUCCEEDED, _("Succeeded")),
+        (FAILED, _("Failed")),
+    )
+
+    id = models.UUIDField(_("Job id"), primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(_("Job name"), max_length=100)
+    payload = models.JSONField(_("Payload"), default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(_("Status"), max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    result = models.JSONField(_("Result"), null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(_("Last error"), blank=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    max_attempts = models.PositiveSmallIntegerField(_("Maximum attempts"), default=3)
+    run_after = models.DateTimeField(_("Run after"), default=timezone.now)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs",
+                                   verbose_name=_("Created by"))
+    created_at = models.DateTimeField(_("Job created at"), auto_now_add=True)
+    started_at = models.DateTimeField(_("Job started at"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Job finished at"), null=True, blank=True)
+    heartbeat_at = models.DateTimeField(_("Last heartbeat"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Job")
+        verbose_name_plural = _("Jobs")
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_queue_idx"),
+            models.Index(fields=["created_by", "-created_at", "-id"], name="job_created_by_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} -> {self.status}"
@@ -0,0 +1,270 @@
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import get_handler
+
+DEFAULT_POLL_INTERVAL = 1
+DEFAULT_RETRY_DELAY = 30
+DEFAULT_HEARTBEAT_INTERVAL = 30
+DEFAULT_STALE_AFTER = 300
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def get_poll_interval():
+    return getattr(settings, "JOBS_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)
+
+
+def get_retry_delay():
+    return getattr(settings, "JOBS_RETRY_DELAY", DEFAULT_RETRY_DELAY)
+
+
+def get_heartbeat_interval():
+    return getattr(settings, "JOBS_HEARTBEAT_INTERVAL", DEFAULT_HEARTBEAT_INTERVAL)
+
+
+def get_stale_after():
+    return getattr(settings, "JOBS_STALE_AFTER", DEFAULT_STALE_AFTER)
+
+
+def get_max_attempts():
+    return getattr(settings, "JOBS_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+
+
+def enqueue(name, payload=None, user=None, max_attempts=None, run_after=None):
+    """
+    Queues a job for the `run_jobs` workers.
+
+    When called inside a transaction, the job only becomes visible to the workers once it commits, so a
+    job never runs against rows its caller rolled back.
+
+    Args:
+        name (str): The name the handler was registered under, see `jobs.registry.job`.
+        payload (dict, optional): The keyword arguments of the handler; stored as JSON.
+        user (User, optional): The user the job runs for, who can follow it through the jobs endpoints.
+        max_attempts (int, optional): The number of attempts before the job is marked as failed.
+        run_after (datetime, optional): The earliest time the job may run.
+
+    Returns:
+        Job: The queued job.
+
+    Raises:
+        LookupError: If no handler is registered under that name.
+    """
+    get_handler(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=max_attempts or get_max_attempts(),
+        run_after=run_after or timezone.now(),
+    )
+
+
+def get_runnable_jobs(now):
+    return Job.objects.filter(status=Job.PENDING, run_after__lte=now).order_by("run_after")
+
+
+def claim_jobs(limit):
+    """
+    Marks up to `limit` runnable jobs as running and returns them.
+
+    Where the database supports it (MySQL 8, PostgreSQL), the jobs are locked with
+    `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent workers skip the rows another worker is claiming
+    instead of waiting for it. Elsewhere (SQLite) each job is claimed by a conditional UPDATE that only
+    succeeds if the job is still pending, which gives the same guarantee with one statement per job.
+
+    Returns:
+        list: The claimed jobs, each claimed by this call only.
+    """
+    now = timezone.now()
+    claim = {"status": Job.RUNNING, "started_at": now, "heartbeat_at": now, "attempts": F("attempts") + 1}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job_ids = list(get_runnable_jobs(now).select_for_update(skip_locked=True)
+                           .values_list("id", flat=True)[:limit])
+            Job.objects.filter(id__in=job_ids).update(**claim)
+    else:
+        job_ids = [job_id for job_id in get_runnable_jobs(now).values_list("id", flat=True)[:limit]
+                   if Job.objects.filter(id=job_id, status=Job.PENDING).update(**claim)]
+
+    return sorted(Job.objects.filter(id__in=job_ids), key=lambda job: job.run_after) if job_ids else []
+
+
+def run_job(job):
+    """
+    Runs a claimed job and records its outcome.
+
+    A failed job is queued again with an exponential backoff, `JOBS_RETRY_DELAY` seconds doubled after
+    each attempt, until it has made `max_attempts` attempts; it is then marked as failed with the
+    traceback of the last error. A job whose handler is not registered fails without retrying.
+
+    Returns:
+        Job: The job, with its new status.
+    """
+    handler = None
+    try:
+        handler = get_handler(job.name)
+        result = handler(**job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if handler is not None and job.attempts < job.max_attempts:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=get_retry_delay() * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.finished_at = timezone.now()
+
+    job.save(update_fields=["status", "result", "error", "run_after", "finished_at"])
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Queues again the jobs left running by a worker that stopped, once their heartbeat is `JOBS_STALE_AFTER`
+    seconds old.
+
+    A worker beats for its jobs every `JOBS_HEARTBEAT_INTERVAL` seconds while they run, see `Heartbeat`, so a
+    long job, like the purge of a large classroom, is never taken for an abandoned one. Jobs that already made
+    all their attempts are marked as failed instead.
+
+    Returns:
+        int: The number of jobs requeued or failed.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=now - timedelta(seconds=get_stale_after()))
+    requeued = stale.filter(attempts__lt=F("max_attempts")).update(status=Job.PENDING, run_after=now)
+    failed = stale.update(status=Job.FAILED, finished_at=now, error="The worker stopped while running the job.")
+    return requeued + failed
+
+
+class Heartbeat:
+    """
+    Records that a worker is still running its jobs, by updating their `heartbeat_at` from a thread of its own
+    every `interval` seconds, however long each job runs.
+
+    The thread holds its own database connection, closed when the heartbeat stops. A beat that fails, e.g.
+    while the database restarts, is skipped: the next one reconnects, well before the jobs are stale.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.job_ids = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="jobs-heartbeat", daemon=True)
+
+    def add(self, job_ids):
+        with self.lock:
+            self.job_ids.update(job_ids)
+
+    def discard(self, job_id):
+        with self.lock:
+            self.job_ids.discard(job_id)
+
+    def beat(self):
+        with self.lock:
+            job_ids = list(self.job_ids)
+        if job_ids:
+            Job.objects.filter(id__in=job_ids, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+
+    def run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    self.beat()
+                except DatabaseError:
+                    connection.close()
+        finally:
+            connection.close()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+def run_job_in_thread(job):
+    """
+    Runs a job from a worker thread, which holds its own database connection, closed once the job ran.
+    """
+    try:
+        return run_job(job)
+    finally:
+        connection.close()
+
+
+def run_worker(concurrency=1, poll_interval=None, once=False, on_job_done=None):
+    """
+    Polls the queue and runs the jobs until interrupted.
+
+    With a concurrency above one, the jobs run on a pool of threads, which suits the I/O and database bound
+    handlers of this project. A job is claimed as soon as a thread is free, so a long job never holds back the
+    jobs claimed after it. CPU bound jobs scale by starting several `run_jobs` processes instead: claiming is
+    safe across workers. While the jobs run, a `Heartbeat` keeps them from being requeued as stale.
+
+    Args:
+        concurrency (int): The number of jobs run at the same time.
+        poll_interval (float, optional): The seconds to wait when the queue is empty.
+        once (bool): Stop once no job is runnable nor running instead of waiting for new ones.
+        on_job_done (callable, optional): Called with each job once it ran.
+
+    Returns:
+        int: The number of jobs run.
+    """
+    poll_interval = get_poll_interval() if poll_interval is None else poll_interval
+    executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+    heartbeat = Heartbeat(get_heartbeat_interval())
+    running = set()
+    processed = 0
+
+    def finish(job):
+        nonlocal processed
+        heartbeat.discard(job.id)
+        processed += 1
+        if on_job_done:
+            on_job_done(job)
+
+    heartbeat.start()
+    try:
+        while True:
+            requeue_stale_jobs()
+            jobs = claim_jobs(concurrency - len(running))
+            heartbeat.add(job.id for job in jobs)
+            if executor:
+                running.update(executor.submit(run_job_in_thread, job) for job in jobs)
+            else:
+                for job in jobs:
+                    finish(run_job(job))
+
+            if running:
+                # Waits for the first job to finish, to claim another in its place; with threads left free,
+                # polls the queue again meanwhile.
+                timeout = None if len(running) == concurrency else poll_interval
+                done, running = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(future.result())
+            elif not jobs:
+                if once:
+                    return processed
+                time.sleep(poll_interval)
+    finally:
+        heartbeat.stop()
+        if executor:
+            executor.shutdown()
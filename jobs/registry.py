@@ -0,0 +1,35 @@
+registry = {}
+
+
+def job(name):
+    """
+    Registers a function as the handler of the jobs with the given name.
+
+    The handler is called with the payload of the job as keyword arguments and may return a JSON
+    serializable result. Handlers are declared in the `jobs` module of an app, which is imported when the
+    app registry is ready.
+
+    Example:
+        @job("classroom.purge")
+        def purge(classroom_id):
+            ...
+    """
+    def register(handler):
+        if name in registry and registry[name] is not handler:
+            raise ValueError(f"A job named {name!r} is already registered.")
+        registry[name] = handler
+        return handler
+    return register
+
+
+def get_handler(name):
+    """
+    Returns the handler registered for a job name.
+
+    Raises:
+        LookupError: If no handler is registered under that name.
+    """
+    try:
+        return registry[name]
+    except KeyError:
+        raise LookupError(f"No job named {name!r} is registered.")
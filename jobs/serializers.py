@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ("id", "name", "status", "result", "error", "attempts", "max_attempts", "run_after", "created_at",
+                  "started_at", "finished_at",)
+        read_only_fields = fields
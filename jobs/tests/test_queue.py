@@ -0,0 +1,189 @@
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import Heartbeat, claim_jobs, enqueue, requeue_stale_jobs, run_job, run_worker
+from jobs.registry import job, registry
+
+calls = []
+
+
+@job("tests.echo")
+def echo(value):
+    calls.append(value)
+    return {"value": value}
+
+
+@job("tests.fail")
+def fail():
+    raise RuntimeError("boom")
+
+
+released = threading.Event()
+
+
+@job("tests.wait")
+def wait_for_release():
+    released.wait(timeout=5)
+    calls.append("released")
+
+
+@job("tests.requeue_stale")
+def requeue_stale(seconds):
+    time.sleep(seconds)
+    return {"requeued": requeue_stale_jobs()}
+
+
+@override_settings(JOBS_RETRY_DELAY=10)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_rejects_unknown_jobs(self):
+        with self.assertRaisesMessage(LookupError, "No job named 'tests.unknown' is registered."):
+            enqueue("tests.unknown")
+        self.assertFalse(Job.objects.exists())
+
+    def test_registering_another_handler_under_a_taken_name(self):
+        with self.assertRaises(ValueError):
+            job("tests.echo")(fail)
+        self.assertIs(registry["tests.echo"], echo)
+
+    def test_claim_jobs_claims_each_runnable_job_once(self):
+        first = enqueue("tests.echo", {"value": 1})
+        second = enqueue("tests.echo", {"value": 2})
+        enqueue("tests.echo", {"value": 3}, run_after=timezone.now() + timedelta(hours=1))
+
+        claimed = claim_jobs(5)
+        self.assertEqual([claimed_job.id for claimed_job in claimed], [first.id, second.id])
+        self.assertTrue(all(claimed_job.status == Job.RUNNING and claimed_job.attempts == 1
+                            for claimed_job in claimed))
+        self.assertEqual(claim_jobs(5), [])
+
+    def test_claim_jobs_without_skip_locked_support(self):
+        enqueue("tests.echo", {"value": 1})
+        with mock.patch("django.db.connection.features.has_select_for_update_skip_locked", False):
+            claimed = claim_jobs(5)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(Job.objects.get().status, Job.RUNNING)
+
+    def test_successful_job_stores_its_result(self):
+        queued = enqueue("tests.echo", {"value": "hello"})
+        run_job(claim_jobs(1)[0])
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.SUCCEEDED)
+        self.assertEqual(queued.result, {"value": "hello"})
+        self.assertIsNotNone(queued.finished_at)
+
+    def test_failed_job_is_retried_with_backoff_then_fails(self):
+        queued = enqueue("tests.fail", max_attempts=2)
+        before = timezone.now()
+        run_job(claim_jobs(1)[0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.PENDING, 1))
+        self.assertIn("RuntimeError: boom", queued.error)
+        self.assertGreaterEqual(queued.run_after, before + timedelta(seconds=10))
+        self.assertEqual(claim_jobs(1), [])
+
+        Job.objects.update(run_after=timezone.now())
+        run_job(claim_jobs(1)[0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(queued.finished_at)
+
+    def test_job_without_handler_fails_at_once(self):
+        queued = Job.objects.create(name="tests.removed")
+        run_job(claim_jobs(1)[0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Job.FAILED, 1))
+
+    @override_settings(JOBS_STALE_AFTER=60)
+    def test_stale_running_jobs_are_requeued(self):
+        retried = enqueue("tests.echo", {"value": 1})
+        exhausted = enqueue("tests.echo", {"value": 2}, max_attempts=1)
+        claim_jobs(2)
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+        Job.objects.update(started_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+        Job.objects.update(heartbeat_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(requeue_stale_jobs(), 2)
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(retried.status, Job.PENDING)
+        self.assertEqual(exhausted.status, Job.FAILED)
+
+    def test_heartbeat_dates_the_running_jobs_it_follows(self):
+        followed = enqueue("tests.echo", {"value": 1})
+        other = enqueue("tests.echo", {"value": 2})
+        claim_jobs(2)
+        Job.objects.update(heartbeat_at=timezone.now() - timedelta(minutes=2))
+        heartbeat = Heartbeat(interval=60)
+        heartbeat.add([followed.id])
+        before = timezone.now()
+        heartbeat.beat()
+        followed.refresh_from_db()
+        other.refresh_from_db()
+        self.assertGreaterEqual(followed.heartbeat_at, before)
+        self.assertLess(other.heartbeat_at, before)
+
+        heartbeat.discard(followed.id)
+        with self.assertNumQueries(0):
+            heartbeat.beat()
+
+    def test_worker_runs_every_runnable_job(self):
+        for value in range(3):
+            enqueue("tests.echo", {"value": value})
+        enqueue("tests.fail", max_attempts=1)
+        done = []
+        self.assertEqual(run_worker(once=True, on_job_done=done.append), 4)
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual([finished.status for finished in done], [Job.SUCCEEDED] * 3 + [Job.FAILED])
+
+    def test_run_jobs_command(self):
+        enqueue("tests.echo", {"value": 1})
+        enqueue("tests.fail")
+        out = StringIO()
+        call_command("run_jobs", "--once", stdout=out)
+        self.assertIn("(tests.echo) succeeded after 1 attempt(s).", out.getvalue())
+        self.assertIn("(tests.fail) pending after 1 attempt(s). Retrying after", out.getvalue())
+        self.assertIn("Ran 2 jobs.", out.getvalue())
+
+
+class JobWorkerThreadTests(TransactionTestCase):
+    """
+    Runs the worker threads against committed jobs, as the threads do not see the transaction of a `TestCase`.
+    """
+
+    def setUp(self):
+        calls.clear()
+        released.clear()
+
+    def test_worker_claims_a_job_as_soon_as_a_thread_is_free(self):
+        enqueue("tests.wait")
+        for value in range(3):
+            enqueue("tests.echo", {"value": value}, run_after=timezone.now() + timedelta(microseconds=value + 1))
+
+        def on_job_done(finished):
+            if len(calls) == 3:
+                released.set()
+
+        self.assertEqual(run_worker(concurrency=2, poll_interval=0.01, once=True, on_job_done=on_job_done), 4)
+        # The three quick jobs ran one after another on the free thread while the first job was still running.
+        self.assertEqual(calls, [0, 1, 2, "released"])
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.01, JOBS_STALE_AFTER=0.2)
+    def test_long_running_job_is_not_requeued(self):
+        long_job = enqueue("tests.requeue_stale", {"seconds": 0.5})
+        self.assertEqual(run_worker(once=True), 1)
+        long_job.refresh_from_db()
+        self.assertEqual((long_job.status, long_job.attempts), (Job.SUCCEEDED, 1))
+        self.assertEqual(long_job.result, {"requeued": 0})
@@ -0,0 +1,44 @@
+from django.urls import reverse
+from rest_framework import status
+
+from classroom.tests.test_setup import TestSetUp
+from jobs.models import Job
+from jobs.queue import enqueue
+from jobs.tests.test_queue import echo  # noqa: F401, registers the test handlers
+
+
+class JobAPIViewTests(TestSetUp):
+    def setUp(self):
+        super().setUp()
+        self.jobs_list_url = reverse("jobs:jobs-list")
+        self.teacher_job = enqueue("tests.echo", {"value": 1}, user=self.teacher)
+        self.teacher2_job = enqueue("tests.echo", {"value": 2}, user=self.teacher2)
+        self.jobs_detail_url = reverse("jobs:jobs-detail", kwargs={"pk": self.teacher_job.id})
+
+    def get(self, url, token):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_views_with_unauthenticated_user(self):
+        self.assertEqual(self.client.get(self.jobs_list_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(self.jobs_detail_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_only_has_the_jobs_of_the_user(self):
+        Job.objects.filter(id=self.teacher_job.id).update(status=Job.SUCCEEDED)
+        enqueue("tests.echo", {"value": 3}, user=self.teacher)
+
+        response = self.get(self.jobs_list_url, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.get(f"{self.jobs_list_url}?status={Job.SUCCEEDED}", self.teacher_access_token)
+        self.assertEqual([job["id"] for job in response.data["results"]], [str(self.teacher_job.id)])
+
+    def test_detail_of_own_job(self):
+        response = self.get(self.jobs_detail_url, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["name"], response.data["status"]), ("tests.echo", Job.PENDING))
+        self.assertNotIn("payload", response.data)
+
+    def test_detail_of_another_users_job(self):
+        self.assertEqual(self.get(self.jobs_detail_url, self.teacher2_access_token).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.get(self.jobs_detail_url, self.admin_access_token).status_code, status.HTTP_200_OK)
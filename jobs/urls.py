@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import JobListAPIView, JobRetrieveAPIView
+
+app_name = "jobs"
+
+urlpatterns = [
+    path("jobs/", JobListAPIView.as_view(), name="jobs-list"),
+    path("jobs/<uuid:pk>/", JobRetrieveAPIView.as_view(), name="jobs-detail"),
+]
@@ -0,0 +1,78 @@
+from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+def get_user_jobs(user):
+    """
+    Return the jobs a user can follow: the jobs queued for them, or every job for staff users.
+    """
+    if user.is_staff:
+        return Job.objects.all()
+    return Job.objects.filter(created_by=user)
+
+
+class JobListAPIView(ListAPIView):
+    """
+    API view to retrieve the background jobs queued for the authenticated user, newest first.
+
+    Heavy operations such as the purge of a deleted classroom run outside of the request in a `run_jobs`
+    worker; this view lets the user follow them. The list can be narrowed with the `status` and `name`
+    query parameters.
+
+    Permissions:
+    - `IsAuthenticated`: Ensures that the user is logged in.
+
+    Serializer:
+    - Uses the `JobSerializer` to serialize the jobs.
+
+    Methods:
+    - `get_queryset`: Retrieves the jobs of the authenticated user, filtered by the query parameters.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Retrieve the jobs of the authenticated user.
+
+        Returns:
+            QuerySet: The jobs of the user, filtered by `status` and `name` when given.
+        """
+        jobs = get_user_jobs(self.request.user)
+        for field in ("status", "name"):
+            value = self.request.query_params.get(field)
+            if value:
+                jobs = jobs.filter(**{field: value})
+        return jobs
+
+
+class JobRetrieveAPIView(RetrieveAPIView):
+    """
+    API view to retrieve the status of a background job.
+
+    The response holds the status of the job, its number of attempts, its result once it succeeded and
+    the error of its last failed attempt. Jobs of other users are answered with a 404.
+
+    Permissions:
+    - `IsAuthenticated`: Ensures that the user is logged in.
+
+    Serializer:
+    - Uses the `JobSerializer` to serialize the job.
+
+    Methods:
+    - `get_queryset`: Retrieves the jobs the authenticated user can follow.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Retrieve the jobs the authenticated user can follow.
+
+        Returns:
+            QuerySet: The jobs of the user, or every job for staff users.
+        """
+        return get_user_jobs(self.request.user)
@@ -0,0 +1,380 @@
+import asyncio
+import json
+import time
+from array import array
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from events.activity import publish_classroom_event
+from quiz.analytics import invalidate_analytics
+from quiz.grading import Score
+from quiz.leaderboard import rebuild_entries
+from quiz.models import Question, StudentAnswer, StudentQuiz
+
+DEFAULT_TALLY_INTERVAL = 0.5
+DEFAULT_HOST_TIMEOUT = 300
+DEFAULT_BATCH_SIZE = 1000
+
+# Number of players listed in the ranking sent when a session ends.
+RANKING_SIZE = 10
+
+# Close code sent to the players once the session is over.
+NORMAL_CLOSURE = 1000
+
+# Live sessions of this process, by quiz id.
+sessions = {}
+
+
+def get_tally_interval():
+    return getattr(settings, "LIVE_TALLY_INTERVAL", DEFAULT_TALLY_INTERVAL)
+
+
+def get_host_timeout():
+    return getattr(settings, "LIVE_HOST_TIMEOUT", DEFAULT_HOST_TIMEOUT)
+
+
+class LiveSessionError(Exception):
+    """
+    Raised on a message the session can't apply; its message is sent back to the connection.
+    """
+
+
+class LiveQuestion:
+    """
+    A question of a live session and the answers given to it.
+
+    Attributes:
+        id (UUID): The id of the question.
+        description (str): The text of the question.
+        answer_ids (list): The ids of its answer options, in a fixed order.
+        answer_descriptions (list): The text of the options, in the same order.
+        valid (frozenset): The positions of the valid options.
+        tallies (array): The number of players who picked each option.
+        picks (dict): The positions picked by each player, by student id.
+        latencies (dict): The milliseconds each player took to answer, by student id.
+    """
+
+    def __init__(self, id, description, answers):
+        self.id = id
+        self.description = description
+        self.answer_ids = [answer.id for answer in answers]
+        self.answer_descriptions = [answer.description for answer in answers]
+        self.valid = frozenset(index for index, answer in enumerate(answers) if answer.is_valid)
+        # Positions of the options by the string form of their id, as sent by the clients.
+        self.positions = {str(answer_id): index for index, answer_id in enumerate(self.answer_ids)}
+        self.tallies = array("L", [0] * len(answers))
+        self.picks = {}
+        self.latencies = {}
+
+    def is_correct(self, student_id):
+        """
+        Returns True if the player picked every valid option and no other, as `quiz.grading.is_correct`.
+        """
+        picks = self.picks.get(student_id)
+        return bool(self.valid) and picks is not None and frozenset(picks) == self.valid
+
+    def to_message(self):
+        return {
+            "id": self.id,
+            "description": self.description,
+            "answers": [{"id": answer_id, "description": description}
+                        for answer_id, description in zip(self.answer_ids, self.answer_descriptions)],
+        }
+
+
+def encode(message):
+    return json.dumps(message, default=str)
+
+
+class LiveSession:
+    """
+    In-memory state of a quiz run live by its teacher.
+
+    The host pushes the questions one at a time; players answer the open question and the host sees the
+    distribution of the answers, sent at most every `LIVE_TALLY_INTERVAL` seconds whatever the number of
+    players. Answers only update the in-memory tallies: nothing is written to the database until the
+    session ends, when the `StudentAnswer` and `StudentQuiz` rows of every player are inserted with
+    `bulk_create`, see `save_results`.
+
+    The state lives in the process handling the connections, so every connection of a session must
+    reach the same ASGI worker. A session whose host stays disconnected for `LIVE_HOST_TIMEOUT`
+    seconds ends, saving the answers given so far.
+
+    Attributes:
+        quiz_id (UUID): The id of the quiz.
+        classroom_id (UUID): The id of its classroom.
+        questions (list): The `LiveQuestion` of the quiz.
+        index (int): The position of the current question, -1 before the first one.
+        is_open (bool): Whether the current question accepts answers.
+        host: The connection of the teacher, or None while disconnected.
+        players (dict): The connections of the students, by student id; a disconnected student keeps
+            their entry, set to None, and their answers.
+    """
+
+    def __init__(self, quiz_id, classroom_id, questions):
+        self.quiz_id = quiz_id
+        self.classroom_id = classroom_id
+        self.questions = questions
+        self.index = -1
+        self.is_open = False
+        self.opened_at = None
+        self.host = None
+        self.players = {}
+        self.ended = False
+        self._tally_handle = None
+        self._host_timeout_handle = None
+        self._tasks = set()
+
+    @property
+    def question(self):
+        return self.questions[self.index] if self.index >= 0 else None
+
+    async def send(self, connection, message):
+        if connection is not None:
+            await connection.send(encode(message))
+
+    async def broadcast(self, message):
+        """
+        Sends a message to every connected player and to the host.
+
+        The message is encoded once, and the connections are written to concurrently so a slow client
+        does not delay the others.
+        """
+        text = encode(message)
+        connections = [connection for connection in self.players.values() if connection is not None]
+        if self.host is not None:
+            connections.append(self.host)
+        await asyncio.gather(*(connection.send(text) for connection in connections), return_exceptions=True)
+
+    def get_state(self, student_id=None):
+        question = self.question
+        state = {
+            "type": "state",
+            "index": self.index,
+            "question_count": len(self.questions),
+            "question": question.to_message() if question is not None and self.is_open else None,
+            "players": self.count_players(),
+        }
+        if student_id is not None:
+            state["answered"] = question is not None and student_id in question.picks
+        return state
+
+    def count_players(self):
+        return sum(connection is not None for connection in self.players.values())
+
+    async def attach_host(self, connection):
+        if self._host_timeout_handle is not None:
+            self._host_timeout_handle.cancel()
+            self._host_timeout_handle = None
+        previous, self.host = self.host, connection
+        if previous is not None:
+            await previous.close(NORMAL_CLOSURE)
+        await self.send(connection, self.get_state())
+
+    async def detach_host(self, connection):
+        if self.host is not connection:
+            return
+        self.host = None
+        if not self.ended:
+            self._host_timeout_handle = asyncio.get_running_loop().call_later(get_host_timeout(), self.spawn,
+                                                                              self.end)
+
+    async def attach_player(self, student_id, connection):
+        previous = self.players.get(student_id)
+        self.players[student_id] = connection
+        if previous is not None:
+            await previous.close(NORMAL_CLOSURE)
+        await self.send(connection, self.get_state(student_id))
+        self.schedule_tally()
+
+    async def detach_player(self, student_id, connection):
+        if self.players.get(student_id) is connection:
+            self.players[student_id] = None
+            self.schedule_tally()
+
+    async def next_question(self):
+        """
+        Closes the current question, if open, and pushes the next one to every connection.
+        """
+        if self.index + 1 >= len(self.questions):
+            raise LiveSessionError(_("There is no question left."))
+        if self.is_open:
+            await self.close_question()
+        self.index += 1
+        self.is_open = True
+        self.opened_at = time.monotonic()
+        await self.broadcast({"type": "question", "index": self.index,
+                              "question": self.question.to_message()})
+
+    def answer(self, student_id, answer_ids):
+        """
+        Records the options picked by a player for the open question, in memory only.
+
+        Only the first answer of a player to a question counts.
+
+        Returns:
+            int: The milliseconds the player took to answer.
+
+        Raises:
+            LiveSessionError: If no question is open, the player already answered or an option is unknown.
+        """
+        question = self.question
+        if not self.is_open:
+            raise LiveSessionError(_("No question is open."))
+        if student_id in question.picks:
+            raise LiveSessionError(_("You already answered this question."))
+        try:
+            picks = tuple(sorted({question.positions[str(answer_id)] for answer_id in answer_ids}))
+        except (KeyError, TypeError):
+            raise LiveSessionError(_("Unknown answer."))
+        if not picks:
+            raise LiveSessionError(_("Pick at least one answer."))
+
+        latency = round((time.monotonic() - self.opened_at) * 1000)
+        question.picks[student_id] = picks
+        question.latencies[student_id] = latency
+        for position in picks:
+            question.tallies[position] += 1
+        self.schedule_tally()
+        return latency
+
+    def schedule_tally(self):
+        """
+        Sends the answer distribution to the host after `LIVE_TALLY_INTERVAL` seconds, unless already planned,
+        so a burst of answers results in a single message.
+        """
+        if self._tally_handle is None and not self.ended:
+            self._tally_handle = asyncio.get_running_loop().call_later(get_tally_interval(), self.spawn,
+                                                                       self.send_tally)
+
+    def spawn(self, function):
+        # The loop only keeps weak references to its tasks.
+        task = asyncio.get_running_loop().create_task(function())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def send_tally(self):
+        self._tally_handle = None
+        question = self.question
+        await self.send(self.host, {
+            "type": "tally",
+            "index": self.index,
+            "tallies": list(question.tallies) if question is not None else [],
+            "answered": len(question.picks) if question is not None else 0,
+            "players": self.count_players(),
+        })
+
+    async def close_question(self):
+        """
+        Stops accepting answers to the current question and reveals its results to every connection.
+        """
+        if not self.is_open:
+            raise LiveSessionError(_("No question is open."))
+        self.is_open = False
+        question = self.question
+        latencies = question.latencies.values()
+        await self.broadcast({
+            "type": "results",
+            "index": self.index,
+            "tallies": list(question.tallies),
+            "valid_answer_ids": [question.answer_ids[position] for position in sorted(question.valid)],
+            "answered": len(question.picks),
+            "mean_latency_ms": round(sum(latencies) / len(latencies)) if latencies else None,
+        })
+
+    def get_ranking(self):
+        """
+        Returns the best players: most correct answers first, then the fastest on average.
+        """
+        ranking = []
+        for student_id in self.players:
+            correct = sum(question.is_correct(student_id) for question in self.questions)
+            latencies = [question.latencies[student_id] for question in self.questions
+                         if student_id in question.latencies]
+            mean_latency = round(sum(latencies) / len(latencies)) if latencies else None
+            ranking.append({"student_id": student_id, "correct": correct, "mean_latency_ms": mean_latency})
+        ranking.sort(key=lambda entry: (-entry["correct"], entry["mean_latency_ms"] is None,
+                                        entry["mean_latency_ms"] or 0))
+        return ranking[:RANKING_SIZE]
+
+    async def end(self):
+        """
+        Ends the session: saves the results, sends the ranking and closes every connection.
+        """
+        if self.ended:
+            return
+        self.ended = True
+        for handle in (self._tally_handle, self._host_timeout_handle):
+            if handle is not None:
+                handle.cancel()
+        self.is_open = False
+        try:
+            graded = await sync_to_async(save_results)(self)
+        except Exception:
+            # Keeps the answers, so the host can end the session again.
+            self.ended = False
+            raise
+        sessions.pop(self.quiz_id, None)
+
+        await self.broadcast({"type": "ended", "graded": graded, "ranking": self.get_ranking()})
+        connections = [connection for connection in self.players.values() if connection is not None]
+        if self.host is not None:
+            connections.append(self.host)
+        await asyncio.gather(*(connection.close(NORMAL_CLOSURE) for connection in connections),
+                             return_exceptions=True)
+
+
+def load_session(quiz):
+    """
+    Builds the session of a quiz with its questions and answer options, loaded by two queries.
+
+    The session is announced on the classroom activity stream, see `events.activity`.
+    """
+    questions = Question.objects.filter(quiz=quiz).order_by("id").prefetch_related("answers")
+    live_questions = [
+        LiveQuestion(question.id, question.description, sorted(question.answers.all(), key=lambda answer: answer.id))
+        for question in questions
+    ]
+    publish_classroom_event(quiz.classroom_id, "quiz.live", id=quiz.pk, title=quiz.title)
+    return LiveSession(quiz.pk, quiz.classroom_id, live_questions)
+
+
+def save_results(session, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Writes the answers and marks of the players of an ended session.
+
+    The `StudentAnswer` and `StudentQuiz` rows are inserted by `bulk_create` in one transaction, and, as
+    it sends no signals, the classroom leaderboard is rebuilt and the quiz analytics invalidated here.
+    Players already graded on the quiz keep their mark, and a player who answered nothing gets 0, as
+    with `quiz.grading.grade_quiz`. Questions the session did not reach count as wrong answers.
+
+    Returns:
+        int: The number of graded players.
+    """
+    student_ids = set(session.players)
+    student_ids -= set(StudentQuiz.objects
+                       .filter(quiz_id=session.quiz_id, student_id__in=student_ids)
+                       .values_list("student_id", flat=True))
+    if not student_ids:
+        return 0
+
+    student_answers = []
+    student_quizzes = []
+    for student_id in student_ids:
+        correct = 0
+        for question in session.questions:
+            student_answers.extend(StudentAnswer(student_id=student_id, answer_id=question.answer_ids[position])
+                                   for position in question.picks.get(student_id, ()))
+            correct += question.is_correct(student_id)
+        score = Score(correct=correct, total=len(session.questions))
+        student_quizzes.append(StudentQuiz(student_id=student_id, quiz_id=session.quiz_id, mark=score.mark))
+
+    with transaction.atomic():
+        StudentAnswer.objects.bulk_create(student_answers, batch_size=batch_size, ignore_conflicts=True)
+        StudentQuiz.objects.bulk_create(student_quizzes, batch_size=batch_size, ignore_conflicts=True)
+        rebuild_entries(session.classroom_id, student_ids=student_ids)
+    invalidate_analytics(session.quiz_id)
+    return len(student_quizzes)
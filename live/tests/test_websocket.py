@@ -0,0 +1,214 @@
+import asyncio
+import json
+import uuid
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from classroom.models import StudentClassroom
+from live.sessions import sessions
+from live.websocket import FORBIDDEN, NOT_FOUND, UNAUTHORIZED
+from quiz.models import Answer, LeaderboardEntry, Question, StudentAnswer, StudentQuiz
+from quiz.tests.test_setup_views import QuizTestSetup
+from quiz_room_hub.asgi import application
+
+
+class WebSocketClient:
+    """
+    Drives a WebSocket connection through the ASGI application, as a server would.
+    """
+
+    def __init__(self, path, token=None, headers=()):
+        self.scope = {
+            "type": "websocket",
+            "path": path,
+            "query_string": f"access_token={token}".encode() if token else b"",
+            "headers": list(headers),
+        }
+        self.inbound = asyncio.Queue()
+        self.outbound = asyncio.Queue()
+        self.task = None
+
+    async def connect(self):
+        self.task = asyncio.ensure_future(application(self.scope, self.inbound.get, self.outbound.put))
+        await self.inbound.put({"type": "websocket.connect"})
+        return await self.receive_raw()
+
+    async def receive_raw(self):
+        return await asyncio.wait_for(self.outbound.get(), 5)
+
+    async def receive(self, *types):
+        """
+        Returns the next message of one of the given types, skipping the others.
+        """
+        while True:
+            message = await self.receive_raw()
+            if message["type"] == "websocket.close":
+                return message
+            data = json.loads(message["text"])
+            if not types or data["type"] in types:
+                return data
+
+    async def send(self, data):
+        await self.inbound.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def disconnect(self):
+        await self.inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, 5)
+
+
+@override_settings(LIVE_TALLY_INTERVAL=0.01)
+class LiveQuizSessionTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        StudentClassroom.objects.create(student=self.student3_profile, classroom=self.classroom2)
+        self.question2 = Question.objects.create(description="question2", quiz=self.quiz)
+        self.answers2 = [Answer.objects.create(description=str(index), is_valid=index < 2, question=self.question2)
+                         for index in range(3)]
+        self.valid_ids = {
+            str(question.id): [str(answer.id) for answer in answers if answer.is_valid]
+            for question, answers in ((self.question, [self.answer, self.answer2]), (self.question2, self.answers2))
+        }
+        self.invalid_ids = {
+            str(self.question.id): str(self.answer.id),
+            str(self.question2.id): str(self.answers2[2].id),
+        }
+        self.path = f"/ws/quizzes/{self.quiz.id}/live/"
+        self.addCleanup(sessions.clear)
+
+    async def join(self, token):
+        client = WebSocketClient(self.path, token)
+        self.assertEqual(await client.connect(), {"type": "websocket.accept"})
+        state = await client.receive("state")
+        return client, state
+
+    async def test_connections_are_checked(self):
+        cases = [
+            (self.path, None, UNAUTHORIZED),
+            (self.path, "invalid", UNAUTHORIZED),
+            (self.path, self.student2_access_token, NOT_FOUND),  # no session yet
+            (self.path, self.teacher_access_token, FORBIDDEN),
+            (f"/ws/quizzes/{uuid.uuid4()}/live/", self.teacher2_access_token, NOT_FOUND),
+            ("/ws/unknown/", self.teacher2_access_token, NOT_FOUND),
+        ]
+        for path, token, code in cases:
+            with self.subTest(path=path, code=code):
+                client = WebSocketClient(path, token)
+                self.assertEqual(await client.connect(), {"type": "websocket.close", "code": code})
+
+        host, _ = await self.join(self.teacher2_access_token)
+        client = WebSocketClient(self.path, self.student_access_token)
+        self.assertEqual(await client.connect(), {"type": "websocket.close", "code": FORBIDDEN})
+        await host.disconnect()
+
+    async def test_connection_with_an_authorization_header(self):
+        headers = [(b"authorization", f"Bearer {self.teacher2_access_token}".encode())]
+        host = WebSocketClient(self.path, headers=headers)
+        self.assertEqual(await host.connect(), {"type": "websocket.accept"})
+        self.assertEqual((await host.receive("state"))["players"], 0)
+        await host.disconnect()
+
+    async def test_live_round(self):
+        host, state = await self.join(self.teacher2_access_token)
+        self.assertEqual((state["index"], state["question_count"], state["players"]), (-1, 2, 0))
+        player, state = await self.join(self.student2_access_token)
+        other, _ = await self.join(self.student3_access_token)
+        # A tally may have been sent before the second player joined.
+        tally = await host.receive("tally")
+        while tally["players"] < 2:
+            tally = await host.receive("tally")
+
+        await host.send({"type": "next"})
+        questions = [await client.receive("question") for client in (host, player, other)]
+        question = questions[0]["question"]
+        self.assertEqual(questions[1]["question"], question)
+        self.assertNotIn("is_valid", question["answers"][0])
+        positions = {answer["id"]: index for index, answer in enumerate(question["answers"])}
+        valid_ids, invalid_id = self.valid_ids[question["id"]], self.invalid_ids[question["id"]]
+
+        # The database connection is only reachable from the thread the sync code runs in.
+        queries = CaptureQueriesContext(connection)
+        await sync_to_async(queries.__enter__)()
+        try:
+            await player.send({"type": "answer", "answer_ids": valid_ids})
+            self.assertGreaterEqual((await player.receive("answered", "error"))["latency_ms"], 0)
+            await player.send({"type": "answer", "answer_ids": [invalid_id]})
+            self.assertEqual((await player.receive("answered", "error"))["type"], "error")
+            await other.send({"type": "answer", "answer_ids": ["unknown"]})
+            self.assertEqual((await other.receive("answered", "error"))["type"], "error")
+            await other.send({"type": "answer", "answer_ids": [invalid_id]})
+            await other.receive("answered")
+            await player.send({"type": "next"})
+            self.assertEqual((await player.receive("error"))["type"], "error")
+
+            tally = await host.receive("tally")
+            while tally["answered"] < 2:
+                tally = await host.receive("tally")
+            self.assertEqual(tally["tallies"][positions[valid_ids[0]]], 1)
+            self.assertEqual(tally["tallies"][positions[invalid_id]], 1)
+        finally:
+            await sync_to_async(queries.__exit__)(None, None, None)
+        self.assertEqual(len(queries), 0)
+
+        await host.send({"type": "close"})
+        results = await player.receive("results")
+        self.assertEqual(results["answered"], 2)
+        self.assertEqual(results["valid_answer_ids"], [answer["id"] for answer in question["answers"]
+                                                       if answer["id"] in valid_ids])
+        await player.send({"type": "answer", "answer_ids": valid_ids})
+        self.assertEqual((await player.receive("answered", "error"))["type"], "error")
+
+        await host.send({"type": "next"})
+        second_question = (await player.receive("question"))["question"]
+        self.assertNotEqual(second_question["id"], question["id"])
+        second_valid_ids = self.valid_ids[second_question["id"]]
+        await player.send({"type": "answer", "answer_ids": second_valid_ids})
+        await player.receive("answered")
+        await host.send({"type": "next"})
+        self.assertEqual((await host.receive("error"))["type"], "error")
+
+        await host.send({"type": "end"})
+        ended = await other.receive("ended")
+        self.assertEqual(ended["graded"], 2)
+        self.assertEqual(ended["ranking"][0]["student_id"], str(self.student2_profile.id))
+        self.assertEqual((await other.receive())["type"], "websocket.close")
+        for client in (host, player, other):
+            await client.disconnect()
+        self.assertNotIn(self.quiz.id, sessions)
+
+        marks = await sync_to_async(lambda: dict(StudentQuiz.objects.filter(quiz=self.quiz, student__in=[
+            self.student2_profile, self.student3_profile]).values_list("student_id", "mark")))()
+        self.assertEqual(marks, {self.student2_profile.id: Decimal("100.00"),
+                                 self.student3_profile.id: Decimal("0.00")})
+        answers = await sync_to_async(lambda: StudentAnswer.objects.filter(student=self.student2_profile).count())()
+        self.assertEqual(answers, len(valid_ids) + len(second_valid_ids))
+        entries = await sync_to_async(lambda: LeaderboardEntry.objects.filter(classroom=self.classroom2, student__in=[
+            self.student2_profile, self.student3_profile]).count())()
+        self.assertEqual(entries, 2)
+
+    async def test_reconnected_player_keeps_their_answers(self):
+        host, _ = await self.join(self.teacher2_access_token)
+        player, _ = await self.join(self.student2_access_token)
+        await host.send({"type": "next"})
+        question = (await player.receive("question"))["question"]
+        await player.send({"type": "answer", "answer_ids": [question["answers"][0]["id"]]})
+        await player.receive("answered")
+        await player.disconnect()
+
+        player, state = await self.join(self.student2_access_token)
+        self.assertTrue(state["answered"])
+        self.assertEqual(state["question"], question)
+        await player.disconnect()
+        await host.disconnect()
+
+    @override_settings(LIVE_HOST_TIMEOUT=0.01)
+    async def test_session_ends_when_host_leaves(self):
+        host, _ = await self.join(self.teacher2_access_token)
+        player, _ = await self.join(self.student2_access_token)
+        await host.disconnect()
+        self.assertEqual((await player.receive("ended"))["graded"], 1)
+        await player.disconnect()
+        self.assertTrue(await sync_to_async(StudentQuiz.objects.filter(quiz=self.quiz).exists)())
@@ -0,0 +1,172 @@
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, QueryDict
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+
+from authuser.authentication import get_query_parameter_authenticators
+from classroom.membership import get_membership
+from quiz.models import Quiz
+from .sessions import LiveSessionError, encode, load_session, sessions
+
+PATH_RE = re.compile(r"^/ws/quizzes/(?P<quiz_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/live/$")
+
+HOST = "host"
+PLAYER = "player"
+
+# Close codes of the rejected connections, mirroring the HTTP statuses.
+UNAUTHORIZED = 4401
+FORBIDDEN = 4403
+NOT_FOUND = 4404
+
+
+class Rejected(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+class Connection:
+    """
+    The sending side of an accepted WebSocket connection.
+    """
+
+    def __init__(self, send):
+        self._send = send
+        self.closed = False
+
+    async def send(self, text):
+        if not self.closed:
+            await self._send({"type": "websocket.send", "text": text})
+
+    async def close(self, code):
+        if not self.closed:
+            self.closed = True
+            await self._send({"type": "websocket.close", "code": code})
+
+
+def build_request(scope):
+    """
+    Returns a DRF request carrying the query string and headers of a WebSocket connection, for the
+    authenticators.
+    """
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = scope["path"]
+    request.GET = QueryDict(scope.get("query_string", b""))
+    for name, value in scope.get("headers", []):
+        request.META["HTTP_" + name.decode("latin1").upper().replace("-", "_")] = value.decode("latin1")
+    return Request(request, authenticators=get_query_parameter_authenticators())
+
+
+def authorize(scope, quiz_id):
+    """
+    Authenticates a connection with the configured authentication classes or the `access_token` query
+    parameter, as browsers can't send headers on WebSocket requests, and resolves its role in the live
+    session of the quiz.
+
+    The teacher owning the quiz's classroom hosts the session and its students play it.
+
+    Returns:
+        tuple: The role, the quiz and, for players, the student id.
+
+    Raises:
+        Rejected: With the close code to send if the connection is not allowed.
+    """
+    request = build_request(scope)
+    try:
+        if not request.user or not request.user.is_authenticated:
+            raise Rejected(UNAUTHORIZED)
+    except AuthenticationFailed:
+        raise Rejected(UNAUTHORIZED)
+
+    quiz = Quiz.objects.select_related("classroom").filter(pk=quiz_id).first()
+    if quiz is None:
+        raise Rejected(NOT_FOUND)
+
+    membership = get_membership(request)
+    if membership.is_owner(quiz.classroom):
+        return HOST, quiz, None
+    if membership.is_student and membership.is_member(quiz.classroom):
+        return PLAYER, quiz, membership.student_id
+    raise Rejected(FORBIDDEN)
+
+
+async def handle_message(session, role, student_id, connection, message):
+    """
+    Applies a message of a connection to the session.
+
+    The host sends `{"type": "next"}`, `{"type": "close"}` and `{"type": "end"}`; players send
+    `{"type": "answer", "answer_ids": [...]}`. Invalid messages are answered with an `error` message.
+    """
+    try:
+        data = json.loads(message.get("text") or message.get("bytes") or "")
+        kind = data["type"]
+    except (ValueError, TypeError, KeyError):
+        await connection.send(encode({"type": "error", "detail": _("Invalid message.")}))
+        return
+
+    try:
+        if session.ended:
+            raise LiveSessionError(_("The session is over."))
+        if role == HOST:
+            action = {"next": session.next_question, "close": session.close_question, "end": session.end}.get(kind)
+            if action is None:
+                raise LiveSessionError(_("Unknown message type."))
+            await action()
+        elif kind == "answer":
+            latency = session.answer(student_id, data.get("answer_ids"))
+            await connection.send(encode({"type": "answered", "index": session.index, "latency_ms": latency}))
+        else:
+            raise LiveSessionError(_("Unknown message type."))
+    except LiveSessionError as exc:
+        await connection.send(encode({"type": "error", "detail": str(exc)}))
+
+
+async def live_quiz_application(scope, receive, send):
+    """
+    ASGI application running the live quiz sessions at `/ws/quizzes/<quiz_id>/live/`.
+
+    The teacher's connection starts the session of the quiz, see `live.sessions.LiveSession`, and the
+    students of the classroom join it while it runs. The database is only queried when a connection
+    opens and when the session ends; the messages exchanged during the rounds are handled in memory.
+    """
+    message = await receive()
+    if message["type"] != "websocket.connect":
+        return
+    match = PATH_RE.match(scope["path"])
+    try:
+        if match is None:
+            raise Rejected(NOT_FOUND)
+        role, quiz, student_id = await sync_to_async(authorize)(scope, match["quiz_id"])
+        session = sessions.get(quiz.pk)
+        if session is None:
+            if role != HOST:
+                raise Rejected(NOT_FOUND)
+            session = sessions.setdefault(quiz.pk, await sync_to_async(load_session)(quiz))
+    except Rejected as exc:
+        await send({"type": "websocket.close", "code": exc.code})
+        return
+
+    await send({"type": "websocket.accept"})
+    connection = Connection(send)
+    if role == HOST:
+        await session.attach_host(connection)
+    else:
+        await session.attach_player(student_id, connection)
+    try:
+        while True:
+            message = await receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message["type"] == "websocket.receive":
+                await handle_message(session, role, student_id, connection, message)
+    finally:
+        connection.closed = True
+        if role == HOST:
+            await session.detach_host(connection)
+        else:
+            await session.detach_player(student_id, connection)
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('classroom', '0002_pagination_indexes'),
+        ('post', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursepost',
+            index=models.Index(fields=['classroom', '-created_at', '-id'], name='coursepost_classroom_idx'),
+        ),
+    ]
@@ -22,6 +22,9 @@ class CoursePost(models.Model):
         verbose_name = _("Course")
         verbose_name_plural = _("Courses")
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["classroom", "-created_at", "-id"], name="coursepost_classroom_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title}-{self.classroom.name}"
@@ -40,6 +43,9 @@ class Comment(models.Model):
         verbose_name = _("Comment")
         verbose_name_plural = _("Comments")
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["post", "-created_at", "-id"], name="comment_post_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.content[:10]}..."
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from classroom.response_cache import bump_generation
+from events.activity import publish_classroom_event
+from .models import Comment, CoursePost
+
+
+@receiver(post_save, sender=CoursePost)
+@receiver(post_delete, sender=CoursePost)
+def bump_post_classroom_generation(sender, instance, **kwargs):
+    bump_generation(instance.classroom_id)
+
+
+@receiver(post_save, sender=CoursePost)
+def publish_post_created(sender, instance, created, **kwargs):
+    if created:
+        publish_classroom_event(instance.classroom_id, "post.created", id=instance.pk, title=instance.title)
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_created(sender, instance, created, **kwargs):
+    if created:
+        publish_classroom_event(instance.post.classroom_id, "comment.created", id=instance.pk,
+                                post_id=instance.post_id)
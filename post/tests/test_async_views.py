@@ -0,0 +1,80 @@
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from rest_framework import status
+
+from post.models import CoursePost
+from post.tests.test_views_setup import TestSetup
+
+
+class AsyncCoursePostViewTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        for index in range(4):
+            CoursePost.objects.create(title=f"post {index}", content="content", classroom=self.classroom1)
+        self.async_list_url = reverse("post:posts-list-async", kwargs={"classroom_id": self.classroom1_id})
+        self.async_detail_url = reverse("post:posts-detail-async",
+                                        kwargs={"classroom_id": self.classroom1_id, "post_id": self.post.id})
+
+    async def get(self, url, token=None, **headers):
+        return await self.async_client.get(url, headers={
+            "Authorization": f"Bearer {token or self.student_access_token}", **headers})
+
+    async def sync_get(self, url, token=None):
+        return await sync_to_async(self.client.get)(url, headers={
+            "Authorization": f"Bearer {token or self.student_access_token}"})
+
+    async def test_pages_match_the_sync_endpoint(self):
+        ids, sync_ids = [], []
+        url, sync_url = f"{self.async_list_url}?page_size=2", f"{self.posts_list_url}?page_size=2"
+        while url:
+            data = (await self.get(url)).json()
+            ids += [post["id"] for post in data["results"]]
+            url = data["next"]
+        while sync_url:
+            data = (await self.sync_get(sync_url)).json()
+            sync_ids += [post["id"] for post in data["results"]]
+            sync_url = data["next"]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(ids, sync_ids)
+
+        # Going back from the last page.
+        data = (await self.get(f"{self.async_list_url}?page_size=2")).json()
+        data = (await self.get(data["next"])).json()
+        previous = (await self.get(data["previous"])).json()
+        self.assertEqual([post["id"] for post in previous["results"]], ids[:2])
+
+    async def test_list_errors_match_the_sync_endpoint(self):
+        response = await self.get(self.async_list_url, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        url = reverse("post:posts-list-async", kwargs={"classroom_id": uuid.uuid4()})
+        response = await self.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json(), (await self.sync_get(
+            reverse("post:posts-list", kwargs={"classroom_id": uuid.uuid4()}))).json())
+        response = await self.get(f"{self.async_list_url}?cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_unchanged_list_is_not_modified(self):
+        response = await self.get(self.async_list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith("W/"))
+        not_modified = await self.get(self.async_list_url, If_None_Match=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+
+    async def test_detail_matches_the_sync_endpoint(self):
+        response = await self.get(self.async_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sync_response = await self.sync_get(self.posts_detail_url)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+        not_modified = await self.get(self.async_detail_url, If_None_Match=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = await self.get(self.async_detail_url, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = await self.get(reverse("post:posts-detail-async",
+                                          kwargs={"classroom_id": self.classroom1_id, "post_id": uuid.uuid4()}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.db.models import QuerySet
+from rest_framework import status
+
+from post.models import Comment, CoursePost
+from post.tests.test_views_setup import TestSetup
+
+
+class ConditionalRequestTests(TestSetup):
+    def get(self, url, token=None, **headers):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token or self.student_access_token}",
+                                             **headers})
+
+    def put(self, url, data, token=None, **headers):
+        return self.client.put(url, data=data, headers={
+            "Authorization": f"Bearer {token or self.teacher_access_token}", **headers})
+
+    def test_unchanged_post_is_not_modified(self):
+        response = self.get(self.posts_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response["ETag"].startswith("W/"))
+
+        not_modified = self.get(self.posts_detail_url, If_None_Match=response["ETag"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        not_modified = self.get(self.posts_detail_url, If_Modified_Since=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_validators_are_checked_after_access(self):
+        etag = self.get(self.posts_detail_url)["ETag"]
+        response = self.get(self.posts_detail_url, self.student2_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_update_with_stale_etag_is_rejected(self):
+        etag = self.get(self.posts_detail_url)["ETag"]
+        response = self.put(self.posts_detail_url, self.post_data, If_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(self.get(self.posts_detail_url, If_None_Match=response["ETag"]).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        response = self.put(self.posts_detail_url, {"title": "lost update", "content": "content"}, If_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(CoursePost.objects.get(id=self.post.id).title, self.post_data["title"])
+
+    def test_comment_update_with_stale_etag_is_rejected(self):
+        etag = self.get(self.comments_detail_url_student_comment)["ETag"]
+        Comment.objects.get(id=self.student_comment.id).save()
+        response = self.put(self.comments_detail_url_student_comment, self.comment_data, self.student_access_token,
+                            If_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Comment.objects.get(id=self.student_comment.id).content, self.student_comment.content)
+
+    def test_updates_lock_the_row_they_check(self):
+        cases = [
+            (self.posts_detail_url, self.post_data, self.teacher_access_token, CoursePost),
+            (self.comments_detail_url_student_comment, self.comment_data, self.student_access_token, Comment),
+        ]
+        for url, data, token, model in cases:
+            with self.subTest(model=model.__name__):
+                etag = self.get(url)["ETag"]
+                with mock.patch.object(QuerySet, "select_for_update", autospec=True,
+                                       side_effect=QuerySet.select_for_update) as select_for_update:
+                    response = self.put(url, data, token, If_Match=etag)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual([call.args[0].model for call in select_for_update.call_args_list], [model])
+
+    def test_list_etag_follows_the_list(self):
+        etag = self.get(self.posts_list_url)["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        self.assertEqual(self.get(self.posts_list_url, If_None_Match=etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.get(f"{self.posts_list_url}?page=1")["ETag"], etag)
+
+        post = CoursePost.objects.create(title="title2", content="content", classroom=self.classroom1)
+        response = self.get(self.posts_list_url, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        post.delete()
+        response = self.get(self.posts_list_url, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_comment_list_etag_follows_updates(self):
+        etag = self.get(self.comments_list_url)["ETag"]
+        self.assertEqual(self.get(self.comments_list_url, If_None_Match=etag).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+        Comment.objects.get(id=self.teacher_comment.id).save()
+        self.assertEqual(self.get(self.comments_list_url, If_None_Match=etag).status_code, status.HTTP_200_OK)
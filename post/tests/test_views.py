@@ -1,5 +1,7 @@
+from django.utils import timezone
 from rest_framework import status
 
+from post.models import Comment
 from post.tests.test_views_setup import TestSetup
 
 
@@ -193,6 +195,25 @@ class CommentListAPIViewTests(TestSetup):
         self.assertEqual(student_response.status_code, status.HTTP_200_OK)
 
 
+    def test_view_paginates_with_a_stable_cursor(self):
+        for index in range(7):
+            Comment.objects.create(content=f"comment {index}", post=self.post, user=self.student)
+        # Rows created at the same instant are ordered by their primary key.
+        Comment.objects.filter(post=self.post).update(created_at=timezone.now())
+
+        url = f"{self.comments_list_url}?page_size=3"
+        seen = []
+        while url:
+            response = self.client.get(url, headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            seen.extend(comment["id"] for comment in response.data["results"])
+            url = response.data["next"]
+
+        expected = Comment.objects.filter(post=self.post).order_by("-created_at", "-id").values_list("id", flat=True)
+        self.assertEqual(seen, [str(comment_id) for comment_id in expected])
+
+
 class CommentRetrieveAPIViewTests(TestSetup):
     def test_view_with_unauthenticated_user(self):
         response = self.client.get(self.comments_detail_url_teacher_comment)
@@ -8,6 +8,10 @@ urlpatterns = [
     path("classrooms/<uuid:classroom_id>/posts/", views.CoursePostListAPIView.as_view(), name="posts-list"),
     path("classrooms/<uuid:classroom_id>/posts/<uuid:post_id>/", views.CoursePostRetrieveUpdateDestroyAPIView.as_view(),
          name="posts-detail"),
+    path("classrooms/<uuid:classroom_id>/posts/async/", views.AsyncCoursePostListAPIView.as_view(),
+         name="posts-list-async"),
+    path("classrooms/<uuid:classroom_id>/posts/<uuid:post_id>/async/", views.AsyncCoursePostRetrieveAPIView.as_view(),
+         name="posts-detail-async"),
     path("classrooms/<uuid:classroom_id>/posts/<uuid:post_id>/comments/create/", views.CommentCreateAPIView.as_view(),
          name="comments-create"),
     path("classrooms/<uuid:classroom_id>/posts/<uuid:post_id>/comments/", views.CommentListAPIView.as_view(),
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
@@ -10,10 +11,16 @@ from rest_framework.views import APIView
 
 from authuser.serializers import ErrorResponseSerializer
 from classroom.models import Classroom
-from classroom.permissions import IsClassroomOwner, IsClassroomMember
+from classroom.permissions import AsyncIsClassroomMember, IsClassroomOwner, IsClassroomMember
+from classroom.response_cache import ClassroomResponseCacheMixin
 from post.models import CoursePost, Comment
 from post.permissions import IsCommentAuthor
 from post.serializers import CoursePostSerializer, CommentSerializer
+from quiz_room_hub.async_views import AsyncAPIView, AsyncIsAuthenticated
+from quiz_room_hub.conditional import (ConditionalListMixin, aget_list_validator, evaluate_preconditions,
+                                       get_object_validators, set_validators)
+from quiz_room_hub.pagination import AsyncCreatedAtCursorPagination
+from quiz_room_hub.prefetch import get_related_paths
 
 
 class CoursePostCreateAPIView(CreateAPIView):
@@ -70,12 +77,14 @@ class CoursePostCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class CoursePostListAPIView(ListAPIView):
+class CoursePostListAPIView(ConditionalListMixin, ClassroomResponseCacheMixin, ListAPIView):
     """
     API view to list all CoursePost objects for a specific classroom.
 
     This view handles the retrieval of CoursePost objects, ensuring that the
-    user is authenticated and is a member of the specified classroom.
+    user is authenticated and is a member of the specified classroom. The pages
+    are cached until a post of the classroom changes, see `ClassroomResponseCacheMixin`,
+    and answered with a 304 while the posts are unchanged, see `ConditionalListMixin`.
 
     Attributes:
         serializer_class (Serializer): The serializer class to use for
@@ -86,17 +95,13 @@ class CoursePostListAPIView(ListAPIView):
     serializer_class = CoursePostSerializer
     permission_classes = [IsAuthenticated, IsClassroomMember]
 
-    def get_queryset(self):
+    def get_classroom(self):
         """
-        Retrieve the queryset of CoursePost objects for the specified classroom.
-
-        This method retrieves the classroom_id from the URL keyword arguments,
-        checks if the classroom exists, and then filters the CoursePost objects
-        by the classroom. It also ensures that the user has permission to access
-        the classroom.
+        Retrieve the classroom from the URL keyword arguments and check that the
+        user has permission to access it.
 
         Returns:
-            QuerySet: A queryset of CoursePost objects filtered by the classroom.
+            Classroom: The classroom whose posts are listed.
 
         Raises:
             ValidationError: If the specified classroom does not exist.
@@ -108,7 +113,19 @@ class CoursePostListAPIView(ListAPIView):
             raise ValidationError(_("Classroom does not exist."))
 
         self.check_object_permissions(self.request, classroom)
-        return CoursePost.objects.filter(classroom=classroom)
+        return classroom
+
+    def get_queryset(self):
+        """
+        Retrieve the queryset of CoursePost objects for the specified classroom.
+
+        Returns:
+            QuerySet: A queryset of CoursePost objects filtered by the classroom.
+
+        Raises:
+            ValidationError: If the specified classroom does not exist.
+        """
+        return CoursePost.objects.filter(classroom=self.classroom)
 
 
 class CoursePostRetrieveUpdateDestroyAPIView(APIView):
@@ -140,12 +157,13 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
             self.permission_classes = [IsAuthenticated, IsClassroomOwner]
         return super().get_permissions()
 
-    def get_object(self, post_id):
+    def get_object(self, post_id, for_update=False):
         """
         Retrieves the CoursePost object by its ID and checks permissions.
 
         Args:
             post_id (uuid): The ID of the CoursePost object to retrieve.
+            for_update (bool): Whether to lock the row until the end of the transaction.
 
         Returns:
             CoursePost: The retrieved CoursePost object.
@@ -154,7 +172,8 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
             Http404: If the CoursePost object does not exist.
         """
         try:
-            post = CoursePost.objects.get(id=post_id)
+            queryset = CoursePost.objects.select_for_update() if for_update else CoursePost.objects
+            post = queryset.get(id=post_id)
             classroom = post.classroom
             self.check_object_permissions(self.request, classroom)
             return post
@@ -164,6 +183,7 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
     @extend_schema(
         responses={
             200: CoursePostSerializer,
+            304: None,
             404: ErrorResponseSerializer,
         },
     )
@@ -171,6 +191,9 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
         """
         Handles GET requests to retrieve the CoursePost object.
 
+        The response carries a strong ETag and a Last-Modified date derived from `last_updated`; a
+        request whose `If-None-Match` or `If-Modified-Since` matches gets a 304 without a body.
+
         Args:
             request (Request): The HTTP request object.
             classroom_id (uuid): The ID of the classroom.
@@ -179,12 +202,16 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            Response: The serialized CoursePost object and a 200 OK status.
+            Response: The serialized CoursePost object and a 200 OK status, or a 304 Not Modified.
         """
         self.check_permissions(request)
         post = self.get_object(post_id)
-        serializer = CoursePostSerializer(post)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        etag, last_modified = get_object_validators(post, "last_updated")
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            serializer = CoursePostSerializer(post)
+            response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
 
     @extend_schema(
         request=CoursePostSerializer,
@@ -192,12 +219,15 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
             200: CoursePostSerializer,
             400: ErrorResponseSerializer,
             404: ErrorResponseSerializer,
+            412: ErrorResponseSerializer,
         },
     )
     def put(self, request, classroom_id, post_id, *args, **kwargs):
         """
         Handles PUT requests to update the CoursePost object.
 
+        With an `If-Match` header, the post is only updated if it is unchanged since the client read it.
+
         Args:
             request (Request): The HTTP request object.
             classroom_id (uuid): The ID of the classroom.
@@ -206,14 +236,21 @@ class CoursePostRetrieveUpdateDestroyAPIView(APIView):
             **kwargs: Additional keyword arguments.
 
         Returns:
-            Response: The serialized updated CoursePost object and a 200 OK status.
+            Response: The serialized updated CoursePost object and a 200 OK status, or a 412
+            Precondition Failed if the post was modified in the meantime.
         """
         self.check_permissions(request)
-        post = self.get_object(post_id)
-        serializer = CoursePostSerializer(post, data=request.data, context={"classroom_id": classroom_id})
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The post stays locked from the precondition check to the save, so no concurrent update is lost.
+        with transaction.atomic():
+            post = self.get_object(post_id, for_update=True)
+            precondition_failed = evaluate_preconditions(request, *get_object_validators(post, "last_updated"))
+            if precondition_failed:
+                return precondition_failed
+            serializer = CoursePostSerializer(post, data=request.data, context={"classroom_id": classroom_id})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, *get_object_validators(post, "last_updated"))
 
     @extend_schema(
         responses={
@@ -291,12 +328,13 @@ class CommentCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class CommentListAPIView(ListAPIView):
+class CommentListAPIView(ConditionalListMixin, ListAPIView):
     """
     API view to retrieve a list of Comment objects for a specific post.
 
     This view handles GET requests to list all comments associated with a specific post,
     ensuring that the user is authenticated and a member of the classroom associated with the post.
+    Unchanged pages are answered with a 304, see `ConditionalListMixin`.
 
     Attributes:
         serializer_class (Serializer): The serializer class for Comment objects.
@@ -308,6 +346,7 @@ class CommentListAPIView(ListAPIView):
     """
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsClassroomMember]
+    last_modified_field = "updated_at"
 
     def get_queryset(self):
         """
@@ -367,12 +406,13 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
             self.permission_classes = [IsAuthenticated]
         return super().get_permissions()
 
-    def get_object(self, comment_id):
+    def get_object(self, comment_id, for_update=False):
         """
         Retrieves the comment object and checks permissions for both the classroom and the comment.
 
         Args:
             comment_id (uuid): The ID of the comment.
+            for_update (bool): Whether to lock the row until the end of the transaction.
 
         Returns:
             Comment: The retrieved comment object.
@@ -381,7 +421,8 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
             Http404: If the comment does not exist.
         """
         try:
-            comment = Comment.objects.get(id=comment_id)
+            queryset = Comment.objects.select_for_update() if for_update else Comment.objects
+            comment = queryset.get(id=comment_id)
             classroom = comment.post.classroom
             self.check_permissions_for_classroom_and_comment(classroom, comment)
             return comment
@@ -412,6 +453,7 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
     @extend_schema(
         responses={
             200: CommentSerializer,
+            304: None,
             404: ErrorResponseSerializer,
         },
     )
@@ -419,6 +461,9 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
         """
         Handles GET requests to retrieve the comment.
 
+        The response carries a strong ETag and a Last-Modified date derived from `updated_at`; a
+        request whose `If-None-Match` or `If-Modified-Since` matches gets a 304 without a body.
+
         Args:
             request (Request): The HTTP request object.
             classroom_id (uuid): The ID of the classroom.
@@ -430,8 +475,12 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
         """
         self.check_permissions(request)
         comment = self.get_object(comment_id)
-        serializer = CommentSerializer(comment)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        etag, last_modified = get_object_validators(comment, "updated_at")
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            serializer = CommentSerializer(comment)
+            response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
 
     @extend_schema(
         request=CommentSerializer,
@@ -439,12 +488,16 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
             200: CommentSerializer,
             400: ErrorResponseSerializer,
             404: ErrorResponseSerializer,
+            412: ErrorResponseSerializer,
         },
     )
     def put(self, request, classroom_id, post_id, comment_id, *args, **kwargs):
         """
         Handles PUT requests to update the comment.
 
+        With an `If-Match` header, the comment is only updated if it is unchanged since the client read it,
+        otherwise a 412 Precondition Failed is returned.
+
         Args:
             request (Request): The HTTP request object.
             classroom_id (uuid): The ID of the classroom.
@@ -455,11 +508,18 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
             Response: The response containing the serialized updated comment data and HTTP status 200 OK.
         """
         self.check_permissions(request)
-        comment = self.get_object(comment_id)
-        serializer = CommentSerializer(comment, data=request.data, context={"post_id": post_id, "user": request.user})
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The comment stays locked from the precondition check to the save, so no concurrent update is lost.
+        with transaction.atomic():
+            comment = self.get_object(comment_id, for_update=True)
+            precondition_failed = evaluate_preconditions(request, *get_object_validators(comment, "updated_at"))
+            if precondition_failed:
+                return precondition_failed
+            serializer = CommentSerializer(comment, data=request.data,
+                                           context={"post_id": post_id, "user": request.user})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, *get_object_validators(comment, "updated_at"))
 
     @extend_schema(
         responses={
@@ -484,3 +544,122 @@ class CommentRetrieveUpdateDeleteAPIView(APIView):
         comment = self.get_object(comment_id)
         comment.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class AsyncCoursePostListAPIView(AsyncAPIView):
+    """
+    Async variant of `CoursePostListAPIView`.
+
+    Under ASGI, the request is served without being handed to a worker thread: the user, the membership, the
+    classroom and the page of posts are loaded with the async ORM. The pages, their cursors and their ETags
+    are the same as the sync endpoint's, but they are not cached.
+
+    Attributes:
+        serializer_class (Serializer): The serializer class to use for serializing output.
+        permission_classes (list): A list of permission classes that the user must pass to access this view.
+        pagination_class: The cursor pagination of the posts.
+    """
+    serializer_class = CoursePostSerializer
+    permission_classes = [AsyncIsAuthenticated, AsyncIsClassroomMember]
+    pagination_class = AsyncCreatedAtCursorPagination
+
+    async def get_classroom(self, classroom_id):
+        """
+        Retrieve the classroom whose posts are listed and check that the user has permission to access it.
+
+        Args:
+            classroom_id (uuid): The ID of the classroom.
+
+        Returns:
+            Classroom: The classroom whose posts are listed.
+
+        Raises:
+            ValidationError: If the specified classroom does not exist.
+        """
+        try:
+            classroom = await Classroom.objects.aget(id=classroom_id)
+        except Classroom.DoesNotExist:
+            raise ValidationError(_("Classroom does not exist."))
+        await self.check_object_permissions(self.request, classroom)
+        return classroom
+
+    async def get(self, request, classroom_id, *args, **kwargs):
+        """
+        Handles GET requests to list a page of the posts of the classroom.
+
+        Args:
+            request (Request): The HTTP request object.
+            classroom_id (uuid): The ID of the classroom.
+            *args: Additional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The paginated serialized posts, or a 304 Not Modified if the posts are unchanged.
+        """
+        classroom = await self.get_classroom(classroom_id)
+        queryset = CoursePost.objects.filter(classroom=classroom)
+        etag = await aget_list_validator(request, queryset, "last_updated")
+        response = evaluate_preconditions(request, etag)
+        if response is None:
+            select, _prefetch = get_related_paths(self.serializer_class)
+            paginator = self.pagination_class()
+            page = await paginator.apaginate_queryset(queryset.select_related(*select), request, view=self)
+            response = paginator.get_paginated_response(self.serializer_class(page, many=True).data)
+        return set_validators(response, etag)
+
+
+class AsyncCoursePostRetrieveAPIView(AsyncAPIView):
+    """
+    Async variant of the `GET` endpoint of `CoursePostRetrieveUpdateDestroyAPIView`.
+
+    Under ASGI, the request is served without being handed to a worker thread. The post is read with its
+    classroom, the classroom's teacher and the teacher's user in a single query, and carries the same
+    validators as on the sync endpoint.
+
+    Methods:
+        get_object: Retrieves the CoursePost object by its ID and checks permissions.
+        get: Handles GET requests to retrieve the CoursePost object.
+    """
+    permission_classes = [AsyncIsAuthenticated, AsyncIsClassroomMember]
+
+    async def get_object(self, post_id):
+        """
+        Retrieves the CoursePost object by its ID and checks permissions.
+
+        Args:
+            post_id (uuid): The ID of the CoursePost object to retrieve.
+
+        Returns:
+            CoursePost: The retrieved CoursePost object.
+
+        Raises:
+            Http404: If the CoursePost object does not exist.
+        """
+        select, _prefetch = get_related_paths(CoursePostSerializer)
+        try:
+            post = await CoursePost.objects.select_related(*select).aget(id=post_id)
+        except CoursePost.DoesNotExist:
+            raise Http404
+        await self.check_object_permissions(self.request, post.classroom)
+        return post
+
+    async def get(self, request, classroom_id, post_id, *args, **kwargs):
+        """
+        Handles GET requests to retrieve the CoursePost object.
+
+        Args:
+            request (Request): The HTTP request object.
+            classroom_id (uuid): The ID of the classroom.
+            post_id (uuid): The ID of the CoursePost object.
+            *args: Additional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The serialized CoursePost object and a 200 OK status, or a 304 Not Modified.
+        """
+        post = await self.get_object(post_id)
+        etag, last_modified = get_object_validators(post, "last_updated")
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = Response(CoursePostSerializer(post).data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
@@ -1,9 +1,10 @@
 from django.contrib import admin
 
-from .models import Quiz, Question, Answer, StudentAnswer, StudentQuiz
+from .models import Quiz, Question, Answer, StudentAnswer, StudentQuiz, LeaderboardEntry
 
 admin.site.register(Quiz)
 admin.site.register(Question)
 admin.site.register(Answer)
 admin.site.register(StudentAnswer)
 admin.site.register(StudentQuiz)
+admin.site.register(LeaderboardEntry)
@@ -0,0 +1,179 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F, IntegerField, Q, Sum, Value
+from django.db.models.functions import Cast, Floor, Least
+
+from quiz.models import Answer, Question, StudentAnswer, StudentQuiz
+
+CACHE_KEY_PREFIX = "quiz-analytics"
+DEFAULT_CACHE_TIMEOUT = 600
+
+# Marks are grouped in buckets of 10 points, the last bucket also holding the marks of 100.
+HISTOGRAM_BUCKETS = 10
+
+
+def get_cache_key(quiz_id):
+    return f"{CACHE_KEY_PREFIX}:{quiz_id}"
+
+
+def get_cache_timeout():
+    return getattr(settings, "QUIZ_ANALYTICS_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def invalidate_analytics(quiz_id):
+    """
+    Drops the cached analytics of a quiz so the next request recomputes them.
+    """
+    cache.delete(get_cache_key(quiz_id))
+
+
+def rate(part, whole):
+    if not whole:
+        return None
+    return (Decimal(part) / whole).quantize(Decimal("0.0001"))
+
+
+def get_answer_picks(quiz):
+    """
+    Returns the answer options of the quiz annotated with the number of students who picked them.
+    """
+    return (Answer.objects
+            .filter(question__quiz=quiz)
+            .annotate(picks=Count("studentanswer"))
+            .order_by()
+            .values("id", "question_id", "description", "is_valid", "picks"))
+
+
+def get_question_results(quiz):
+    """
+    Counts, for each question, the students who answered it and the students who answered it correctly.
+
+    The answers of the quiz are grouped by (question, student) with their valid and invalid picks, and the
+    groups are counted per question by an outer query over them, so the database returns one row per
+    question however many students answered. The outer query is written in SQL around the grouped
+    querysets, as the ORM cannot aggregate over a derived table.
+
+    Args:
+        quiz: The Quiz to analyse.
+
+    Returns:
+        dict: A mapping of question ids to `(answered, correct)` pairs, without the questions nobody answered.
+    """
+    picks = (StudentAnswer.objects
+             .filter(answer__question__quiz=quiz)
+             .values(question_ref=F("answer__question_id"), student_ref=F("student_id"))
+             .annotate(valid_picked=Count("id", filter=Q(answer__is_valid=True)),
+                       invalid_picked=Count("id", filter=Q(answer__is_valid=False)))
+             .order_by())
+    valid_totals = (Answer.objects
+                    .filter(question__quiz=quiz, is_valid=True)
+                    .values(question_ref=F("question_id"))
+                    .annotate(valid_total=Count("id"))
+                    .order_by())
+    picks_sql, picks_params = picks.query.sql_with_params()
+    totals_sql, totals_params = valid_totals.query.sql_with_params()
+    # Same condition as `quiz.grading.is_correct`: every valid answer picked and no invalid one. Questions
+    # without a valid answer have no total, so nobody answers them correctly.
+    sql = (
+        "SELECT picks.question_ref, COUNT(*), "
+        "SUM(CASE WHEN picks.invalid_picked = 0 AND picks.valid_picked = totals.valid_total THEN 1 ELSE 0 END) "
+        f"FROM ({picks_sql}) picks LEFT JOIN ({totals_sql}) totals ON totals.question_ref = picks.question_ref "
+        "GROUP BY picks.question_ref"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, picks_params + totals_params)
+        rows = cursor.fetchall()
+
+    to_question_id = Question._meta.pk.to_python
+    return {to_question_id(question_id): (answered, int(correct)) for question_id, answered, correct in rows}
+
+
+def get_mark_histogram(quiz):
+    """
+    Groups the submissions of the quiz by mark bucket.
+
+    Returns:
+        tuple: The list of histogram buckets, the number of submissions and their average mark.
+    """
+    width = 100 // HISTOGRAM_BUCKETS
+    bucket = Least(Cast(Floor(F("mark") / Value(Decimal(width))), IntegerField()), Value(HISTOGRAM_BUCKETS - 1))
+    rows = (StudentQuiz.objects
+            .filter(quiz=quiz)
+            .annotate(bucket=bucket)
+            .order_by()
+            .values("bucket")
+            .annotate(count=Count("id"), total=Sum("mark")))
+
+    counts = [0] * HISTOGRAM_BUCKETS
+    submissions = 0
+    total = Decimal(0)
+    for row in rows:
+        counts[int(row["bucket"])] += row["count"]
+        submissions += row["count"]
+        total += Decimal(row["total"])
+
+    histogram = [
+        {"min_mark": index * width, "max_mark": (index + 1) * width, "count": count}
+        for index, count in enumerate(counts)
+    ]
+    average_mark = (total / submissions).quantize(Decimal("0.00")) if submissions else None
+    return histogram, submissions, average_mark
+
+
+def compute_analytics(quiz):
+    """
+    Computes the analytics of a quiz with four grouped queries, whatever the number of submissions.
+
+    Returns:
+        dict: The submissions count and average mark, the mark histogram and, for each question from
+        the hardest to the easiest, its correct rate and the pick counts of its answer options.
+    """
+    questions = {
+        question["id"]: {**question, "answers": []}
+        for question in Question.objects.filter(quiz=quiz).order_by().values("id", "description")
+    }
+    for answer in get_answer_picks(quiz):
+        questions[answer.pop("question_id")]["answers"].append(answer)
+
+    results = get_question_results(quiz)
+    for question_id, question in questions.items():
+        answered, correct = results.get(question_id, (0, 0))
+        question["answered_count"] = answered
+        question["correct_count"] = correct
+        question["correct_rate"] = rate(correct, answered)
+        question["answers"].sort(key=lambda answer: answer["picks"], reverse=True)
+        distractors = [answer for answer in question["answers"] if not answer["is_valid"] and answer["picks"]]
+        question["top_distractor_id"] = distractors[0]["id"] if distractors else None
+
+    histogram, submissions, average_mark = get_mark_histogram(quiz)
+    # Hardest questions first; questions nobody answered go last.
+    ordered = sorted(questions.values(), key=lambda question: (question["correct_rate"] is None,
+                                                               question["correct_rate"] or 0))
+    return {
+        "quiz_id": quiz.id,
+        "submissions": submissions,
+        "average_mark": average_mark,
+        "histogram": histogram,
+        "questions": ordered,
+    }
+
+
+def get_analytics(quiz):
+    """
+    Returns the analytics of a quiz, from the cache when nothing changed since they were computed.
+
+    The cache entry is deleted whenever a student answers the quiz or a submission is graded, and is
+    ignored once the quiz content changed (`Quiz.last_updated`, bumped by `quiz.signals`).
+    """
+    key = get_cache_key(quiz.pk)
+    version = quiz.last_updated.timestamp()
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    analytics = compute_analytics(quiz)
+    cache.set(key, (version, analytics), get_cache_timeout())
+    return analytics
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+
+from quiz.serializers import QuizDocumentSerializer
+
+CACHE_KEY_PREFIX = "quiz-document"
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+def get_cache_key(quiz, include_validity):
+    """
+    Returns the cache key of one version of a quiz document.
+
+    The key embeds `Quiz.last_updated`, which `quiz.signals` bumps whenever a question or an answer of the
+    quiz changes, so stale documents are never served and simply expire.
+    """
+    audience = "owner" if include_validity else "member"
+    return f"{CACHE_KEY_PREFIX}:{quiz.pk}:{quiz.last_updated.timestamp()}:{audience}"
+
+
+def get_cache_timeout():
+    return getattr(settings, "QUIZ_DOCUMENT_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+
+def build_quiz_document(quiz, include_validity):
+    """
+    Serializes the quiz with all its questions and answer options.
+
+    The questions and their answers are loaded with two prefetch queries, whatever their number.
+    """
+    prefetch_related_objects([quiz], "questions__answers")
+    return QuizDocumentSerializer(quiz, context={"include_validity": include_validity}).data
+
+
+def get_quiz_document(quiz, include_validity):
+    """
+    Returns the quiz document, from the cache when this version of the quiz has already been rendered.
+
+    Args:
+        quiz: The Quiz to render.
+        include_validity: Whether answer options expose `is_valid`. Only the classroom owner may see it.
+
+    Returns:
+        dict: The serialized quiz document.
+    """
+    key = get_cache_key(quiz, include_validity)
+    document = cache.get(key)
+    if document is None:
+        document = build_quiz_document(quiz, include_validity)
+        cache.set(key, document, get_cache_timeout())
+    return document
@@ -0,0 +1,86 @@
+import csv
+import json
+
+from django.conf import settings
+from django.db.models import Q
+
+from quiz.models import Quiz, StudentQuiz
+
+DEFAULT_CHUNK_SIZE = 2000
+
+COLUMNS = ("student_id", "email", "first_name", "last_name", "quiz_id", "quiz_title", "mark", "answered_at")
+
+
+def get_chunk_size():
+    return getattr(settings, "GRADEBOOK_EXPORT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def iter_submissions(quiz_id, chunk_size):
+    """
+    Yields the submissions of a quiz as flat tuples, one bounded chunk at a time.
+
+    Each chunk is a keyset query resuming after the last `(answered_at, id)` read, served by the
+    `(quiz, -answered_at, -id)` index, so only `chunk_size` rows are held in memory whatever the
+    database driver does with its result sets.
+    """
+    submissions = (StudentQuiz.objects
+                   .filter(quiz_id=quiz_id)
+                   .order_by("answered_at", "id")
+                   .values_list("id", "answered_at", "student_id", "student__user__email",
+                                "student__user__first_name", "student__user__last_name", "mark"))
+    after = Q()
+    while True:
+        chunk = list(submissions.filter(after)[:chunk_size])
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id, last_answered_at = chunk[-1][:2]
+        after = Q(answered_at__gt=last_answered_at) | Q(answered_at=last_answered_at, id__gt=last_id)
+
+
+def iter_gradebook_rows(classroom_id, chunk_size=None):
+    """
+    Yields the gradebook of a classroom, quiz by quiz, as tuples of strings matching `COLUMNS`.
+
+    Args:
+        classroom_id (UUID): The ID of the classroom.
+        chunk_size (int, optional): The number of submissions read per query.
+
+    Yields:
+        tuple: One row per graded submission.
+    """
+    chunk_size = chunk_size or get_chunk_size()
+    quizzes = list(Quiz.objects.filter(classroom_id=classroom_id).order_by("created_at", "id")
+                   .values_list("id", "title"))
+    for quiz_id, quiz_title in quizzes:
+        for _, answered_at, student_id, email, first_name, last_name, mark in iter_submissions(quiz_id, chunk_size):
+            yield (str(student_id), email, first_name, last_name, str(quiz_id), quiz_title, str(mark),
+                   answered_at.isoformat())
+
+
+class Echo:
+    """
+    File-like object handing back what is written to it, so `csv.writer` can produce one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_ndjson(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(COLUMNS, row))) + "\n"
+
+
+# Export format -> (renderer, content type).
+EXPORT_FORMATS = {
+    "csv": (render_csv, "text/csv"),
+    "ndjson": (render_ndjson, "application/x-ndjson"),
+}
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import Count, F, Func, IntegerField, OuterRef, Q, Subquery
+
+from account.models import StudentProfile
+from quiz.analytics import invalidate_analytics
+from quiz.leaderboard import rebuild_entries
+from quiz.models import Answer, Question, StudentAnswer, StudentQuiz
+
+
+class Score(NamedTuple):
+    """
+    The result of grading one student on one quiz.
+
+    Attributes:
+        correct: Number of questions the student answered correctly.
+        total: Number of questions in the quiz.
+    """
+    correct: int
+    total: int
+
+    @property
+    def mark(self):
+        """
+        The mark out of 100, rounded to two decimal places.
+        """
+        if not self.total:
+            return Decimal("0.00")
+        return (Decimal(self.correct) * 100 / Decimal(self.total)).quantize(Decimal("0.00"))
+
+
+def count_subquery(queryset):
+    """
+    Wraps a queryset into a correlated `SELECT COUNT(*)` subquery.
+    """
+    count = Func(F("pk"), function="COUNT", output_field=IntegerField())
+    return Subquery(queryset.order_by().annotate(count=count).values("count"), output_field=IntegerField())
+
+
+def annotate_question_results(questions, student):
+    """
+    Annotates each question with the counts needed to decide whether `student` answered it correctly.
+
+    Args:
+        questions: A queryset of Question objects.
+        student: A StudentProfile, or an expression resolving to a student id (e.g. an `OuterRef`).
+
+    Returns:
+        QuerySet: The questions annotated with `valid_total`, `valid_picked` and `invalid_picked`.
+    """
+    picked = StudentAnswer.objects.filter(student=student, answer__question=OuterRef("pk"))
+    return questions.annotate(
+        valid_total=count_subquery(Answer.objects.filter(question=OuterRef("pk"), is_valid=True)),
+        valid_picked=count_subquery(picked.filter(answer__is_valid=True)),
+        invalid_picked=count_subquery(picked.filter(answer__is_valid=False)),
+    )
+
+
+def is_correct():
+    """
+    Condition on annotated questions that holds when the question was answered correctly.
+
+    A question is correct when the student picked every valid answer and no invalid one, so questions
+    with several valid answers require all of them. Questions without a valid answer can't be correct.
+    """
+    return Q(valid_picked__gt=0, valid_picked=F("valid_total"), invalid_picked=0)
+
+
+def grade(student, quiz):
+    """
+    Grades a student's answers to a quiz with a single aggregate query.
+
+    Args:
+        student: The StudentProfile to grade.
+        quiz: The Quiz being graded.
+
+    Returns:
+        Score: The number of correctly answered questions and the number of questions in the quiz.
+    """
+    questions = annotate_question_results(quiz.questions.all(), student)
+    result = questions.aggregate(total=Count("pk"), correct=Count("pk", filter=is_correct()))
+    return Score(correct=result["correct"], total=result["total"])
+
+
+def grade_quiz(quiz, batch_size=1000):
+    """
+    Grades every student enrolled in the quiz's classroom who has not been graded on it yet.
+
+    The number of correctly answered questions is computed for all students by one query, nesting the
+    per-question counts of `annotate_question_results` under the student rows, and the resulting
+    `StudentQuiz` rows are written with `bulk_create`. Students without answers get a mark of 0. As
+    `bulk_create` sends no signals, the classroom leaderboard is rebuilt in the same transaction.
+
+    Args:
+        quiz: The Quiz to grade.
+        batch_size: Number of rows per INSERT statement.
+
+    Returns:
+        list: The StudentQuiz objects built for the graded students. A row inserted concurrently by a
+        student's own submission is kept and its duplicate is skipped.
+    """
+    total = quiz.questions.count()
+    if total == 0:
+        return []
+
+    questions = annotate_question_results(Question.objects.filter(quiz=quiz), OuterRef(OuterRef("pk")))
+    students = (StudentProfile.objects
+                .filter(studentclassroom__classroom_id=quiz.classroom_id)
+                .exclude(submitted_quizzes__quiz=quiz)
+                .annotate(correct=count_subquery(questions.filter(is_correct())))
+                .order_by()
+                .values_list("id", "correct"))
+
+    student_quizzes = [
+        StudentQuiz(student_id=student_id, quiz=quiz, mark=Score(correct=correct, total=total).mark)
+        for student_id, correct in students.iterator(chunk_size=batch_size)
+    ]
+    with transaction.atomic():
+        StudentQuiz.objects.bulk_create(student_quizzes, batch_size=batch_size, ignore_conflicts=True)
+        rebuild_entries(quiz.classroom_id)
+    invalidate_analytics(quiz.pk)
+    return student_quizzes
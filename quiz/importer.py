@@ -0,0 +1,155 @@
+import csv
+
+from django.db import transaction
+
+from classroom.response_cache import bump_generation
+from events.activity import publish_classroom_event
+from quiz.models import Answer, Question, Quiz
+
+CSV_COLUMNS = ("question", "answer", "is_valid")
+
+CSV_TRUE_VALUES = {"true", "1", "yes"}
+CSV_FALSE_VALUES = {"false", "0", "no"}
+
+
+def parse_csv(lines):
+    """
+    Parses the questions of a quiz from CSV lines.
+
+    The CSV has a `question,answer,is_valid` header and one row per answer option; consecutive rows with
+    the same question text are the options of one question.
+
+    Args:
+        lines: An iterable of CSV lines.
+
+    Returns:
+        list: The questions, as dicts with a `description` and a list of `answers`.
+
+    Raises:
+        ValueError: If the header is missing a column or a row is malformed.
+    """
+    reader = csv.DictReader(lines)
+    missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}.")
+
+    questions = []
+    for row in reader:
+        description = (row["question"] or "").strip()
+        answer = (row["answer"] or "").strip()
+        is_valid = (row["is_valid"] or "").strip().lower()
+        if not description or not answer:
+            raise ValueError(f"Line {reader.line_num}: question and answer are required.")
+        if is_valid not in CSV_TRUE_VALUES | CSV_FALSE_VALUES:
+            raise ValueError(f"Line {reader.line_num}: is_valid must be true or false.")
+
+        if not questions or questions[-1]["description"] != description:
+            questions.append({"description": description, "answers": []})
+        questions[-1]["answers"].append({"description": answer, "is_valid": is_valid in CSV_TRUE_VALUES})
+    return questions
+
+
+def build_quiz(classroom, title, questions, content=None):
+    """
+    Builds, without saving them, a quiz and the rows of its questions and answer options.
+
+    The primary keys are generated client side, so every row already has its foreign keys set.
+
+    Returns:
+        tuple: The unsaved quiz, its questions and their answers.
+    """
+    quiz = Quiz(title=title, content=content, classroom=classroom)
+    question_rows = []
+    answer_rows = []
+    for question_data in questions:
+        question = Question(description=question_data["description"], quiz=quiz)
+        question_rows.append(question)
+        answer_rows.extend(
+            Answer(description=answer["description"], is_valid=answer["is_valid"], question=question)
+            for answer in question_data["answers"]
+        )
+    return quiz, question_rows, answer_rows
+
+
+def save_quizzes(built_quizzes, batch_size=None):
+    """
+    Inserts quizzes built by `build_quiz` with one `bulk_create` per table inside a single transaction.
+
+    No `save()` is called and no signal is sent, whatever the number of quizzes, so the generations of
+    the classrooms are bumped and the `quiz.created` events published here.
+    """
+    quizzes, question_rows, answer_rows = [], [], []
+    for quiz, questions, answers in built_quizzes:
+        quizzes.append(quiz)
+        question_rows.extend(questions)
+        answer_rows.extend(answers)
+
+    with transaction.atomic():
+        Quiz.objects.bulk_create(quizzes, batch_size=batch_size)
+        Question.objects.bulk_create(question_rows, batch_size=batch_size)
+        Answer.objects.bulk_create(answer_rows, batch_size=batch_size)
+        for quiz in quizzes:
+            publish_classroom_event(quiz.classroom_id, "quiz.created", id=quiz.pk, title=quiz.title)
+    bump_generation(*{quiz.classroom_id for quiz in quizzes})
+    return quizzes
+
+
+def import_quiz(classroom, title, questions, content=None, batch_size=None):
+    """
+    Creates a quiz with all its questions and answer options.
+
+    The rows are built in memory by `build_quiz` and written with one `bulk_create` per table inside a
+    single transaction. The document is expected to be validated already, see `QuizImportSerializer`.
+
+    Args:
+        classroom (Classroom): The classroom the quiz belongs to.
+        title (str): The title of the quiz.
+        questions (list): The questions, as dicts with a `description` and a list of `answers`, each
+            with a `description` and `is_valid`.
+        content (str, optional): The content of the quiz.
+        batch_size (int, optional): The number of rows per INSERT statement.
+
+    Returns:
+        Quiz: The created quiz.
+    """
+    quiz, = save_quizzes([build_quiz(classroom, title, questions, content=content)], batch_size=batch_size)
+    return quiz
+
+
+def get_quiz_questions(quiz):
+    """
+    Reads the questions of a quiz and their answer options as plain dicts, with two queries.
+
+    Returns:
+        list: The questions in the format accepted by `import_quiz`.
+    """
+    questions = {
+        question["id"]: {"description": question["description"], "answers": []}
+        for question in Question.objects.filter(quiz=quiz).values("id", "description")
+    }
+    answers = Answer.objects.filter(question__quiz=quiz).values("question_id", "description", "is_valid")
+    for answer in answers:
+        questions[answer.pop("question_id")]["answers"].append(answer)
+    return list(questions.values())
+
+
+def clone_quiz(quiz, classrooms, title=None, batch_size=None):
+    """
+    Copies a quiz with its questions and answer options into each of the given classrooms.
+
+    The source quiz is read once and every copy is written by the same three bulk inserts, so cloning
+    into many classrooms costs no more statements than cloning into one, beyond batching.
+
+    Args:
+        quiz (Quiz): The quiz to copy.
+        classrooms (iterable): The classrooms to copy the quiz into.
+        title (str, optional): The title of the copies; defaults to the title of the quiz.
+        batch_size (int, optional): The number of rows per INSERT statement.
+
+    Returns:
+        list: The created quizzes, in the order of the classrooms.
+    """
+    questions = get_quiz_questions(quiz)
+    built_quizzes = [build_quiz(classroom, title or quiz.title, questions, content=quiz.content)
+                     for classroom in classrooms]
+    return save_quizzes(built_quizzes, batch_size=batch_size)
@@ -0,0 +1,88 @@
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+
+from quiz.models import LeaderboardEntry, Quiz, StudentQuiz
+
+UPDATE_FIELDS = ("quizzes_taken", "total_mark", "average_mark", "last_activity")
+
+
+def average(total_mark, quizzes_taken):
+    if not quizzes_taken:
+        return Decimal("0.00")
+    return (Decimal(total_mark) / quizzes_taken).quantize(Decimal("0.00"))
+
+
+def get_classroom_id(quiz_id):
+    return Quiz.objects.filter(pk=quiz_id).values_list("classroom_id", flat=True).first()
+
+
+def record_submission(student_quiz):
+    """
+    Adds a new StudentQuiz to the leaderboard entry of its student, creating the entry on the first one.
+
+    The entry row is locked while it is updated, so concurrent submissions of the same student are
+    applied one after the other.
+    """
+    classroom_id = get_classroom_id(student_quiz.quiz_id)
+    if classroom_id is None:
+        return
+
+    with transaction.atomic():
+        entry, _ = (LeaderboardEntry.objects
+                    .select_for_update()
+                    .get_or_create(classroom_id=classroom_id, student_id=student_quiz.student_id))
+        entry.quizzes_taken += 1
+        # The mark is only rounded to the field's precision by the database; do the same here.
+        mark = Decimal(str(student_quiz.mark)).quantize(Decimal("0.00"))
+        entry.total_mark = Decimal(entry.total_mark) + mark
+        entry.average_mark = average(entry.total_mark, entry.quizzes_taken)
+        if entry.last_activity is None or student_quiz.answered_at > entry.last_activity:
+            entry.last_activity = student_quiz.answered_at
+        entry.save(update_fields=UPDATE_FIELDS)
+
+
+def rebuild_entries(classroom_id, student_ids=None):
+    """
+    Recomputes leaderboard entries of a classroom from its StudentQuiz rows.
+
+    Used where the incremental update can't be applied: after rows are bulk inserted (which sends no
+    signals), updated or deleted. The aggregates are computed by one grouped query and written with a
+    single upsert; entries of students left without any graded quiz are removed.
+
+    Args:
+        classroom_id: The id of the classroom whose leaderboard is rebuilt.
+        student_ids: Restricts the rebuild to these students. The whole classroom is rebuilt when None.
+    """
+    student_quizzes = StudentQuiz.objects.filter(quiz__classroom_id=classroom_id)
+    entries = LeaderboardEntry.objects.filter(classroom_id=classroom_id)
+    if student_ids is not None:
+        student_quizzes = student_quizzes.filter(student_id__in=student_ids)
+        entries = entries.filter(student_id__in=student_ids)
+
+    rows = (student_quizzes
+            .order_by()
+            .values("student_id")
+            .annotate(quizzes_taken=Count("id"), total_mark=Sum("mark"), last_activity=Max("answered_at")))
+    new_entries = [
+        LeaderboardEntry(
+            classroom_id=classroom_id,
+            student_id=row["student_id"],
+            quizzes_taken=row["quizzes_taken"],
+            total_mark=row["total_mark"],
+            average_mark=average(row["total_mark"], row["quizzes_taken"]),
+            last_activity=row["last_activity"],
+        )
+        for row in rows
+    ]
+
+    # MySQL upserts on any unique key and rejects an explicit conflict target.
+    unique_fields = None
+    if connection.features.supports_update_conflicts_with_target:
+        unique_fields = ["classroom", "student"]
+
+    with transaction.atomic():
+        entries.exclude(student__submitted_quizzes__quiz__classroom_id=classroom_id).delete()
+        LeaderboardEntry.objects.bulk_create(new_entries, update_conflicts=True, unique_fields=unique_fields,
+                                             update_fields=UPDATE_FIELDS)
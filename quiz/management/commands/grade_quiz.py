@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz.grading import grade_quiz
+from quiz.models import Quiz
+
+
+class Command(BaseCommand):
+    help = "Grades every student enrolled in the classroom of a quiz who has not been graded on it yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("quiz_id", help="The id of the quiz to grade.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per INSERT statement.")
+
+    def handle(self, *args, **options):
+        try:
+            quiz = Quiz.objects.get(id=options["quiz_id"])
+        except (Quiz.DoesNotExist, ValueError):
+            raise CommandError("Quiz does not exist.")
+
+        started = time.perf_counter()
+        student_quizzes = grade_quiz(quiz, batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+
+        graded = len(student_quizzes)
+        throughput = graded / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Graded {graded} students in {elapsed:.2f}s ({throughput:.0f} students/sec)."
+        ))
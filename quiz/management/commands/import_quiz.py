@@ -0,0 +1,62 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from classroom.models import Classroom
+from quiz.importer import import_quiz, parse_csv
+from quiz.serializers import QuizImportSerializer
+
+
+class Command(BaseCommand):
+    help = "Imports a quiz with its questions and answers from a JSON document or a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The JSON document or CSV file (question, answer, is_valid) to import.")
+        parser.add_argument("--format", choices=("json", "csv"),
+                            help="The file format; inferred from the file extension by default.")
+        parser.add_argument("--classroom-id", help="The id of the classroom; overrides the document's.")
+        parser.add_argument("--title", help="The title of the quiz; overrides the document's.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per INSERT statement.")
+
+    def read_document(self, path, file_format):
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                if file_format == "csv":
+                    return {"questions": parse_csv(file)}
+                return json.load(file)
+        except OSError as error:
+            raise CommandError(f"Cannot read {path}: {error.strerror}.")
+        except ValueError as error:
+            raise CommandError(f"Invalid {file_format.upper()} document: {error}")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or ("csv" if path.lower().endswith(".csv") else "json")
+        document = self.read_document(path, file_format)
+        if not isinstance(document, dict):
+            raise CommandError("The JSON document must be an object.")
+        for option in ("classroom_id", "title"):
+            if options[option] is not None:
+                document[option] = options[option]
+
+        started = time.perf_counter()
+        serializer = QuizImportSerializer(data=document)
+        if not serializer.is_valid():
+            raise CommandError(f"Invalid quiz document: {json.dumps(serializer.errors)}")
+        data = serializer.validated_data
+
+        try:
+            classroom = Classroom.objects.get(id=data["classroom_id"])
+        except Classroom.DoesNotExist:
+            raise CommandError("Classroom does not exist.")
+
+        quiz = import_quiz(classroom, data["title"], data["questions"], content=data.get("content"),
+                           batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+
+        answers = sum(len(question["answers"]) for question in data["questions"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported quiz {quiz.id} with {len(data['questions'])} questions and {answers} answers "
+            f"in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('classroom', '0002_pagination_indexes'),
+        ('quiz', '0004_alter_studentquiz_mark'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['classroom', '-created_at', '-id'], name='quiz_classroom_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquiz',
+            index=models.Index(fields=['quiz', '-answered_at', '-id'], name='studentquiz_quiz_answered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquiz',
+            index=models.Index(fields=['student', '-answered_at', '-id'], name='studentquiz_std_answered_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('quiz', '0005_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='answer',
+            index=models.Index(fields=['question', 'id'], name='answer_question_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['quiz', 'id'], name='question_quiz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentquiz',
+            index=models.Index(fields=['quiz', '-mark', '-answered_at'], name='studentquiz_quiz_mark_idx'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def build_leaderboard(apps, schema_editor):
+    """
+    Fills the leaderboard from the quizzes already graded.
+    """
+    StudentQuiz = apps.get_model("quiz", "StudentQuiz")
+    LeaderboardEntry = apps.get_model("quiz", "LeaderboardEntry")
+    rows = (StudentQuiz.objects
+            .order_by()
+            .values("quiz__classroom_id", "student_id")
+            .annotate(quizzes_taken=Count("id"), total_mark=Sum("mark"), last_activity=Max("answered_at")))
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(
+            classroom_id=row["quiz__classroom_id"],
+            student_id=row["student_id"],
+            quizzes_taken=row["quizzes_taken"],
+            total_mark=row["total_mark"],
+            average_mark=(Decimal(row["total_mark"]) / row["quizzes_taken"]).quantize(Decimal("0.00")),
+            last_activity=row["last_activity"],
+        )
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0002_initial'),
+        ('classroom', '0002_pagination_indexes'),
+        ('quiz', '0006_list_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quizzes_taken', models.PositiveIntegerField(default=0, verbose_name='Quizzes taken')),
+                ('total_mark', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Total mark')),
+                ('average_mark', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Average mark')),
+                ('last_activity', models.DateTimeField(blank=True, null=True, verbose_name='Last activity')),
+                ('classroom', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard', to='classroom.classroom', verbose_name='Classroom')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='account.studentprofile', verbose_name='Student')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard entry',
+                'verbose_name_plural': 'Leaderboard entries',
+                'ordering': ('-average_mark', '-id'),
+                'indexes': [models.Index(fields=['classroom', '-average_mark', '-id'], name='leaderboard_ranking_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('classroom', 'student'), name='classroom-student-leaderboard'),
+        ),
+        migrations.RunPython(build_leaderboard, migrations.RunPython.noop),
+    ]
@@ -20,6 +20,9 @@ class Quiz(models.Model):
         verbose_name = _("Quiz")
         verbose_name_plural = _("Quizzes")
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["classroom", "-created_at", "-id"], name="quiz_classroom_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title}-{self.classroom.name}"
@@ -33,6 +36,9 @@ class Question(models.Model):
     class Meta:
         verbose_name = _("Question")
         verbose_name_plural = _("Questions")
+        indexes = [
+            models.Index(fields=["quiz", "id"], name="question_quiz_idx"),
+        ]
 
     def __str__(self):
         return f"{self.description[:10]}..."
@@ -47,6 +53,9 @@ class Answer(models.Model):
     class Meta:
         verbose_name = _("Answer")
         verbose_name_plural = _("Answers")
+        indexes = [
+            models.Index(fields=["question", "id"], name="answer_question_idx"),
+        ]
 
     def __str__(self):
         return f"{self.description[:10]}"
@@ -88,6 +97,39 @@ class StudentQuiz(models.Model):
                 name="student-quiz",
             ),
         ]
+        indexes = [
+            models.Index(fields=["quiz", "-mark", "-answered_at"], name="studentquiz_quiz_mark_idx"),
+            models.Index(fields=["quiz", "-answered_at", "-id"], name="studentquiz_quiz_answered_idx"),
+            models.Index(fields=["student", "-answered_at", "-id"], name="studentquiz_std_answered_idx"),
+        ]
 
     def __str__(self):
         return f"{str(self.student)}-{str(self.quiz)} -> {self.mark}"
+
+
+class LeaderboardEntry(models.Model):
+    classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE, related_name="leaderboard",
+                                  verbose_name=_("Classroom"))
+    student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="leaderboard_entries",
+                                verbose_name=_("Student"))
+    quizzes_taken = models.PositiveIntegerField(_("Quizzes taken"), default=0)
+    total_mark = models.DecimalField(_("Total mark"), max_digits=12, decimal_places=2, default=0)
+    average_mark = models.DecimalField(_("Average mark"), max_digits=5, decimal_places=2, default=0)
+    last_activity = models.DateTimeField(_("Last activity"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("Leaderboard entry")
+        verbose_name_plural = _("Leaderboard entries")
+        ordering = ("-average_mark", "-id",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["classroom", "student"],
+                name="classroom-student-leaderboard",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["classroom", "-average_mark", "-id"], name="leaderboard_ranking_idx"),
+        ]
+
+    def __str__(self):
+        return f"{str(self.student)}-{self.classroom.name} -> {self.average_mark}"
@@ -1,12 +1,13 @@
-from decimal import Decimal
-
 from django.db.utils import IntegrityError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
 from classroom.models import Classroom
 from classroom.serializers import StudentProfileSerializerForClassroom
-from quiz.models import Quiz, Question, Answer, StudentAnswer, StudentQuiz
+from quiz.analytics import invalidate_analytics
+from quiz.grading import grade
+from quiz.importer import parse_csv
+from quiz.models import Quiz, Question, Answer, StudentAnswer, StudentQuiz, LeaderboardEntry
 
 
 class QuizSerializer(serializers.ModelSerializer):
@@ -117,6 +118,92 @@ class AnswerSerializer(serializers.ModelSerializer):
         return answer
 
 
+class QuizDocumentAnswerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Answer
+        fields = ("id", "description", "is_valid",)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if not self.context.get("include_validity", False):
+            data.pop("is_valid")
+        return data
+
+
+class QuizDocumentQuestionSerializer(serializers.ModelSerializer):
+    answers = QuizDocumentAnswerSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Question
+        fields = ("id", "description", "answers",)
+
+
+class QuizDocumentSerializer(serializers.ModelSerializer):
+    classroom_id = serializers.UUIDField(read_only=True)
+    questions = QuizDocumentQuestionSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = ("id", "title", "content", "created_at", "last_updated", "classroom_id", "questions",)
+
+
+class QuizImportAnswerSerializer(serializers.Serializer):
+    description = serializers.CharField()
+    is_valid = serializers.BooleanField()
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and "is_valid" in data and not isinstance(data["is_valid"], bool):
+            raise serializers.ValidationError({"is_valid": _("Not a valid boolean.")})
+        return super().to_internal_value(data)
+
+
+class QuizImportQuestionSerializer(serializers.Serializer):
+    description = serializers.CharField()
+    answers = QuizImportAnswerSerializer(many=True, allow_empty=False)
+
+    def validate_answers(self, answers):
+        if not any(answer["is_valid"] for answer in answers):
+            raise serializers.ValidationError(_("At least one answer must be valid."))
+        return answers
+
+
+class QuizImportSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=200)
+    content = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    classroom_id = serializers.UUIDField()
+    questions = QuizImportQuestionSerializer(many=True, required=False, allow_empty=False)
+    file = serializers.FileField(required=False, write_only=True,
+                                 help_text=_("CSV file with question, answer and is_valid columns."))
+
+    def validate(self, data):
+        upload = data.pop("file", None)
+        if upload is None:
+            if "questions" not in data:
+                raise serializers.ValidationError(_("questions or a CSV file is required."))
+            return data
+
+        if "questions" in data:
+            raise serializers.ValidationError(_("Provide either questions or a CSV file, not both."))
+        try:
+            questions = parse_csv(upload.read().decode("utf-8-sig").splitlines())
+        except (UnicodeDecodeError, ValueError) as error:
+            raise serializers.ValidationError({"file": str(error)})
+
+        serializer = QuizImportQuestionSerializer(data=questions, many=True, allow_empty=False)
+        if not serializer.is_valid():
+            raise serializers.ValidationError({"file": serializer.errors})
+        data["questions"] = serializer.validated_data
+        return data
+
+
+class QuizCloneSerializer(serializers.Serializer):
+    classroom_ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False)
+    title = serializers.CharField(max_length=200, required=False)
+
+    def validate_classroom_ids(self, classroom_ids):
+        return list(dict.fromkeys(classroom_ids))
+
+
 class StudentAnswerSerializer(serializers.ModelSerializer):
     question_id = serializers.UUIDField(write_only=True)
     answer_id = serializers.UUIDField(write_only=True)
@@ -171,6 +258,73 @@ class StudentAnswerSerializer(serializers.ModelSerializer):
         return student_answer
 
 
+class StudentAnswerItemSerializer(serializers.Serializer):
+    question_id = serializers.UUIDField()
+    answer_id = serializers.UUIDField()
+
+
+class StudentAnswerBulkSerializer(serializers.Serializer):
+    answers = StudentAnswerItemSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        quiz = self.context.get("quiz", None)
+        if quiz is None:
+            raise serializers.ValidationError(_("quiz_id param is required."))
+
+        student = self.context.get("student", None)
+        if student is None:
+            raise serializers.ValidationError(_("student not found."))
+
+        items = data["answers"]
+        answer_ids = {item["answer_id"] for item in items}
+        questions_by_answer = dict(
+            Answer.objects.filter(id__in=answer_ids, question__quiz=quiz).values_list("id", "question_id")
+        )
+
+        errors = []
+        for item in items:
+            if questions_by_answer.get(item["answer_id"]) != item["question_id"]:
+                errors.append({"answer_id": [_("Answer does not exist.")]})
+            else:
+                errors.append({})
+        if any(errors):
+            raise serializers.ValidationError({"answers": errors})
+
+        data["quiz"] = quiz
+        data["student"] = student
+        return data
+
+    def create(self, validated_data):
+        student = validated_data["student"]
+        items = validated_data["answers"]
+
+        answered = set(
+            StudentAnswer.objects.filter(student=student, answer_id__in={item["answer_id"] for item in items})
+            .values_list("answer_id", flat=True)
+        )
+
+        created = []
+        conflicts = []
+        student_answers = []
+        for index, item in enumerate(items):
+            if item["answer_id"] in answered:
+                conflicts.append({
+                    "index": index,
+                    "question_id": item["question_id"],
+                    "answer_id": item["answer_id"],
+                    "detail": _("Student cannot answer the same question again."),
+                })
+                continue
+            answered.add(item["answer_id"])
+            created.append({"question_id": item["question_id"], "answer_id": item["answer_id"]})
+            student_answers.append(StudentAnswer(student=student, answer_id=item["answer_id"]))
+
+        StudentAnswer.objects.bulk_create(student_answers, ignore_conflicts=True)
+        # bulk_create sends no signals.
+        invalidate_analytics(validated_data["quiz"].pk)
+        return {"created": created, "conflicts": conflicts}
+
+
 class StudentQuizSerializer(serializers.ModelSerializer):
     quiz = QuizSerializer(read_only=True, required=False)
     student = StudentProfileSerializerForClassroom(read_only=True, required=False)
@@ -194,32 +348,90 @@ class StudentQuizSerializer(serializers.ModelSerializer):
         except Quiz.DoesNotExist:
             raise serializers.ValidationError(_("Quiz does not exist."))
 
-        data["student_answers"] = student.student_answers.filter(answer__question__quiz=quiz)
         data["quiz"] = quiz
         data["student"] = student
         return data
 
     def create(self, validated_data):
-        student_answers_data = validated_data.pop("student_answers")
         student = validated_data["student"]
         quiz = validated_data["quiz"]
 
-        total_questions = quiz.questions.count()
-        correct_answers = 0
-
-        for answer_data in student_answers_data:
-            if answer_data.answer.is_valid:
-                correct_answers += 1
-
-        if total_questions == 0:
+        score = grade(student, quiz)
+        if score.total == 0:
             raise serializers.ValidationError(_("Quiz has no questions."))
 
-        mark = Decimal((correct_answers / total_questions) * 100).quantize(Decimal('0.00'))
-
         student_quiz = StudentQuiz.objects.create(
             student=student,
             quiz=quiz,
-            mark=mark,
+            mark=score.mark,
         )
 
         return student_quiz
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    student = StudentProfileSerializerForClassroom(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ("student", "quizzes_taken", "total_mark", "average_mark", "last_activity",)
+        read_only_fields = fields
+
+
+class AnswerAnalyticsSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    description = serializers.CharField()
+    is_valid = serializers.BooleanField()
+    picks = serializers.IntegerField()
+
+
+class QuestionAnalyticsSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    description = serializers.CharField()
+    answered_count = serializers.IntegerField()
+    correct_count = serializers.IntegerField()
+    correct_rate = serializers.DecimalField(max_digits=5, decimal_places=4, allow_null=True)
+    top_distractor_id = serializers.UUIDField(allow_null=True)
+    answers = AnswerAnalyticsSerializer(many=True)
+
+
+class MarkBucketSerializer(serializers.Serializer):
+    min_mark = serializers.IntegerField()
+    max_mark = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class QuizAnalyticsSerializer(serializers.Serializer):
+    quiz_id = serializers.UUIDField()
+    submissions = serializers.IntegerField()
+    average_mark = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    histogram = MarkBucketSerializer(many=True)
+    questions = QuestionAnalyticsSerializer(many=True)
+
+
+class MarkStatisticsSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    mean = serializers.FloatField()
+    median = serializers.FloatField()
+    std = serializers.FloatField()
+    p25 = serializers.FloatField()
+    p75 = serializers.FloatField()
+    p90 = serializers.FloatField()
+
+
+class QuizMarkStatisticsSerializer(MarkStatisticsSerializer):
+    quiz_id = serializers.UUIDField()
+
+
+class StudentRankSerializer(serializers.Serializer):
+    student_id = serializers.UUIDField()
+    quizzes_taken = serializers.IntegerField()
+    average_mark = serializers.FloatField()
+    percentile_rank = serializers.FloatField()
+
+
+class GradeReportSerializer(serializers.Serializer):
+    classroom_id = serializers.UUIDField()
+    summary = MarkStatisticsSerializer(allow_null=True)
+    quizzes = QuizMarkStatisticsSerializer(many=True)
+    students = StudentRankSerializer(many=True)
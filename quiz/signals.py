@@ -0,0 +1,89 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from classroom.models import StudentClassroom
+from classroom.response_cache import bump_generation
+from events.activity import publish_classroom_event
+from .analytics import invalidate_analytics
+from .leaderboard import get_classroom_id, rebuild_entries, record_submission
+from .models import Answer, LeaderboardEntry, Question, Quiz, StudentAnswer, StudentQuiz
+
+
+def touch_quiz(**filters):
+    """
+    Bumps `last_updated` of the matching quiz without loading it, so cached quiz documents are refreshed.
+    """
+    Quiz.objects.filter(**filters).update(last_updated=timezone.now())
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def touch_question_quiz(sender, instance, **kwargs):
+    touch_quiz(pk=instance.quiz_id)
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def touch_answer_quiz(sender, instance, **kwargs):
+    touch_quiz(questions=instance.question_id)
+
+
+@receiver(post_save, sender=StudentQuiz)
+def update_leaderboard(sender, instance, created, **kwargs):
+    if created:
+        record_submission(instance)
+        return
+    classroom_id = get_classroom_id(instance.quiz_id)
+    if classroom_id is not None:
+        rebuild_entries(classroom_id, student_ids=[instance.student_id])
+
+
+@receiver(post_delete, sender=StudentQuiz)
+def remove_from_leaderboard(sender, instance, **kwargs):
+    classroom_id = get_classroom_id(instance.quiz_id)
+    if classroom_id is not None:
+        rebuild_entries(classroom_id, student_ids=[instance.student_id])
+
+
+@receiver(post_delete, sender=StudentClassroom)
+def remove_unenrolled_student_from_leaderboard(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(classroom_id=instance.classroom_id, student_id=instance.student_id).delete()
+
+
+@receiver(post_save, sender=StudentAnswer)
+@receiver(post_delete, sender=StudentAnswer)
+def invalidate_answer_analytics(sender, instance, **kwargs):
+    quiz_id = Question.objects.filter(answers=instance.answer_id).values_list("quiz_id", flat=True).first()
+    if quiz_id is not None:
+        invalidate_analytics(quiz_id)
+
+
+@receiver(post_save, sender=StudentQuiz)
+@receiver(post_delete, sender=StudentQuiz)
+def invalidate_submission_analytics(sender, instance, **kwargs):
+    invalidate_analytics(instance.quiz_id)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def bump_quiz_classroom_generation(sender, instance, **kwargs):
+    bump_generation(instance.classroom_id)
+
+
+@receiver(post_save, sender=Quiz)
+def publish_quiz_created(sender, instance, created, **kwargs):
+    if created:
+        publish_classroom_event(instance.classroom_id, "quiz.created", id=instance.pk, title=instance.title)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def bump_question_classroom_generation(sender, instance, **kwargs):
+    bump_generation(*Quiz.objects.filter(pk=instance.quiz_id).values_list("classroom_id", flat=True))
+
+
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=Answer)
+def bump_answer_classroom_generation(sender, instance, **kwargs):
+    bump_generation(*Quiz.objects.filter(questions=instance.question_id).values_list("classroom_id", flat=True))
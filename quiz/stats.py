@@ -0,0 +1,185 @@
+import statistics
+import uuid
+from array import array
+from bisect import bisect_left, bisect_right
+
+from django.db.models import CharField, FloatField
+from django.db.models.functions import Cast
+
+from quiz.models import StudentQuiz
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Number of rows fetched per round trip when streaming the marks out of the database.
+CHUNK_SIZE = 2000
+
+PERCENTILES = (25, 75, 90)
+
+
+def load_marks(classroom_id):
+    """
+    Streams the marks of every graded quiz of a classroom into flat arrays.
+
+    The marks are cast to floats and the ids to text by the database and read with `values_list`, so no
+    model instance, `Decimal` nor `UUID` is built per row; only the distinct ids are converted back.
+    Students and quizzes are numbered in order of appearance.
+
+    Args:
+        classroom_id (UUID): The ID of the classroom.
+
+    Returns:
+        tuple: The student ids, the quiz ids, and three parallel arrays holding, for each submission,
+        the student index, the quiz index and the mark.
+    """
+    rows = (StudentQuiz.objects
+            .filter(quiz__classroom_id=classroom_id)
+            .annotate(student_key=Cast("student_id", CharField()), quiz_key=Cast("quiz_id", CharField()),
+                      mark_value=Cast("mark", FloatField()))
+            .order_by()
+            .values_list("student_key", "quiz_key", "mark_value")
+            .iterator(chunk_size=CHUNK_SIZE))
+
+    students = {}
+    quizzes = {}
+    student_index = array("q")
+    quiz_index = array("q")
+    marks = array("d")
+    for student_key, quiz_key, mark in rows:
+        student_index.append(students.setdefault(student_key, len(students)))
+        quiz_index.append(quizzes.setdefault(quiz_key, len(quizzes)))
+        marks.append(mark)
+    return ([uuid.UUID(key) for key in students], [uuid.UUID(key) for key in quizzes],
+            student_index, quiz_index, marks)
+
+
+def percentile(ordered, q):
+    """
+    Returns the q-th percentile of sorted values, interpolated linearly like `numpy.percentile`.
+    """
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def describe(values):
+    """
+    Returns the mean, median, population standard deviation and percentiles of a non-empty sequence.
+    """
+    ordered = sorted(values)
+    summary = {
+        "count": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "median": statistics.median(ordered),
+        "std": statistics.pstdev(ordered),
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(ordered, q)
+    return summary
+
+
+def percentile_ranks(values):
+    """
+    Returns the percentile rank of each value: the share of values below it, counting ties as half.
+    """
+    ordered = sorted(values)
+    total = len(ordered)
+    return [(bisect_left(ordered, value) + bisect_right(ordered, value)) * 50 / total for value in values]
+
+
+def compute_statistics(student_index, quiz_index, marks, student_count, quiz_count):
+    """
+    Computes the classroom, per-quiz and per-student statistics without NumPy.
+
+    Returns:
+        tuple: The classroom summary, the list of per-quiz summaries, the average mark, number of
+        quizzes taken and percentile rank of each student.
+    """
+    by_quiz = [[] for _ in range(quiz_count)]
+    by_student = [[] for _ in range(student_count)]
+    for student, quiz, mark in zip(student_index, quiz_index, marks):
+        by_quiz[quiz].append(mark)
+        by_student[student].append(mark)
+
+    averages = [statistics.fmean(values) for values in by_student]
+    taken = [len(values) for values in by_student]
+    return describe(marks), [describe(values) for values in by_quiz], averages, taken, percentile_ranks(averages)
+
+
+def compute_statistics_vectorized(student_index, quiz_index, marks, student_count, quiz_count):
+    """
+    Computes the same statistics as `compute_statistics` over a student x quiz NumPy matrix.
+
+    Missing submissions are NaN cells, so every per-quiz and per-student figure is a single
+    NaN-aware reduction along one axis of the matrix.
+    """
+    values = numpy.frombuffer(marks, dtype=numpy.float64)
+    matrix = numpy.full((student_count, quiz_count), numpy.nan)
+    rows = numpy.frombuffer(student_index, dtype=numpy.int64)
+    columns = numpy.frombuffer(quiz_index, dtype=numpy.int64)
+    matrix[rows, columns] = values
+
+    summary = {
+        "count": len(values),
+        "mean": values.mean(),
+        "median": numpy.median(values),
+        "std": values.std(),
+        **{f"p{q}": value for q, value in zip(PERCENTILES, numpy.percentile(values, PERCENTILES))},
+    }
+
+    taken = ~numpy.isnan(matrix)
+    columns = {
+        "count": taken.sum(axis=0),
+        "mean": numpy.nanmean(matrix, axis=0),
+        "median": numpy.nanmedian(matrix, axis=0),
+        "std": numpy.nanstd(matrix, axis=0),
+        **{f"p{q}": row for q, row in zip(PERCENTILES, numpy.nanpercentile(matrix, PERCENTILES, axis=0))},
+    }
+    quizzes = [{name: column[index] for name, column in columns.items()} for index in range(quiz_count)]
+
+    averages = numpy.nanmean(matrix, axis=1)
+    ordered = numpy.sort(averages)
+    ranks = (numpy.searchsorted(ordered, averages, "left")
+             + numpy.searchsorted(ordered, averages, "right")) * 50 / student_count
+    return summary, quizzes, averages, taken.sum(axis=1), ranks
+
+
+def rounded(summary):
+    return {name: int(value) if name == "count" else round(float(value), 2) for name, value in summary.items()}
+
+
+def get_grade_report(classroom_id):
+    """
+    Computes the mark statistics of a classroom over every graded quiz.
+
+    The marks are streamed into arrays and reduced with NumPy when it is installed, falling back to the
+    `statistics` module otherwise; both paths return the same figures.
+
+    Args:
+        classroom_id (UUID): The ID of the classroom.
+
+    Returns:
+        dict: The classroom summary, the summary of each graded quiz and, for each student from the
+        best average mark, the number of quizzes taken, the average mark and the percentile rank.
+    """
+    student_ids, quiz_ids, student_index, quiz_index, marks = load_marks(classroom_id)
+    report = {"classroom_id": classroom_id, "summary": None, "quizzes": [], "students": []}
+    if not marks:
+        return report
+
+    compute = compute_statistics_vectorized if numpy is not None else compute_statistics
+    summary, quizzes, averages, taken, ranks = compute(student_index, quiz_index, marks,
+                                                      len(student_ids), len(quiz_ids))
+
+    report["summary"] = rounded(summary)
+    report["quizzes"] = [{"quiz_id": quiz_id, **rounded(quiz)} for quiz_id, quiz in zip(quiz_ids, quizzes)]
+    students = [
+        {"student_id": student_id, "quizzes_taken": int(count), "average_mark": round(float(average), 2),
+         "percentile_rank": round(float(rank), 2)}
+        for student_id, count, average, rank in zip(student_ids, taken, averages, ranks)
+    ]
+    report["students"] = sorted(students, key=lambda student: student["percentile_rank"], reverse=True)
+    return report
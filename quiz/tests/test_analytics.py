@@ -0,0 +1,168 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from account.tests.test_setup import MEMORY_CACHES
+from account.models import StudentProfile
+from quiz.analytics import compute_analytics, get_analytics, get_question_results
+from quiz.models import Answer, Question, StudentAnswer, StudentQuiz
+from quiz.tests.test_setup_models import TestSetup
+from quiz.tests.test_setup_views import QuizTestSetup
+
+User = get_user_model()
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class QuizAnalyticsTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.valid = Answer.objects.create(description="valid", is_valid=True, question=self.question)
+        self.invalid = Answer.objects.create(description="invalid", is_valid=False, question=self.question)
+        self.other_invalid = Answer.objects.create(description="other", is_valid=False, question=self.question)
+
+        self.multi_question = Question.objects.create(description="multi", quiz=self.quiz)
+        self.multi_valid1 = Answer.objects.create(description="valid 1", is_valid=True, question=self.multi_question)
+        self.multi_valid2 = Answer.objects.create(description="valid 2", is_valid=True, question=self.multi_question)
+
+        self.students = [self.student_profile]
+        for _ in range(3):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            self.students.append(user.student_profile)
+
+    def answer(self, student, *answers):
+        for answer in answers:
+            StudentAnswer.objects.create(student=student, answer=answer)
+
+    def get_question(self, analytics, question):
+        return next(item for item in analytics["questions"] if item["id"] == question.id)
+
+    def test_question_results(self):
+        self.answer(self.students[0], self.valid, self.multi_valid1, self.multi_valid2)
+        self.answer(self.students[1], self.valid, self.invalid, self.multi_valid1)
+        self.answer(self.students[2], self.invalid)
+        analytics = compute_analytics(self.quiz)
+
+        question = self.get_question(analytics, self.question)
+        self.assertEqual(question["answered_count"], 3)
+        self.assertEqual(question["correct_count"], 1)
+        self.assertEqual(question["correct_rate"], Decimal("0.3333"))
+        self.assertEqual(question["top_distractor_id"], self.invalid.id)
+        picks = {answer["id"]: answer["picks"] for answer in question["answers"]}
+        self.assertEqual(picks, {self.valid.id: 2, self.invalid.id: 2, self.other_invalid.id: 0})
+
+        multi_question = self.get_question(analytics, self.multi_question)
+        self.assertEqual(multi_question["answered_count"], 2)
+        self.assertEqual(multi_question["correct_count"], 1)
+        self.assertIsNone(multi_question["top_distractor_id"])
+
+    def test_questions_are_ordered_from_the_hardest(self):
+        self.answer(self.students[0], self.invalid, self.multi_valid1, self.multi_valid2)
+        unanswered = Question.objects.create(description="unanswered", quiz=self.quiz)
+        analytics = compute_analytics(self.quiz)
+        self.assertEqual([question["id"] for question in analytics["questions"]],
+                         [self.question.id, self.multi_question.id, unanswered.id])
+        self.assertIsNone(analytics["questions"][-1]["correct_rate"])
+
+    def test_question_results_of_ten_thousand_submissions(self):
+        users = User.objects.bulk_create(User(email=f"student{index}@example.com") for index in range(10000))
+        students = StudentProfile.objects.bulk_create(StudentProfile(user=user) for user in users)
+        # A quarter answers both questions correctly, a quarter picks an invalid answer too, the others miss one.
+        picks = ([self.valid, self.multi_valid1, self.multi_valid2], [self.valid, self.invalid, self.multi_valid1],
+                 [self.invalid], [self.valid, self.multi_valid2])
+        StudentAnswer.objects.bulk_create(
+            (StudentAnswer(student=student, answer=answer)
+             for index, student in enumerate(students) for answer in picks[index % 4]),
+            batch_size=5000,
+        )
+
+        durations = []
+        for _ in range(3):
+            start = time.perf_counter()
+            results = get_question_results(self.quiz)
+            durations.append(time.perf_counter() - start)
+        self.assertEqual(results, {self.question.id: (10000, 5000), self.multi_question.id: (7500, 2500)})
+        self.assertLess(min(durations), 0.1)
+
+    def test_mark_histogram(self):
+        for student, mark in zip(self.students, ("100.00", "95.50", "40.00", "0.00")):
+            StudentQuiz.objects.create(student=student, quiz=self.quiz, mark=Decimal(mark))
+        analytics = compute_analytics(self.quiz)
+        counts = [bucket["count"] for bucket in analytics["histogram"]]
+        self.assertEqual(counts, [1, 0, 0, 0, 1, 0, 0, 0, 0, 2])
+        self.assertEqual(analytics["submissions"], 4)
+        self.assertEqual(analytics["average_mark"], Decimal("58.88"))
+
+    def test_query_count_does_not_depend_on_submissions(self):
+        self.answer(self.students[0], self.valid)
+        with self.assertNumQueries(4):
+            compute_analytics(self.quiz)
+        for student in self.students[1:]:
+            self.answer(student, self.valid, self.multi_valid1)
+            StudentQuiz.objects.create(student=student, quiz=self.quiz, mark=Decimal("50"))
+        with self.assertNumQueries(4):
+            compute_analytics(self.quiz)
+
+    def test_analytics_are_cached_until_a_new_submission(self):
+        get_analytics(self.quiz)
+        with self.assertNumQueries(0):
+            get_analytics(self.quiz)
+
+        self.answer(self.students[0], self.valid)
+        self.assertEqual(self.get_question(get_analytics(self.quiz), self.question)["answered_count"], 1)
+
+        StudentQuiz.objects.create(student=self.students[0], quiz=self.quiz, mark=Decimal("50"))
+        self.assertEqual(get_analytics(self.quiz)["submissions"], 1)
+
+    def test_analytics_are_recomputed_when_the_quiz_changes(self):
+        get_analytics(self.quiz)
+        question = Question.objects.create(description="new", quiz=self.quiz)
+        self.quiz.refresh_from_db()
+        self.assertIn(question.id, [item["id"] for item in get_analytics(self.quiz)["questions"]])
+
+
+class QuizAnalyticsAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.quizzes_analytics_url = reverse("quiz:quiz:quizzes-analytics", kwargs={"quiz_id": str(self.quiz.id)})
+
+    def get(self, token):
+        return self.client.get(self.quizzes_analytics_url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.quizzes_analytics_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_owner_users(self):
+        self.assertEqual(self.get(self.teacher_access_token).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get(self.student2_access_token).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_existing_quiz(self):
+        url = reverse("quiz:quiz:quizzes-analytics", kwargs={"quiz_id": self.fake.uuid4()})
+        response = self.client.get(url, headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_classroom_owner(self):
+        response = self.get(self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["submissions"], 1)
+        self.assertEqual(response.data["average_mark"], "100.00")
+        question = response.data["questions"][0]
+        self.assertEqual(question["answered_count"], 1)
+        self.assertEqual(question["correct_count"], 1)
+        self.assertEqual(question["correct_rate"], "1.0000")
+
+    def test_bulk_answers_invalidate_the_cached_analytics(self):
+        self.get(self.teacher2_access_token)
+        url = reverse("quiz:student-quiz:student-answer-bulk-create", kwargs={"quiz_id": str(self.quiz.id)})
+        self.client.post(url, data={"answers": [{"question_id": str(self.question.id),
+                                                 "answer_id": str(self.answer.id)}]}, format="json",
+                         headers={"Authorization": f"Bearer {self.student2_access_token}"})
+        response = self.get(self.teacher2_access_token)
+        self.assertEqual(response.data["questions"][0]["correct_count"], 0)
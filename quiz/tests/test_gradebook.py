@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from quiz.gradebook import COLUMNS, iter_gradebook_rows
+from quiz.models import Quiz, StudentQuiz
+from quiz.tests.test_setup_models import TestSetup
+from quiz.tests.test_setup_views import QuizTestSetup
+
+User = get_user_model()
+
+
+class GradebookRowsTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        self.quiz2 = Quiz.objects.create(title="quiz2", classroom=self.classroom)
+        self.students = [self.student_profile]
+        for _ in range(4):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            self.students.append(user.student_profile)
+        for index, student in enumerate(self.students):
+            StudentQuiz.objects.create(student=student, quiz=self.quiz, mark=Decimal(index * 10))
+        StudentQuiz.objects.create(student=self.students[0], quiz=self.quiz2, mark=Decimal("99.50"))
+
+    def test_rows_are_flat_strings(self):
+        rows = list(iter_gradebook_rows(self.classroom.id))
+        self.assertEqual(len(rows), 6)
+        submission = StudentQuiz.objects.select_related("student__user").get(student=self.students[0],
+                                                                              quiz=self.quiz2)
+        user = submission.student.user
+        self.assertEqual(rows[-1], (str(submission.student_id), user.email, user.first_name, user.last_name,
+                                    str(self.quiz2.id), "quiz2", "99.50", submission.answered_at.isoformat()))
+
+    def test_rows_are_read_in_bounded_chunks(self):
+        # One query for the quizzes, then three chunks of two rows for the first quiz and one for the second.
+        with self.assertNumQueries(5) as context:
+            rows = list(iter_gradebook_rows(self.classroom.id, chunk_size=2))
+        self.assertEqual(len(rows), 6)
+        self.assertTrue(all("LIMIT 2" in query["sql"] for query in context.captured_queries[1:]))
+
+    def test_chunks_resume_after_submissions_sharing_a_timestamp(self):
+        StudentQuiz.objects.update(answered_at=timezone.now())
+        rows = list(iter_gradebook_rows(self.classroom.id, chunk_size=2))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(len({(row[0], row[4]) for row in rows}), 6)
+
+
+class GradebookExportAPIViewTests(QuizTestSetup):
+    def get_url(self, export_format, classroom_id=None):
+        return reverse("quiz:classroom-quiz:gradebook-export",
+                       kwargs={"classroom_id": str(classroom_id or self.classroom2.id),
+                               "export_format": export_format})
+
+    def get(self, export_format, token):
+        return self.client.get(self.get_url(export_format), headers={"Authorization": f"Bearer {token}"})
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.get_url("csv"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_owner_users(self):
+        self.assertEqual(self.get("csv", self.teacher_access_token).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get("csv", self.student2_access_token).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_existing_classroom(self):
+        response = self.client.get(self.get_url("csv", self.fake.uuid4()),
+                                   headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_unsupported_format(self):
+        response = self.get("xlsx", self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_csv_export(self):
+        response = self.get("csv", self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(f"gradebook-{self.classroom2.id}.csv", response["Content-Disposition"])
+
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(tuple(rows[0]), COLUMNS)
+        self.assertEqual(len(rows), 1 + StudentQuiz.objects.filter(quiz__classroom=self.classroom2).count())
+        self.assertEqual(rows[1][COLUMNS.index("mark")], "100.00")
+
+    def test_ndjson_export(self):
+        response = self.get("ndjson", self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(lines), StudentQuiz.objects.filter(quiz__classroom=self.classroom2).count())
+        self.assertEqual(lines[0]["quiz_id"], str(self.quiz.id))
+        self.assertEqual(lines[0]["mark"], "100.00")
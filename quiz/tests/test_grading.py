@@ -0,0 +1,139 @@
+import uuid
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from classroom.models import StudentClassroom
+from quiz.grading import Score, grade, grade_quiz
+from quiz.models import Answer, Question, Quiz, StudentAnswer, StudentQuiz
+from quiz.tests.test_setup_models import TestSetup
+
+User = get_user_model()
+
+
+class GradingTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        # self.question: a single valid answer
+        self.valid = Answer.objects.create(description="valid", is_valid=True, question=self.question)
+        self.invalid = Answer.objects.create(description="invalid", is_valid=False, question=self.question)
+
+        # a question with two valid answers
+        self.multi_question = Question.objects.create(description="multi", quiz=self.quiz)
+        self.multi_valid1 = Answer.objects.create(description="valid 1", is_valid=True, question=self.multi_question)
+        self.multi_valid2 = Answer.objects.create(description="valid 2", is_valid=True, question=self.multi_question)
+        self.multi_invalid = Answer.objects.create(description="invalid", is_valid=False,
+                                                   question=self.multi_question)
+
+    def answer(self, *answers):
+        for answer in answers:
+            StudentAnswer.objects.create(student=self.student_profile, answer=answer)
+
+    def test_grade_without_answers(self):
+        self.assertEqual(grade(self.student_profile, self.quiz), Score(correct=0, total=2))
+
+    def test_grade_with_all_correct_answers(self):
+        self.answer(self.valid, self.multi_valid1, self.multi_valid2)
+        score = grade(self.student_profile, self.quiz)
+        self.assertEqual(score, Score(correct=2, total=2))
+        self.assertEqual(score.mark, Decimal("100.00"))
+
+    def test_multiple_correct_question_requires_every_valid_answer(self):
+        self.answer(self.valid, self.multi_valid1)
+        self.assertEqual(grade(self.student_profile, self.quiz), Score(correct=1, total=2))
+
+    def test_picking_an_invalid_answer_fails_the_question(self):
+        self.answer(self.valid, self.invalid, self.multi_valid1, self.multi_valid2)
+        self.assertEqual(grade(self.student_profile, self.quiz), Score(correct=1, total=2))
+
+    def test_answers_to_other_quizzes_are_ignored(self):
+        other_quiz = Quiz.objects.create(title="quiz2", classroom=self.classroom)
+        other_question = Question.objects.create(description="other", quiz=other_quiz)
+        self.answer(Answer.objects.create(description="valid", is_valid=True, question=other_question))
+        self.assertEqual(grade(self.student_profile, self.quiz), Score(correct=0, total=2))
+
+    def test_grade_runs_a_single_query(self):
+        for index in range(20):
+            question = Question.objects.create(description=f"question {index}", quiz=self.quiz)
+            self.answer(Answer.objects.create(description="valid", is_valid=True, question=question))
+        with self.assertNumQueries(1):
+            score = grade(self.student_profile, self.quiz)
+        self.assertEqual(score, Score(correct=20, total=22))
+
+    def test_mark_is_rounded(self):
+        self.assertEqual(Score(correct=2, total=3).mark, Decimal("66.67"))
+        self.assertEqual(Score(correct=0, total=0).mark, Decimal("0.00"))
+
+
+class GradeQuizTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        self.valid = Answer.objects.create(description="valid", is_valid=True, question=self.question)
+        self.invalid = Answer.objects.create(description="invalid", is_valid=False, question=self.question)
+        self.second_question = Question.objects.create(description="second", quiz=self.quiz)
+        self.second_valid = Answer.objects.create(description="valid", is_valid=True, question=self.second_question)
+
+        self.students = [self.student_profile]
+        for _ in range(3):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            self.students.append(user.student_profile)
+        for student in self.students:
+            StudentClassroom.objects.create(student=student, classroom=self.classroom)
+
+        StudentAnswer.objects.create(student=self.students[0], answer=self.valid)
+        StudentAnswer.objects.create(student=self.students[0], answer=self.second_valid)
+        StudentAnswer.objects.create(student=self.students[1], answer=self.invalid)
+        StudentAnswer.objects.create(student=self.students[1], answer=self.second_valid)
+
+    def get_marks(self):
+        return dict(StudentQuiz.objects.filter(quiz=self.quiz).values_list("student_id", "mark"))
+
+    def test_grade_quiz_grades_every_enrolled_student(self):
+        self.assertEqual(len(grade_quiz(self.quiz)), 4)
+        self.assertEqual(self.get_marks(), {
+            self.students[0].id: Decimal("100.00"),
+            self.students[1].id: Decimal("50.00"),
+            self.students[2].id: Decimal("0.00"),
+            self.students[3].id: Decimal("0.00"),
+        })
+
+    def test_grade_quiz_matches_single_student_grading(self):
+        grade_quiz(self.quiz)
+        for student in self.students:
+            self.assertEqual(self.get_marks()[student.id], grade(student, self.quiz).mark)
+
+    def test_grade_quiz_skips_students_already_graded(self):
+        StudentQuiz.objects.create(student=self.students[0], quiz=self.quiz, mark=Decimal("10.00"))
+        self.assertEqual(len(grade_quiz(self.quiz)), 3)
+        self.assertEqual(self.get_marks()[self.students[0].id], Decimal("10.00"))
+
+    def test_grade_quiz_skips_students_of_other_classrooms(self):
+        user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+        StudentAnswer.objects.create(student=user.student_profile, answer=self.valid)
+        grade_quiz(self.quiz)
+        self.assertNotIn(user.student_profile.id, self.get_marks())
+
+    def test_grade_quiz_query_count_does_not_depend_on_students(self):
+        # count questions + select students + insert (+ savepoint on some backends)
+        with CaptureQueriesContext(connection) as context:
+            grade_quiz(self.quiz)
+        for _ in range(5):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            StudentClassroom.objects.create(student=user.student_profile, classroom=self.classroom)
+        StudentQuiz.objects.all().delete()
+        with self.assertNumQueries(len(context.captured_queries)):
+            grade_quiz(self.quiz)
+
+    def test_grade_quiz_command_reports_throughput(self):
+        out = StringIO()
+        call_command("grade_quiz", str(self.quiz.id), stdout=out)
+        self.assertIn("Graded 4 students", out.getvalue())
+        self.assertIn("students/sec", out.getvalue())
+
+    def test_grade_quiz_command_with_unknown_quiz(self):
+        with self.assertRaises(CommandError):
+            call_command("grade_quiz", str(uuid.uuid4()))
@@ -0,0 +1,215 @@
+import json
+import os
+import tempfile
+import uuid
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from account.tests.test_setup import MEMORY_CACHES
+from classroom.models import Classroom
+from quiz.importer import clone_quiz, import_quiz, parse_csv
+from quiz.models import Answer, Question, Quiz
+from quiz.tests.test_setup_models import TestSetup
+from quiz.tests.test_setup_views import QuizTestSetup
+
+CSV_DOCUMENT = (
+    "question,answer,is_valid\n"
+    "2 + 2?,4,true\n"
+    "2 + 2?,5,false\n"
+    "Capital of France?,Paris,yes\n"
+)
+
+
+def build_questions(count, answers=4):
+    return [
+        {"description": f"Question {index}",
+         "answers": [{"description": f"Answer {option}", "is_valid": option == 0} for option in range(answers)]}
+        for index in range(count)
+    ]
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class ImporterTests(TestSetup):
+    def test_parse_csv_groups_consecutive_rows_by_question(self):
+        questions = parse_csv(CSV_DOCUMENT.splitlines())
+        self.assertEqual(questions, [
+            {"description": "2 + 2?", "answers": [{"description": "4", "is_valid": True},
+                                                  {"description": "5", "is_valid": False}]},
+            {"description": "Capital of France?", "answers": [{"description": "Paris", "is_valid": True}]},
+        ])
+
+    def test_parse_csv_rejects_malformed_documents(self):
+        with self.assertRaisesMessage(ValueError, "Missing CSV columns: is_valid."):
+            parse_csv(["question,answer", "a,b"])
+        with self.assertRaisesMessage(ValueError, "Line 2: is_valid must be true or false."):
+            parse_csv(["question,answer,is_valid", "a,b,maybe"])
+
+    def test_import_quiz_uses_one_insert_per_table(self):
+        # Savepoint, quiz, questions, answers, release.
+        with self.assertNumQueries(5):
+            quiz = import_quiz(self.classroom, "Imported", build_questions(20), content="content")
+        self.assertEqual(quiz.questions.count(), 20)
+        self.assertEqual(Answer.objects.filter(question__quiz=quiz).count(), 80)
+        self.assertEqual(Answer.objects.filter(question__quiz=quiz, is_valid=True).count(), 20)
+        self.assertIsNotNone(Quiz.objects.get(id=quiz.id).created_at)
+
+    def test_import_large_quiz_in_batches(self):
+        with CaptureQueriesContext(connection) as context:
+            quiz = import_quiz(self.classroom, "Large", build_questions(1000), batch_size=1000)
+        # SQLite caps a statement at 999 parameters, so the 5000 rows take a couple dozen inserts there.
+        self.assertLessEqual(len(context.captured_queries), 30)
+        self.assertEqual(Question.objects.filter(quiz=quiz).count(), 1000)
+        self.assertEqual(Answer.objects.filter(question__quiz=quiz).count(), 4000)
+
+    def test_import_quiz_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "quiz.json")
+            with open(json_path, "w") as file:
+                json.dump({"title": "From JSON", "classroom_id": str(self.classroom.id),
+                           "questions": build_questions(3)}, file)
+            csv_path = os.path.join(directory, "quiz.csv")
+            with open(csv_path, "w") as file:
+                file.write(CSV_DOCUMENT)
+
+            out = StringIO()
+            call_command("import_quiz", json_path, stdout=out)
+            self.assertIn("with 3 questions and 12 answers", out.getvalue())
+            call_command("import_quiz", csv_path, "--classroom-id", str(self.classroom.id), "--title", "From CSV",
+                         stdout=out)
+            self.assertIn("with 2 questions and 3 answers", out.getvalue())
+
+            self.assertEqual(Quiz.objects.get(title="From CSV").questions.count(), 2)
+            with self.assertRaisesMessage(CommandError, "Classroom does not exist."):
+                call_command("import_quiz", json_path, "--classroom-id", str(uuid.uuid4()))
+            with self.assertRaisesMessage(CommandError, "Invalid quiz document"):
+                call_command("import_quiz", csv_path)
+
+    def test_clone_quiz_into_many_classrooms(self):
+        source = import_quiz(self.classroom, "Source", build_questions(5), content="content")
+        classrooms = [Classroom.objects.create(name=f"section {index}", teacher=self.classroom.teacher)
+                      for index in range(10)]
+        # Two reads of the source, then savepoint, quizzes, questions, answers, release.
+        with self.assertNumQueries(7):
+            copies = clone_quiz(source, classrooms)
+
+        self.assertEqual([copy.classroom_id for copy in copies], [classroom.id for classroom in classrooms])
+        for copy in copies:
+            self.assertNotEqual(copy.id, source.id)
+            self.assertEqual((copy.title, copy.content), ("Source", "content"))
+            self.assertEqual(copy.questions.count(), 5)
+        self.assertEqual(Answer.objects.filter(question__quiz__in=copies, is_valid=True).count(), 50)
+        self.assertEqual(Answer.objects.filter(question__quiz__in=copies).count(), 200)
+        self.assertEqual(Question.objects.filter(quiz=source).count(), 5)
+
+
+class QuizImportAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.quizzes_import_url = reverse("quiz:quiz:quizzes-import")
+        self.import_data = {"title": "Imported", "content": "content", "classroom_id": str(self.classroom1_id),
+                            "questions": build_questions(3)}
+
+    def post(self, data, token, format="json"):
+        return self.client.post(self.quizzes_import_url, data=data, format=format,
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.post(self.quizzes_import_url, data=self.import_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_non_classroom_owner(self):
+        response = self.post(self.import_data, self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Quiz.objects.filter(title="Imported").exists())
+
+    def test_view_with_non_existing_classroom(self):
+        response = self.post({**self.import_data, "classroom_id": self.fake.uuid4()}, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_imports_json_document(self):
+        response = self.post(self.import_data, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        quiz = Quiz.objects.get(id=response.data["id"])
+        self.assertEqual(quiz.classroom_id, self.classroom1_id)
+        self.assertEqual(quiz.questions.count(), 3)
+        self.assertEqual(Answer.objects.filter(question__quiz=quiz).count(), 12)
+
+    def test_view_imports_csv_file(self):
+        upload = SimpleUploadedFile("quiz.csv", CSV_DOCUMENT.encode(), content_type="text/csv")
+        data = {"title": "Imported", "classroom_id": str(self.classroom1_id), "file": upload}
+        response = self.post(data, self.teacher_access_token, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Question.objects.filter(quiz_id=response.data["id"]).count(), 2)
+
+    def test_view_rejects_invalid_documents_without_writing(self):
+        questions = build_questions(2)
+        questions[1]["answers"] = [{"description": "wrong", "is_valid": False}]
+        invalid_documents = [
+            {**self.import_data, "questions": questions},
+            {**self.import_data, "questions": []},
+            {key: value for key, value in self.import_data.items() if key != "questions"},
+            {**self.import_data, "questions": [{"description": "q", "answers": [{"description": "a",
+                                                                                "is_valid": "yes"}]}]},
+        ]
+        for document in invalid_documents:
+            response = self.post(document, self.teacher_access_token)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Quiz.objects.filter(title="Imported").exists())
+
+    def test_view_rejects_invalid_csv_file(self):
+        upload = SimpleUploadedFile("quiz.csv", b"question,answer,is_valid\nq,a,false\n", content_type="text/csv")
+        data = {"title": "Imported", "classroom_id": str(self.classroom1_id), "file": upload}
+        response = self.post(data, self.teacher_access_token, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("file", response.data)
+
+
+class QuizCloneAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.quizzes_clone_url = reverse("quiz:quiz:quizzes-clone", kwargs={"quiz_id": str(self.quiz.id)})
+        self.sections = [Classroom.objects.create(name=f"section {index}", teacher=self.classroom2.teacher)
+                         for index in range(3)]
+        self.clone_data = {"classroom_ids": [str(section.id) for section in self.sections]}
+
+    def post(self, data, token, url=None):
+        return self.client.post(url or self.quizzes_clone_url, data=data, format="json",
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.post(self.quizzes_clone_url, data=self.clone_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_non_owner_of_the_quiz(self):
+        response = self.post({"classroom_ids": [str(self.classroom1_id)]}, self.teacher_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_owner_of_a_target_classroom(self):
+        data = {"classroom_ids": self.clone_data["classroom_ids"] + [str(self.classroom1_id)]}
+        response = self.post(data, self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Quiz.objects.count(), 1)
+
+    def test_view_with_non_existing_quiz_or_classroom(self):
+        url = reverse("quiz:quiz:quizzes-clone", kwargs={"quiz_id": self.fake.uuid4()})
+        self.assertEqual(self.post(self.clone_data, self.teacher2_access_token, url).status_code,
+                         status.HTTP_404_NOT_FOUND)
+        response = self.post({"classroom_ids": [self.fake.uuid4()]}, self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.post({"classroom_ids": []}, self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_clones_into_every_classroom(self):
+        data = {"classroom_ids": self.clone_data["classroom_ids"] * 2, "title": "Reused"}
+        response = self.post(data, self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([copy["classroom_id"] for copy in response.data], self.clone_data["classroom_ids"])
+        for copy in Quiz.objects.filter(title="Reused"):
+            self.assertEqual(copy.questions.get().answers.count(), 2)
@@ -0,0 +1,132 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from account.tests.test_setup import MEMORY_CACHES
+from classroom.models import StudentClassroom
+from quiz.grading import grade_quiz
+from quiz.leaderboard import rebuild_entries
+from quiz.models import Answer, LeaderboardEntry, Quiz, StudentQuiz
+from quiz.tests.test_query_counts import QueryCountAssertionsMixin
+from quiz.tests.test_setup_models import TestSetup
+from quiz.tests.test_setup_views import QuizTestSetup
+
+User = get_user_model()
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class LeaderboardTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        StudentClassroom.objects.create(student=self.student_profile, classroom=self.classroom)
+        self.quiz2 = Quiz.objects.create(title="quiz2", classroom=self.classroom)
+
+    def get_entry(self):
+        return LeaderboardEntry.objects.get(classroom=self.classroom, student=self.student_profile)
+
+    def test_first_submission_creates_the_entry(self):
+        student_quiz = StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("80"))
+        entry = self.get_entry()
+        self.assertEqual(entry.quizzes_taken, 1)
+        self.assertEqual(entry.total_mark, Decimal("80.00"))
+        self.assertEqual(entry.average_mark, Decimal("80.00"))
+        self.assertEqual(entry.last_activity, student_quiz.answered_at)
+
+    def test_submissions_update_the_entry_incrementally(self):
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("80"))
+        with self.assertNumQueries(6):  # insert, classroom lookup, savepoint, locked select, update, release
+            student_quiz = StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz2,
+                                                      mark=Decimal("50"))
+        entry = self.get_entry()
+        self.assertEqual(entry.quizzes_taken, 2)
+        self.assertEqual(entry.total_mark, Decimal("130.00"))
+        self.assertEqual(entry.average_mark, Decimal("65.00"))
+        self.assertEqual(entry.last_activity, student_quiz.answered_at)
+
+    def test_deleted_submission_is_removed_from_the_entry(self):
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("80"))
+        student_quiz = StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz2, mark=Decimal("50"))
+        student_quiz.delete()
+        entry = self.get_entry()
+        self.assertEqual(entry.quizzes_taken, 1)
+        self.assertEqual(entry.average_mark, Decimal("80.00"))
+
+        self.quiz.delete()
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_updated_mark_is_applied_to_the_entry(self):
+        student_quiz = StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("80"))
+        student_quiz.mark = Decimal("40")
+        student_quiz.save()
+        self.assertEqual(self.get_entry().average_mark, Decimal("40.00"))
+
+    def test_unenrollment_removes_the_entry(self):
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("80"))
+        StudentClassroom.objects.filter(student=self.student_profile, classroom=self.classroom).delete()
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_grade_quiz_updates_the_leaderboard(self):
+        Answer.objects.create(description="valid", is_valid=True, question=self.question)
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz2, mark=Decimal("50"))
+        user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+        StudentClassroom.objects.create(student=user.student_profile, classroom=self.classroom)
+
+        grade_quiz(self.quiz)
+        entries = dict(LeaderboardEntry.objects.values_list("student_id", "quizzes_taken"))
+        self.assertEqual(entries, {self.student_profile.id: 2, user.student_profile.id: 1})
+        self.assertEqual(self.get_entry().average_mark, Decimal("25.00"))
+
+    def test_rebuild_matches_incremental_updates(self):
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz, mark=Decimal("33.33"))
+        StudentQuiz.objects.create(student=self.student_profile, quiz=self.quiz2, mark=Decimal("66.67"))
+        incremental = LeaderboardEntry.objects.values("quizzes_taken", "total_mark", "average_mark").get()
+        LeaderboardEntry.objects.all().delete()
+        rebuild_entries(self.classroom.id)
+        self.assertEqual(LeaderboardEntry.objects.values("quizzes_taken", "total_mark", "average_mark").get(),
+                         incremental)
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class LeaderboardListAPIViewTests(QueryCountAssertionsMixin, QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.leaderboard_url = reverse("quiz:classroom-quiz:leaderboard",
+                                       kwargs={"classroom_id": str(self.classroom2.id)})
+        StudentQuiz.objects.create(student=self.student2_profile, quiz=self.quiz, mark=Decimal("50.00"))
+
+    def add_students(self, count=5):
+        for index in range(count):
+            user = User.objects.create_user(email=f"student-{index}@example.com", password="password",
+                                            is_teacher=False)
+            StudentClassroom.objects.create(student=user.student_profile, classroom=self.classroom2)
+            StudentQuiz.objects.create(student=user.student_profile, quiz=self.quiz, mark=Decimal(index * 10))
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.leaderboard_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_owner_users(self):
+        for token in (self.teacher_access_token, self.student2_access_token):
+            response = self.client.get(self.leaderboard_url, headers={"Authorization": f"Bearer {token}"})
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_existing_classroom(self):
+        url = reverse("quiz:classroom-quiz:leaderboard", kwargs={"classroom_id": self.fake.uuid4()})
+        response = self.client.get(url, headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_classroom_owner_ranks_students(self):
+        self.add_students()
+        response = self.client.get(f"{self.leaderboard_url}?page_size=3",
+                                   headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        marks = [entry["average_mark"] for entry in response.data["results"]]
+        self.assertEqual(marks, ["100.00", "50.00", "40.00"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_view_query_count_does_not_depend_on_leaderboard_size(self):
+        self.assertQueriesCapped(self.leaderboard_url, self.teacher2_access_token, self.add_students,
+                                 max_queries=3)
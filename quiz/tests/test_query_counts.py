@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from account.models import StudentProfile
+from account.tests.test_setup import MEMORY_CACHES
+from classroom.models import StudentClassroom
+from quiz.models import Answer, Question, Quiz, StudentQuiz
+from quiz.serializers import AnswerSerializer, QuestionSerializer, QuizSerializer, StudentQuizSerializer
+from quiz.tests.test_setup_views import QuizTestSetup
+from quiz_room_hub.prefetch import get_related_paths
+
+User = get_user_model()
+
+
+class QueryCountAssertionsMixin:
+    """
+    Assertions capping the number of queries an endpoint runs, independent of the number of rows.
+    """
+
+    def count_queries(self, url, token):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def assertQueriesCapped(self, url, token, grow, max_queries):
+        """
+        Requests `url` before and after `grow()` adds rows, and asserts the endpoint runs the same number of
+        queries both times, and no more than `max_queries`.
+        """
+        self.count_queries(url, token)  # warm up the per-user caches
+        before, response = self.count_queries(url, token)
+        size = len(response.data["results"])
+        grow()
+        after, response = self.count_queries(url, token)
+        grown_size = len(response.data["results"])
+        self.assertGreater(grown_size, size)
+        self.assertEqual(before, after, f"{url} ran {before} queries for {size} rows and "
+                                        f"{after} for {grown_size} rows")
+        self.assertLessEqual(after, max_queries)
+
+
+class RelatedPathsTests(APITestCase):
+    def test_flat_serializer_has_no_related_paths(self):
+        self.assertEqual(get_related_paths(QuizSerializer), ((), ()))
+
+    def test_nested_serializers_are_joined(self):
+        self.assertEqual(get_related_paths(QuestionSerializer), (("quiz",), ()))
+        self.assertEqual(get_related_paths(AnswerSerializer), (("question__quiz",), ()))
+
+    def test_dotted_sources_are_joined(self):
+        select, prefetch = get_related_paths(StudentQuizSerializer)
+        self.assertEqual(set(select), {"quiz", "student__user"})
+        self.assertEqual(prefetch, ())
+
+
+@override_settings(CACHES=MEMORY_CACHES)
+class ListQueryCountTests(QueryCountAssertionsMixin, QuizTestSetup):
+    def add_questions(self, count=5):
+        for index in range(count):
+            question = Question.objects.create(description=f"question {index}", quiz=self.quiz)
+            Answer.objects.create(description="answer", is_valid=True, question=question)
+
+    def test_quizzes_list(self):
+        def grow():
+            for index in range(5):
+                Quiz.objects.create(title=f"quiz {index}", classroom=self.classroom2)
+
+        self.assertQueriesCapped(self.quizzes_list_url, self.teacher2_access_token, grow, max_queries=3)
+
+    @override_settings(CLASSROOM_RESPONSE_CACHE_TIMEOUT=0)
+    def test_questions_list(self):
+        # Measures the uncached path; responses are otherwise served from the classroom response cache.
+        self.assertQueriesCapped(self.questions_list_url, self.student2_access_token, self.add_questions,
+                                 max_queries=4)
+
+    def test_answers_list(self):
+        def grow():
+            for index in range(5):
+                Answer.objects.create(description=f"answer {index}", is_valid=False, question=self.question)
+
+        self.assertQueriesCapped(self.answers_list_url, self.teacher2_access_token, grow, max_queries=5)
+
+    def test_student_quiz_list(self):
+        def grow():
+            for index in range(5):
+                user = User.objects.create_user(email=f"student-{index}@example.com", password="password",
+                                                is_teacher=False)
+                student = StudentProfile.objects.get(user=user)
+                StudentClassroom.objects.create(student=student, classroom=self.classroom2)
+                StudentQuiz.objects.create(student=student, quiz=self.quiz, mark=Decimal("50.00"))
+
+        self.assertQueriesCapped(self.student_quiz_list_url, self.teacher2_access_token, grow, max_queries=4)
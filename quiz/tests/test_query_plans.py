@@ -0,0 +1,138 @@
+import re
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from classroom.models import StudentClassroom
+from post.models import Comment, CoursePost
+from quiz.models import Quiz, StudentQuiz
+from quiz.tests.test_setup_views import QuizTestSetup
+
+User = get_user_model()
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions on the query plan the database picks for the main query of a list endpoint.
+
+    The main query is the captured query reading from the listed table with an ORDER BY clause. It is run
+    again under EXPLAIN, and the plan must neither sort the rows (SQLite's temporary B-tree, MySQL's
+    filesort) nor scan a table without an index. SQLite may still sort the rows sharing the leading
+    ordering key across a join ("RIGHT PART OF ORDER BY"), which streams and stops at the page limit.
+    """
+
+    def get_list_query(self, url, token, table):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        pattern = re.compile(rf'FROM [`"]{table}[`"].*ORDER BY', re.DOTALL)
+        queries = [query["sql"] for query in context.captured_queries if pattern.search(query["sql"])]
+        self.assertTrue(queries, f"{url} did not run an ordered query on {table}")
+        return queries[-1]
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                cursor.execute(f"EXPLAIN {sql}", params)
+                columns = [column[0] for column in cursor.description]
+                rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                return [f"{row['table']} type={row['type']} key={row['key']} {row['Extra'] or ''}" for row in rows]
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def find_plan_problems(self, plan, allow_sort=False):
+        problems = []
+        for step in plan:
+            if connection.vendor == "mysql":
+                sorts = "filesort" in step or "temporary" in step
+                if (sorts and not allow_sort) or " type=ALL " in step:
+                    problems.append(step)
+            elif step == "USE TEMP B-TREE FOR ORDER BY" and not allow_sort:
+                problems.append(step)
+            elif re.fullmatch(r"SCAN \S+", step):
+                problems.append(step)
+        return problems
+
+    def assertPlanUsesIndex(self, sql, params=(), allow_sort=False, msg=""):
+        plan = self.explain(sql, params)
+        problems = self.find_plan_problems(plan, allow_sort=allow_sort)
+        self.assertFalse(problems, f"{msg} is not served by an index: {plan}")
+
+    def assertListUsesIndex(self, url, token, table, allow_sort=False):
+        """
+        Asserts the main query of a list endpoint is served by an index.
+
+        `allow_sort` accepts a sort for lists merging the rows of several parents (e.g. the quizzes of all
+        the classrooms of a teacher), which is bounded by the rows of the request user; full scans are
+        still rejected.
+        """
+        self.assertPlanUsesIndex(self.get_list_query(url, token, table), allow_sort=allow_sort, msg=url)
+
+
+class ListQueryPlanTests(QueryPlanAssertionsMixin, QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.post = CoursePost.objects.create(title="title", content="content", classroom=self.classroom2)
+        for index in range(20):
+            Quiz.objects.create(title=f"quiz {index}", classroom=self.classroom1)
+            post = CoursePost.objects.create(title=f"post {index}", content="content", classroom=self.classroom1)
+            Comment.objects.create(content=f"comment {index}", post=post, user=self.teacher)
+            Comment.objects.create(content=f"comment {index}", post=self.post, user=self.student2)
+
+        for index in range(20):
+            user = User.objects.create_user(email=f"student-{index}@example.com", password="password",
+                                            is_teacher=False)
+            StudentClassroom.objects.create(student=user.student_profile, classroom=self.classroom2)
+            StudentQuiz.objects.create(student=user.student_profile, quiz=self.quiz, mark=Decimal(index))
+
+    def test_classrooms_list(self):
+        self.assertListUsesIndex(reverse("classroom:classrooms-list"), self.teacher_access_token,
+                                 "classroom_classroom")
+
+    def test_students_classrooms_list(self):
+        url = reverse("classroom:students-classrooms-list")
+        self.assertListUsesIndex(url, self.teacher2_access_token, "classroom_studentclassroom", allow_sort=True)
+        self.assertListUsesIndex(url, self.student2_access_token, "classroom_studentclassroom")
+
+    def test_posts_list(self):
+        url = reverse("post:posts-list", kwargs={"classroom_id": str(self.classroom2.id)})
+        self.assertListUsesIndex(url, self.teacher2_access_token, "post_coursepost")
+
+    def test_comments_list(self):
+        url = reverse("post:comments-list", kwargs={"classroom_id": str(self.classroom2.id),
+                                                    "post_id": str(self.post.id)})
+        self.assertListUsesIndex(url, self.teacher2_access_token, "post_comment")
+
+    def test_quizzes_list(self):
+        self.assertListUsesIndex(self.quizzes_list_url, self.teacher_access_token, "quiz_quiz", allow_sort=True)
+
+    def test_questions_list(self):
+        self.assertListUsesIndex(self.questions_list_url, self.teacher2_access_token, "quiz_question")
+
+    def test_answers_list(self):
+        self.assertListUsesIndex(self.answers_list_url, self.teacher2_access_token, "quiz_answer")
+
+    def test_student_quiz_list(self):
+        # Teachers list the student quizzes of every quiz of the classroom.
+        self.assertListUsesIndex(self.student_quiz_list_url, self.teacher2_access_token, "quiz_studentquiz",
+                                 allow_sort=True)
+        self.assertListUsesIndex(self.student_quiz_list_url, self.student2_access_token, "quiz_studentquiz")
+
+    def test_profiles_lists(self):
+        self.assertListUsesIndex(reverse("account:teachers-list"), self.admin_access_token,
+                                 "account_teacherprofile")
+        self.assertListUsesIndex(reverse("account:students-list"), self.admin_access_token,
+                                 "account_studentprofile")
+
+    def test_student_quiz_ranking(self):
+        queryset = StudentQuiz.objects.filter(quiz=self.quiz)[:50]
+        sql, params = queryset.query.sql_with_params()
+        self.assertPlanUsesIndex(sql, params, msg="StudentQuiz ranking")
+
+    def test_leaderboard_list(self):
+        url = reverse("quiz:classroom-quiz:leaderboard", kwargs={"classroom_id": str(self.classroom2.id)})
+        self.assertListUsesIndex(url, self.teacher2_access_token, "quiz_leaderboardentry")
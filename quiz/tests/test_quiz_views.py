@@ -1,5 +1,15 @@
+import uuid
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from rest_framework import status
 
+from quiz.models import Answer, Question, Quiz
 from quiz.tests.test_setup_views import QuizTestSetup
 
 
@@ -125,6 +135,91 @@ class QuizUpdateAPIViewTests(QuizTestSetup):
         self.assertEqual(classroom_owner_response.status_code, status.HTTP_200_OK)
         self.assertEqual(classroom_owner_response.data["content"], data["content"])
 
+    def test_view_with_stale_if_match(self):
+        etag = self.client.get(self.quizzes_detail_url,
+                               headers={"Authorization": f"Bearer {self.student2_access_token}"})["ETag"]
+        headers = {"Authorization": f"Bearer {self.teacher2_access_token}", "If-Match": etag}
+        data = {**self.quiz_data, "classroom_id": str(self.classroom2.id)}
+        response = self.client.put(self.quizzes_detail_url, data={**data, "content": "first"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.put(self.quizzes_detail_url, data={**data, "content": "second"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.content, "first")
+
+    def test_view_locks_the_quiz_it_checks(self):
+        etag = self.client.get(self.quizzes_detail_url,
+                               headers={"Authorization": f"Bearer {self.student2_access_token}"})["ETag"]
+        headers = {"Authorization": f"Bearer {self.teacher2_access_token}", "If-Match": etag}
+        data = {**self.quiz_data, "classroom_id": str(self.classroom2.id)}
+        with mock.patch.object(QuerySet, "select_for_update", autospec=True,
+                               side_effect=QuerySet.select_for_update) as select_for_update:
+            response = self.client.put(self.quizzes_detail_url, data=data, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([call.args[0].model for call in select_for_update.call_args_list], [Quiz])
+        self.assertEqual(select_for_update.call_args.kwargs, {"of": ("self",)})
+
+
+class QuizConditionalGetTests(QuizTestSetup):
+    def get(self, url, token, **headers):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token}", **headers})
+
+    def test_unchanged_quiz_is_not_modified(self):
+        cache.clear()
+        etag = self.get(self.quizzes_detail_url, self.student2_access_token)["ETag"]
+        response = self.get(self.quizzes_detail_url, self.student2_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn("X-Cache", response)
+
+        self.quiz.save()
+        response = self.get(self.quizzes_detail_url, self.student2_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unchanged_quiz_list_is_not_modified(self):
+        etag = self.get(self.quizzes_list_url, self.teacher2_access_token)["ETag"]
+        response = self.get(self.quizzes_list_url, self.teacher2_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.get(self.quizzes_list_url, self.teacher_access_token)["ETag"], etag)
+
+        self.quiz.delete()
+        response = self.get(self.quizzes_list_url, self.teacher2_access_token, If_None_Match=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AsyncQuizRetrieveAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.async_detail_url = reverse("quiz:quiz:quizzes-detail-async", kwargs={"quiz_id": self.quiz.id})
+
+    async def get(self, url, token=None, **headers):
+        headers = {"Authorization": f"Bearer {token}", **headers} if token else headers
+        return await self.async_client.get(url, headers=headers)
+
+    async def test_view_matches_the_sync_endpoint(self):
+        response = await self.get(self.async_detail_url, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sync_response = await sync_to_async(self.client.get)(
+            self.quizzes_detail_url, headers={"Authorization": f"Bearer {self.student2_access_token}"})
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response["ETag"], sync_response["ETag"])
+
+        response = await self.get(self.async_detail_url, self.teacher2_access_token, If_None_Match=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_view_rejects_non_members(self):
+        cases = [
+            (self.async_detail_url, None, status.HTTP_401_UNAUTHORIZED),
+            (self.async_detail_url, self.student_access_token, status.HTTP_403_FORBIDDEN),
+            (self.async_detail_url, self.teacher_access_token, status.HTTP_403_FORBIDDEN),
+            (reverse("quiz:quiz:quizzes-detail-async", kwargs={"quiz_id": uuid.uuid4()}), self.student2_access_token,
+             status.HTTP_404_NOT_FOUND),
+        ]
+        for url, token, code in cases:
+            with self.subTest(code=code):
+                self.assertEqual((await self.get(url, token)).status_code, code)
+
 
 class QuizDestroyAPIViewTests(QuizTestSetup):
     def test_view_with_unauthenticated_user(self):
@@ -147,3 +242,70 @@ class QuizDestroyAPIViewTests(QuizTestSetup):
                                                       headers={
                                                           "Authorization": f"Bearer {self.teacher2_access_token}"}, )
         self.assertEqual(classroom_owner_response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class QuizDocumentAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.quizzes_document_url = reverse("quiz:quiz:quizzes-document", kwargs={"quiz_id": str(self.quiz.id)})
+
+    def get(self, token):
+        return self.client.get(self.quizzes_document_url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.quizzes_document_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_member_users(self):
+        self.assertEqual(self.get(self.teacher_access_token).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get(self.student_access_token).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_existing_quiz(self):
+        url = reverse("quiz:quiz:quizzes-document", kwargs={"quiz_id": self.fake.uuid4()})
+        response = self.client.get(url, headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_classroom_owner_includes_answer_validity(self):
+        response = self.get(self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], str(self.quiz.id))
+        self.assertEqual(len(response.data["questions"]), 1)
+        answers = {answer["id"]: answer for answer in response.data["questions"][0]["answers"]}
+        self.assertEqual(set(answers), {str(self.answer.id), str(self.answer2.id)})
+        self.assertFalse(answers[str(self.answer.id)]["is_valid"])
+        self.assertTrue(answers[str(self.answer2.id)]["is_valid"])
+
+    def test_view_with_classroom_student_strips_answer_validity(self):
+        response = self.get(self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for answer in response.data["questions"][0]["answers"]:
+            self.assertNotIn("is_valid", answer)
+
+    def test_view_query_count_does_not_depend_on_quiz_size(self):
+        self.get(self.teacher2_access_token)  # warm up the membership cache
+        Question.objects.create(description="question", quiz=self.quiz)
+        with CaptureQueriesContext(connection) as context:
+            self.get(self.teacher2_access_token)
+        for index in range(5):
+            question = Question.objects.create(description=f"question {index}", quiz=self.quiz)
+            Answer.objects.create(description="answer", is_valid=True, question=question)
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.get(self.teacher2_access_token)
+        self.assertEqual(len(response.data["questions"]), 7)
+
+    def test_view_serves_cached_document(self):
+        self.get(self.student2_access_token)
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any("quiz_question" in query["sql"] for query in context.captured_queries))
+
+    def test_view_refreshes_document_when_answers_change(self):
+        self.get(self.student2_access_token)
+        Answer.objects.create(description="new answer", is_valid=False, question=self.question)
+        response = self.get(self.student2_access_token)
+        self.assertEqual(len(response.data["questions"][0]["answers"]), 3)
+        self.answer.delete()
+        response = self.get(self.student2_access_token)
+        self.assertEqual(len(response.data["questions"][0]["answers"]), 2)
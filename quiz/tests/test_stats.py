@@ -0,0 +1,99 @@
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+
+from quiz import stats
+from quiz.models import Quiz, StudentQuiz
+from quiz.tests.test_setup_models import TestSetup
+from quiz.tests.test_setup_views import QuizTestSetup
+
+User = get_user_model()
+
+
+class GradeReportTests(TestSetup):
+    def setUp(self):
+        super().setUp()
+        self.quiz2 = Quiz.objects.create(title="quiz2", classroom=self.classroom)
+        self.students = [self.student_profile]
+        for _ in range(2):
+            user = User.objects.create_user(email=self.fake.unique.email(), password=self.fake.password())
+            self.students.append(user.student_profile)
+
+        marks = {(0, self.quiz): "80", (0, self.quiz2): "60", (1, self.quiz): "40",
+                 (2, self.quiz): "100", (2, self.quiz2): "100"}
+        for (student, quiz), mark in marks.items():
+            StudentQuiz.objects.create(student=self.students[student], quiz=quiz, mark=Decimal(mark))
+
+    def test_percentile_interpolates_linearly(self):
+        self.assertEqual(stats.percentile([40.0, 80.0, 100.0], 25), 60.0)
+        self.assertEqual(stats.percentile([40.0, 80.0, 100.0], 90), 96.0)
+        self.assertEqual(stats.percentile([7.0], 75), 7.0)
+
+    def test_grade_report(self):
+        report = stats.get_grade_report(self.classroom.id)
+        self.assertEqual(report["summary"], {"count": 5, "mean": 76.0, "median": 80.0, "std": 23.32,
+                                             "p25": 60.0, "p75": 100.0, "p90": 100.0})
+
+        quiz = next(item for item in report["quizzes"] if item["quiz_id"] == self.quiz.id)
+        self.assertEqual(quiz, {"quiz_id": self.quiz.id, "count": 3, "mean": 73.33, "median": 80.0,
+                                "std": 24.94, "p25": 60.0, "p75": 90.0, "p90": 96.0})
+
+        students = [(item["student_id"], item["quizzes_taken"], item["average_mark"], item["percentile_rank"])
+                    for item in report["students"]]
+        self.assertEqual(students, [(self.students[2].id, 2, 100.0, 83.33),
+                                    (self.students[0].id, 2, 70.0, 50.0),
+                                    (self.students[1].id, 1, 40.0, 16.67)])
+
+    def test_grade_report_without_submissions(self):
+        StudentQuiz.objects.all().delete()
+        with self.assertNumQueries(1):
+            report = stats.get_grade_report(self.classroom.id)
+        self.assertIsNone(report["summary"])
+        self.assertEqual(report["students"], [])
+
+    def test_marks_are_loaded_with_a_single_query(self):
+        with self.assertNumQueries(1):
+            student_ids, quiz_ids, student_index, quiz_index, marks = stats.load_marks(self.classroom.id)
+        self.assertEqual(len(student_ids), 3)
+        self.assertEqual(len(quiz_ids), 2)
+        self.assertEqual(sorted(marks), [40.0, 60.0, 80.0, 100.0, 100.0])
+
+    @skipIf(stats.numpy is None, "NumPy is not installed")
+    def test_vectorized_statistics_match_the_fallback(self):
+        vectorized = stats.get_grade_report(self.classroom.id)
+        with mock.patch.object(stats, "numpy", None):
+            fallback = stats.get_grade_report(self.classroom.id)
+        self.assertEqual(vectorized, fallback)
+
+
+class GradeReportAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.grade_report_url = reverse("quiz:classroom-quiz:grade-report",
+                                        kwargs={"classroom_id": str(self.classroom2.id)})
+
+    def get(self, token):
+        return self.client.get(self.grade_report_url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.get(self.grade_report_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_owner_users(self):
+        self.assertEqual(self.get(self.teacher_access_token).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.get(self.student2_access_token).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_non_existing_classroom(self):
+        url = reverse("quiz:classroom-quiz:grade-report", kwargs={"classroom_id": self.fake.uuid4()})
+        response = self.client.get(url, headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_view_with_classroom_owner(self):
+        StudentQuiz.objects.create(student=self.student2_profile, quiz=self.quiz, mark=Decimal("50.00"))
+        response = self.get(self.teacher2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["summary"]["count"], StudentQuiz.objects.filter(quiz=self.quiz).count())
+        self.assertEqual(response.data["students"][0]["percentile_rank"], 75.0)
@@ -1,5 +1,11 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 from rest_framework import status
 
+from quiz.models import Answer, Question, Quiz, StudentAnswer, StudentQuiz
 from quiz.tests.test_setup_views import QuizTestSetup
 
 
@@ -56,6 +62,14 @@ class StudentQuizCreateAPIViewTests(QuizTestSetup):
                                     headers={"Authorization": f"Bearer {self.student2_access_token}"})
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_view_grades_the_submitted_answers(self):
+        StudentAnswer.objects.create(student=self.student2_profile, answer=self.answer)
+        response = self.client.post(self.student_quiz_create_url, data={},
+                                    headers={"Authorization": f"Bearer {self.student2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # The valid answer was picked together with an invalid one.
+        self.assertEqual(response.data["mark"], "0.00")
+
 
 class StudentQuizListAPIViewTests(QuizTestSetup):
     def test_view_with_unauthenticated_user(self):
@@ -80,3 +94,122 @@ class StudentQuizListAPIViewTests(QuizTestSetup):
                                             headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
         self.assertEqual(student2_response.status_code, status.HTTP_200_OK)
         self.assertEqual(teacher2_response.status_code, status.HTTP_200_OK)
+
+
+class StudentQuizGradeAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.student_quiz_grade_url = reverse("quiz:student-quiz:student-quiz-grade",
+                                              kwargs={"quiz_id": str(self.quiz.id), })
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.post(self.student_quiz_grade_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.data["detail"], "Authentication credentials were not provided.")
+
+    def test_view_with_authenticated_non_classroom_owner_users(self):
+        teacher_response = self.client.post(self.student_quiz_grade_url,
+                                            headers={"Authorization": f"Bearer {self.teacher_access_token}"})
+        student2_response = self.client.post(self.student_quiz_grade_url,
+                                             headers={"Authorization": f"Bearer {self.student2_access_token}"})
+        self.assertEqual(teacher_response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(student2_response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_authenticated_classroom_owner_user(self):
+        response = self.client.post(self.student_quiz_grade_url,
+                                    headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["graded"], 1)
+        student_quiz = StudentQuiz.objects.get(student=self.student2_profile, quiz=self.quiz)
+        self.assertEqual(student_quiz.mark, Decimal("100.00"))
+
+    def test_view_does_not_grade_students_twice(self):
+        self.client.post(self.student_quiz_grade_url,
+                         headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        response = self.client.post(self.student_quiz_grade_url,
+                                    headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["graded"], 0)
+
+    def test_view_with_quiz_without_questions(self):
+        self.question.delete()
+        response = self.client.post(self.student_quiz_grade_url,
+                                    headers={"Authorization": f"Bearer {self.teacher2_access_token}"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StudentAnswerBulkCreateAPIViewTests(QuizTestSetup):
+    def setUp(self):
+        super().setUp()
+        self.student_answer_bulk_create_url = reverse("quiz:student-quiz:student-answer-bulk-create",
+                                                      kwargs={"quiz_id": str(self.quiz.id), })
+        self.question2 = Question.objects.create(description="question2 description", quiz=self.quiz)
+        self.question2_answer = Answer.objects.create(description="answer", is_valid=True, question=self.question2)
+        self.bulk_data = {
+            "answers": [
+                {"question_id": str(self.question.id), "answer_id": str(self.answer.id)},
+                {"question_id": str(self.question2.id), "answer_id": str(self.question2_answer.id)},
+            ]
+        }
+
+    def post(self, data, token):
+        return self.client.post(self.student_answer_bulk_create_url, data=data, format="json",
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def test_view_with_unauthenticated_user(self):
+        response = self.client.post(self.student_answer_bulk_create_url, data=self.bulk_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_view_with_authenticated_non_classroom_student_member_users(self):
+        teacher2_response = self.post(self.bulk_data, self.teacher2_access_token)
+        student_response = self.post(self.bulk_data, self.student_access_token)
+        self.assertEqual(teacher2_response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(student_response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_view_with_authenticated_classroom_student_member_user(self):
+        response = self.post(self.bulk_data, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 2)
+        self.assertEqual(response.data["conflicts"], [])
+        self.assertTrue(StudentAnswer.objects.filter(student=self.student2_profile, answer=self.answer).exists())
+        self.assertTrue(StudentAnswer.objects.filter(student=self.student2_profile,
+                                                     answer=self.question2_answer).exists())
+
+    def test_view_reports_conflicts_per_item(self):
+        self.bulk_data["answers"].append({"question_id": str(self.question.id), "answer_id": str(self.answer2.id)})
+        response = self.post(self.bulk_data, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["created"]), 2)
+        self.assertEqual(len(response.data["conflicts"]), 1)
+        self.assertEqual(response.data["conflicts"][0]["index"], 2)
+        self.assertEqual(str(response.data["conflicts"][0]["answer_id"]), str(self.answer2.id))
+
+    def test_view_rejects_answers_outside_the_quiz(self):
+        other_quiz = Quiz.objects.create(title="quiz2", classroom=self.classroom2)
+        other_question = Question.objects.create(description="other", quiz=other_quiz)
+        other_answer = Answer.objects.create(description="other", is_valid=True, question=other_question)
+        self.bulk_data["answers"].append({"question_id": str(other_question.id), "answer_id": str(other_answer.id)})
+        self.bulk_data["answers"].append({"question_id": str(self.question2.id), "answer_id": str(self.answer.id)})
+        response = self.post(self.bulk_data, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["answers"][0], {})
+        self.assertIn("answer_id", response.data["answers"][2])
+        self.assertIn("answer_id", response.data["answers"][3])
+        self.assertFalse(StudentAnswer.objects.filter(student=self.student2_profile, answer=self.answer).exists())
+
+    def test_view_with_empty_answer_sheet(self):
+        response = self.post({"answers": []}, self.student2_access_token)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_view_query_count_does_not_depend_on_sheet_size(self):
+        self.post({"answers": []}, self.student2_access_token)  # warm up the membership cache
+        with CaptureQueriesContext(connection) as context:
+            self.post({"answers": self.bulk_data["answers"][:1]}, self.student2_access_token)
+        StudentAnswer.objects.filter(student=self.student2_profile, answer=self.answer).delete()
+        for index in range(10):
+            question = Question.objects.create(description=f"question {index}", quiz=self.quiz)
+            answer = Answer.objects.create(description="answer", is_valid=True, question=question)
+            self.bulk_data["answers"].append({"question_id": str(question.id), "answer_id": str(answer.id)})
+        with self.assertNumQueries(len(context.captured_queries)):
+            response = self.post(self.bulk_data, self.student2_access_token)
+        self.assertEqual(len(response.data["created"]), 12)
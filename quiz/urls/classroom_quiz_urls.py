@@ -0,0 +1,12 @@
+from django.urls import path
+
+from quiz.views import classroom_quiz_views
+
+app_name = "classroom-quiz"
+
+urlpatterns = [
+    path("leaderboard/", classroom_quiz_views.LeaderboardListAPIView.as_view(), name="leaderboard"),
+    path("grade-report/", classroom_quiz_views.GradeReportAPIView.as_view(), name="grade-report"),
+    path("gradebook/<str:export_format>/", classroom_quiz_views.GradebookExportAPIView.as_view(),
+         name="gradebook-export"),
+]
@@ -7,5 +7,10 @@ app_name = "quiz"
 urlpatterns = [
     path('', quiz_views.QuizListAPIView.as_view(), name='quizzes-list'),
     path('create/', quiz_views.QuizCreateAPIView.as_view(), name='quizzes-create'),
+    path('import/', quiz_views.QuizImportAPIView.as_view(), name='quizzes-import'),
     path('<uuid:quiz_id>/', quiz_views.QuizRetrieveUpdateDestroyAPIView.as_view(), name='quizzes-detail'),
+    path('<uuid:quiz_id>/async/', quiz_views.AsyncQuizRetrieveAPIView.as_view(), name='quizzes-detail-async'),
+    path('<uuid:quiz_id>/document/', quiz_views.QuizDocumentAPIView.as_view(), name='quizzes-document'),
+    path('<uuid:quiz_id>/analytics/', quiz_views.QuizAnalyticsAPIView.as_view(), name='quizzes-analytics'),
+    path('<uuid:quiz_id>/clone/', quiz_views.QuizCloneAPIView.as_view(), name='quizzes-clone'),
 ]
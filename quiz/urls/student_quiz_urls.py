@@ -6,6 +6,9 @@ app_name = "student-quiz"
 
 urlpatterns = [
     path("student-answer/", student_quiz_views.StudentAnswerCreateAPIView.as_view(), name="student-answer-create"),
+    path("student-answer/bulk/", student_quiz_views.StudentAnswerBulkCreateAPIView.as_view(),
+         name="student-answer-bulk-create"),
     path("student-quiz/", student_quiz_views.StudentQuizListAPIView.as_view(), name="student-quiz-list"),
     path("student-quiz/submit/", student_quiz_views.StudentQuizCreateAPIView.as_view(), name="student-quiz-create"),
+    path("student-quiz/grade/", student_quiz_views.StudentQuizGradeAPIView.as_view(), name="student-quiz-grade"),
 ]
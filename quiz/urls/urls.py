@@ -8,4 +8,5 @@ urlpatterns = [
     path("quizzes/<uuid:quiz_id>/questions/<uuid:question_id>/answers/",
          include("quiz.urls.answer_urls", namespace="answer")),
     path("quizzes/<uuid:quiz_id>/", include("quiz.urls.student_quiz_urls", namespace="student-quiz")),
+    path("classrooms/<uuid:classroom_id>/", include("quiz.urls.classroom_quiz_urls", namespace="classroom-quiz")),
 ]
@@ -10,6 +10,8 @@ from authuser.serializers import ErrorResponseSerializer
 from classroom.permissions import IsClassroomOwner
 from quiz.models import Answer, Question
 from quiz.serializers import AnswerSerializer
+from quiz_room_hub.pagination import PrimaryKeyCursorPagination
+from quiz_room_hub.prefetch import SerializerPrefetchMixin
 
 
 class AnswerCreateAPIView(CreateAPIView):
@@ -68,7 +70,7 @@ class AnswerCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class AnswerListAPIView(ListAPIView):
+class AnswerListAPIView(SerializerPrefetchMixin, ListAPIView):
     """
     API view to list Answer instances for a specific question.
 
@@ -78,6 +80,7 @@ class AnswerListAPIView(ListAPIView):
     Attributes:
         serializer_class: The serializer class to handle the answer listing.
         permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the answer ids.
 
     Methods:
         get_queryset():
@@ -85,6 +88,7 @@ class AnswerListAPIView(ListAPIView):
     """
     serializer_class = AnswerSerializer
     permission_classes = [IsAuthenticated, IsClassroomOwner]
+    pagination_class = PrimaryKeyCursorPagination
 
     def get_queryset(self):
         """
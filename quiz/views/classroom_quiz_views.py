@@ -0,0 +1,165 @@
+from django.http import Http404, StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from authuser.serializers import ErrorResponseSerializer
+from classroom.models import Classroom
+from classroom.permissions import IsClassroomOwner
+from quiz.gradebook import EXPORT_FORMATS, iter_gradebook_rows
+from quiz.models import LeaderboardEntry
+from quiz.serializers import LeaderboardEntrySerializer, GradeReportSerializer
+from quiz.stats import get_grade_report
+from quiz_room_hub.pagination import LeaderboardCursorPagination
+from quiz_room_hub.prefetch import SerializerPrefetchMixin
+
+
+class LeaderboardListAPIView(SerializerPrefetchMixin, ListAPIView):
+    """
+    API view to list the leaderboard of a classroom.
+
+    This view returns the students of a classroom ranked by their average mark over all the graded quizzes
+    of the classroom. The entries are maintained incrementally as quizzes are graded, so a page is read
+    from the `(classroom, -average_mark)` index whatever the size of the quiz history. The user must be
+    authenticated and the owner of the classroom.
+
+    Attributes:
+        serializer_class: The serializer class to handle the leaderboard listing.
+        permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the best average marks first.
+
+    Methods:
+        get_queryset():
+            Returns the queryset of leaderboard entries of the specified classroom.
+    """
+    serializer_class = LeaderboardEntrySerializer
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+    pagination_class = LeaderboardCursorPagination
+
+    def get_queryset(self):
+        """
+        Returns the queryset of leaderboard entries of the specified classroom.
+
+        This method retrieves the classroom by its ID from the URL kwargs, checks the user's
+        permissions for the classroom, and then returns its leaderboard entries.
+
+        Returns:
+            QuerySet: A queryset of LeaderboardEntry objects.
+
+        Raises:
+            Http404: If the classroom does not exist.
+        """
+        classroom_id = self.kwargs.get("classroom_id")
+        try:
+            classroom = Classroom.objects.get(id=classroom_id)
+        except Classroom.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(self.request, classroom)
+        return LeaderboardEntry.objects.filter(classroom=classroom)
+
+
+class GradeReportAPIView(APIView):
+    """
+    API view to retrieve the grade report of a classroom.
+
+    This view returns the mean, median, standard deviation and percentiles of the marks of a classroom,
+    overall and for each graded quiz, along with the average mark and percentile rank of each student.
+    The marks are streamed out of the database as floats and reduced in bulk, so the report stays cheap
+    for classrooms with a large quiz history. The user must be authenticated and the owner of the
+    classroom.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        get(request, classroom_id, *args, **kwargs):
+            Handles GET requests to retrieve the grade report.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+
+    @extend_schema(
+        responses={
+            200: GradeReportSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, classroom_id, *args, **kwargs):
+        """
+        Handles GET requests to retrieve the grade report.
+
+        Args:
+            request (Request): The HTTP request object.
+            classroom_id (UUID): The ID of the classroom to report on.
+
+        Returns:
+            Response: The response containing the grade report.
+
+        Raises:
+            Http404: If the classroom does not exist.
+        """
+        try:
+            classroom = Classroom.objects.get(id=classroom_id)
+        except Classroom.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(request, classroom)
+        serializer = GradeReportSerializer(get_grade_report(classroom.id))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class GradebookExportAPIView(APIView):
+    """
+    API view to export the gradebook of a classroom.
+
+    This view streams every graded submission of the classroom as CSV or NDJSON, one row per student
+    and quiz. The rows are read as flat tuples in bounded keyset chunks and written to the response as
+    they are produced, so memory use does not grow with the number of students or quizzes. The user
+    must be authenticated and the owner of the classroom.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        get(request, classroom_id, export_format, *args, **kwargs):
+            Handles GET requests to stream the gradebook.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+
+    @extend_schema(
+        responses={
+            (200, "text/csv"): str,
+            (200, "application/x-ndjson"): str,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, classroom_id, export_format, *args, **kwargs):
+        """
+        Handles GET requests to stream the gradebook.
+
+        Args:
+            request (Request): The HTTP request object.
+            classroom_id (UUID): The ID of the classroom to export.
+            export_format (str): The export format, either `csv` or `ndjson`.
+
+        Returns:
+            StreamingHttpResponse: The response streaming the gradebook as an attachment.
+
+        Raises:
+            Http404: If the classroom does not exist or the format is not supported.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        try:
+            classroom = Classroom.objects.get(id=classroom_id)
+        except Classroom.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(request, classroom)
+        render, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(render(iter_gradebook_rows(classroom.id)), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="gradebook-{classroom.id}.{export_format}"'
+        return response
@@ -8,8 +8,11 @@ from rest_framework.views import APIView
 
 from authuser.serializers import ErrorResponseSerializer
 from classroom.permissions import IsClassroomOwner, IsClassroomMember
+from classroom.response_cache import ClassroomResponseCacheMixin
 from quiz.models import Question, Quiz
 from quiz.serializers import QuestionSerializer
+from quiz_room_hub.pagination import PrimaryKeyCursorPagination
+from quiz_room_hub.prefetch import SerializerPrefetchMixin
 
 
 class QuestionCreateAPIView(CreateAPIView):
@@ -67,34 +70,38 @@ class QuestionCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class QuestionListAPIView(ListAPIView):
+class QuestionListAPIView(ClassroomResponseCacheMixin, SerializerPrefetchMixin, ListAPIView):
     """
     API view to list Question instances for a specific quiz.
 
     This view returns a list of questions associated with a specific quiz.
     The user must be authenticated and a member of the classroom to access this view.
+    The pages are cached until the classroom's quizzes change, see `ClassroomResponseCacheMixin`.
 
     Attributes:
         serializer_class: The serializer class to handle the question listing.
         permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the question ids.
 
     Methods:
+        get_classroom():
+            Returns the classroom of the specified quiz, once the user's permissions are checked.
         get_queryset():
             Returns the queryset of questions associated with the specified quiz.
     """
     serializer_class = QuestionSerializer
     permission_classes = [IsAuthenticated, IsClassroomMember]
+    pagination_class = PrimaryKeyCursorPagination
 
-    def get_queryset(self):
+    def get_classroom(self):
         """
-        Returns the queryset of questions associated with the specified quiz.
+        Returns the classroom of the specified quiz.
 
-        This method retrieves the quiz by its ID from the URL kwargs, checks the
-        user's permissions for the classroom associated with the quiz, and then
-        returns the queryset of questions.
+        This method retrieves the quiz by its ID from the URL kwargs with its
+        classroom, and checks the user's permissions for the classroom.
 
         Returns:
-            QuerySet: A queryset of Question objects.
+            Classroom: The classroom of the quiz.
 
         Raises:
             Http404: If the quiz does not exist.
@@ -102,13 +109,24 @@ class QuestionListAPIView(ListAPIView):
         quiz_id = self.kwargs.get("quiz_id")
 
         try:
-            quiz = Quiz.objects.get(id=quiz_id)
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
         except Quiz.DoesNotExist:
             raise Http404
 
         self.check_object_permissions(self.request, quiz.classroom)
+        return quiz.classroom
+
+    def get_queryset(self):
+        """
+        Returns the queryset of questions associated with the specified quiz.
 
-        return quiz.questions.all()
+        Returns:
+            QuerySet: A queryset of Question objects.
+
+        Raises:
+            Http404: If the quiz does not exist.
+        """
+        return Question.objects.filter(quiz_id=self.kwargs.get("quiz_id"), quiz__classroom=self.classroom)
 
 
 class QuestionRetrieveUpdateDestroyAPIView(APIView):
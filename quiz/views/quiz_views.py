@@ -1,19 +1,30 @@
+from django.db import transaction
 from django.http import Http404
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, ListAPIView
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
-from account.models import TeacherProfile
 from authuser.serializers import ErrorResponseSerializer
 from classroom.models import Classroom
-from classroom.permissions import IsClassroomOwner, IsTeacher, IsClassroomMember
+from classroom.membership import get_membership
+from classroom.permissions import AsyncIsClassroomMember, IsClassroomOwner, IsTeacher, IsClassroomMember
+from classroom.response_cache import ClassroomResponseCacheMixin
+from quiz.analytics import get_analytics
+from quiz.document import get_quiz_document
+from quiz.importer import clone_quiz, import_quiz
 from quiz.models import Quiz
-from quiz.serializers import QuizSerializer
+from quiz.serializers import (QuizSerializer, QuizDocumentSerializer, QuizAnalyticsSerializer, QuizImportSerializer,
+                              QuizCloneSerializer)
+from quiz_room_hub.async_views import AsyncAPIView, AsyncIsAuthenticated
+from quiz_room_hub.conditional import (ConditionalListMixin, evaluate_preconditions, get_object_validators,
+                                       set_validators)
+from quiz_room_hub.prefetch import SerializerPrefetchMixin
 
 
 class QuizCreateAPIView(CreateAPIView):
@@ -55,13 +66,133 @@ class QuizCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class QuizListAPIView(ListAPIView):
+class QuizImportAPIView(APIView):
+    """
+    API view to import a whole quiz in one request.
+
+    This view creates a quiz with all its questions and answer options from a single document, either
+    as JSON with nested `questions` or as a multipart form with a CSV `file`. The document is validated
+    in memory, the classroom ownership is checked once, and the rows are inserted with one bulk insert
+    per table in a single transaction. The user must be authenticated and the owner of the classroom.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+        parser_classes: The parsers accepting JSON documents and CSV uploads.
+
+    Methods:
+        post(request, *args, **kwargs):
+            Handles POST requests to import a quiz.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+    parser_classes = [JSONParser, MultiPartParser]
+
+    @extend_schema(
+        request=QuizImportSerializer,
+        responses={
+            201: QuizSerializer,
+            400: ErrorResponseSerializer,
+        },
+        description="Import a quiz with its questions and answers."
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Handles POST requests to import a quiz.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The response containing the created quiz details.
+
+        Raises:
+            ValidationError: If the document is invalid or the classroom does not exist.
+        """
+        serializer = QuizImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            classroom = Classroom.objects.get(id=data["classroom_id"])
+        except Classroom.DoesNotExist:
+            raise ValidationError(_("Classroom does not exist"))
+
+        self.check_object_permissions(request, classroom)
+        quiz = import_quiz(classroom, data["title"], data["questions"], content=data.get("content"))
+        return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
+
+
+class QuizCloneAPIView(APIView):
+    """
+    API view to copy a quiz into one or more classrooms.
+
+    This view copies a quiz with all its questions and answer options into every classroom listed in
+    `classroom_ids`. The source quiz is read once and all the copies are inserted together with one bulk
+    insert per table, without saving the rows one by one. The user must be authenticated and the owner
+    of the classroom of the quiz and of every target classroom.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        post(request, quiz_id, *args, **kwargs):
+            Handles POST requests to clone the quiz.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+
+    @extend_schema(
+        request=QuizCloneSerializer,
+        responses={
+            201: QuizSerializer(many=True),
+            400: ErrorResponseSerializer,
+            404: ErrorResponseSerializer,
+        },
+        description="Copy a quiz with its questions and answers into several classrooms."
+    )
+    def post(self, request, quiz_id, *args, **kwargs):
+        """
+        Handles POST requests to clone the quiz.
+
+        Args:
+            request (Request): The HTTP request object.
+            quiz_id (UUID): The ID of the quiz to copy.
+
+        Returns:
+            Response: The response containing the created quizzes.
+
+        Raises:
+            Http404: If the quiz does not exist.
+            ValidationError: If the data is invalid or a target classroom does not exist.
+        """
+        try:
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(request, quiz.classroom)
+        serializer = QuizCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        classroom_ids = serializer.validated_data["classroom_ids"]
+
+        classrooms = Classroom.objects.in_bulk(classroom_ids)
+        if len(classrooms) != len(classroom_ids):
+            raise ValidationError(_("Classroom does not exist"))
+        for classroom in classrooms.values():
+            self.check_object_permissions(request, classroom)
+
+        quizzes = clone_quiz(quiz, [classrooms[classroom_id] for classroom_id in classroom_ids],
+                             title=serializer.validated_data.get("title"))
+        return Response(QuizSerializer(quizzes, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class QuizListAPIView(ConditionalListMixin, SerializerPrefetchMixin, ListAPIView):
     """
     API view to list Quiz instances.
 
     This view returns a list of quizzes that are associated with the classrooms
     of the authenticated teacher. The user must be authenticated and have a
-    teacher profile.
+    teacher profile. Unchanged pages are answered with a 304, see `ConditionalListMixin`.
 
     Attributes:
         serializer_class: The serializer class to handle the quiz listing.
@@ -81,17 +212,16 @@ class QuizListAPIView(ListAPIView):
         Returns the queryset of quizzes associated with the teacher's classrooms.
 
         The queryset is filtered to include only the quizzes that are linked
-        to the classrooms managed by the authenticated teacher.
+        to the classrooms managed by the authenticated teacher, leaving out the
+        classrooms whose deletion was requested.
 
         Returns:
             QuerySet: A queryset of Quiz objects.
         """
-        user = self.request.user
-        teacher = TeacherProfile.objects.get(user=user)
-        return Quiz.objects.filter(classroom__in=teacher.classrooms.all())
+        return Quiz.objects.filter(classroom__teacher__user=self.request.user, classroom__is_deleting=False)
 
 
-class QuizRetrieveUpdateDestroyAPIView(APIView):
+class QuizRetrieveUpdateDestroyAPIView(ClassroomResponseCacheMixin, APIView):
     """
     API view to retrieve, update, or delete a Quiz instance.
 
@@ -101,6 +231,10 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
     - SAFE_METHODS (GET): The user must be a member of the classroom.
     - Non-SAFE_METHODS (PUT, DELETE): The user must be the owner of the classroom.
 
+    The quiz details are cached until the classroom's quizzes change, see `ClassroomResponseCacheMixin`.
+    Reads are validated by an ETag and a Last-Modified date, and updates carrying an `If-Match` header
+    are rejected with a 412 if the quiz changed since the client read it.
+
     Methods:
         get_permissions():
             Determines the permission classes based on the request method.
@@ -135,12 +269,14 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
             self.permission_classes = [IsAuthenticated, IsClassroomOwner]
         return super().get_permissions()
 
-    def get_object(self, quiz_id):
+    def get_object(self, quiz_id, for_update=False):
         """
         Retrieves the quiz object by its ID and checks object permissions.
 
         Args:
             quiz_id (UUID): The ID of the quiz to be retrieved.
+            for_update (bool): Whether to lock the row of the quiz, not its classroom, until the end of the
+                transaction.
 
         Returns:
             Quiz: The retrieved quiz object.
@@ -149,7 +285,10 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
             Http404: If the quiz does not exist.
         """
         try:
-            quiz = Quiz.objects.get(id=quiz_id)
+            queryset = Quiz.objects.select_related("classroom")
+            if for_update:
+                queryset = queryset.select_for_update(of=("self",))
+            quiz = queryset.get(id=quiz_id)
             classroom = quiz.classroom
             self.check_object_permissions(self.request, classroom)
             return quiz
@@ -159,6 +298,7 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
     @extend_schema(
         responses={
             200: QuizSerializer,
+            304: None,
             404: ErrorResponseSerializer,
         },
     )
@@ -171,12 +311,16 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
             quiz_id (UUID): The ID of the quiz to be retrieved.
 
         Returns:
-            Response: The response containing the quiz details.
+            Response: The response containing the quiz details, or a 304 Not Modified if the
+            `If-None-Match` or `If-Modified-Since` header matches.
         """
         self.check_permissions(request)
         quiz = self.get_object(quiz_id)
-        serializer = QuizSerializer(quiz)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        etag, last_modified = get_object_validators(quiz, "last_updated")
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = self.get_cached_response(quiz.classroom, lambda: QuizSerializer(quiz).data)
+        return set_validators(response, etag, last_modified)
 
     @extend_schema(
         request=QuizSerializer,
@@ -184,6 +328,7 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
             200: QuizSerializer,
             400: ErrorResponseSerializer,
             404: ErrorResponseSerializer,
+            412: ErrorResponseSerializer,
         },
     )
     def put(self, request, quiz_id, *args, **kwargs):
@@ -195,14 +340,21 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
             quiz_id (UUID): The ID of the quiz to be updated.
 
         Returns:
-            Response: The response containing the updated quiz details.
+            Response: The response containing the updated quiz details, or a 412 Precondition Failed
+            if the `If-Match` header does not match the current quiz.
         """
         self.check_permissions(request)
-        quiz = self.get_object(quiz_id)
-        serializer = QuizSerializer(quiz, data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # The quiz stays locked from the precondition check to the save, so no concurrent update is lost.
+        with transaction.atomic():
+            quiz = self.get_object(quiz_id, for_update=True)
+            precondition_failed = evaluate_preconditions(request, *get_object_validators(quiz, "last_updated"))
+            if precondition_failed:
+                return precondition_failed
+            serializer = QuizSerializer(quiz, data=request.data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(response, *get_object_validators(quiz, "last_updated"))
 
     @extend_schema(
         responses={
@@ -225,3 +377,163 @@ class QuizRetrieveUpdateDestroyAPIView(APIView):
         quiz = self.get_object(quiz_id)
         quiz.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class QuizDocumentAPIView(APIView):
+    """
+    API view to retrieve a whole quiz document.
+
+    This view returns the quiz together with all its questions and their answer options, so clients can
+    render a quiz with a single request instead of one request per question. The user must be
+    authenticated and a member of the classroom. The validity of the answer options is only exposed to
+    the owner of the classroom.
+
+    The document is rendered with two prefetch queries and cached per quiz version, keyed on
+    `Quiz.last_updated`.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        get(request, quiz_id, *args, **kwargs):
+            Handles GET requests to retrieve the quiz document.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomMember]
+
+    @extend_schema(
+        responses={
+            200: QuizDocumentSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, quiz_id, *args, **kwargs):
+        """
+        Handles GET requests to retrieve the quiz document.
+
+        Args:
+            request (Request): The HTTP request object.
+            quiz_id (UUID): The ID of the quiz to be retrieved.
+
+        Returns:
+            Response: The response containing the quiz, its questions and their answer options.
+
+        Raises:
+            Http404: If the quiz does not exist.
+        """
+        try:
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(request, quiz.classroom)
+        include_validity = get_membership(request).is_owner(quiz.classroom)
+        return Response(get_quiz_document(quiz, include_validity), status=status.HTTP_200_OK)
+
+
+class QuizAnalyticsAPIView(APIView):
+    """
+    API view to retrieve the analytics of a quiz.
+
+    This view returns, for a quiz, the number of submissions and their average mark, a histogram of the
+    marks and, for each question from the hardest to the easiest, the rate of students who answered it
+    correctly and how often each answer option was picked. The user must be authenticated and the owner
+    of the classroom.
+
+    The analytics are computed with grouped aggregate queries and cached until a student answers the
+    quiz, a submission is graded or the quiz content changes.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        get(request, quiz_id, *args, **kwargs):
+            Handles GET requests to retrieve the quiz analytics.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+
+    @extend_schema(
+        responses={
+            200: QuizAnalyticsSerializer,
+            404: ErrorResponseSerializer,
+        },
+    )
+    def get(self, request, quiz_id, *args, **kwargs):
+        """
+        Handles GET requests to retrieve the quiz analytics.
+
+        Args:
+            request (Request): The HTTP request object.
+            quiz_id (UUID): The ID of the quiz to be analysed.
+
+        Returns:
+            Response: The response containing the quiz analytics.
+
+        Raises:
+            Http404: If the quiz does not exist.
+        """
+        try:
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise Http404
+
+        self.check_object_permissions(request, quiz.classroom)
+        serializer = QuizAnalyticsSerializer(get_analytics(quiz))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class AsyncQuizRetrieveAPIView(AsyncAPIView):
+    """
+    Async variant of the `GET` endpoint of `QuizRetrieveUpdateDestroyAPIView`.
+
+    Under ASGI, the request is served without being handed to a worker thread: the user, the membership and
+    the quiz with its classroom are loaded with the async ORM. The response carries the same validators as
+    the sync endpoint's, but is not cached.
+
+    Methods:
+        get_object(quiz_id):
+            Retrieves the quiz object by its ID and checks object permissions.
+            Raises Http404 if the quiz does not exist.
+
+        get(request, quiz_id, *args, **kwargs):
+            Handles GET requests to retrieve the quiz details.
+    """
+    permission_classes = [AsyncIsAuthenticated, AsyncIsClassroomMember]
+
+    async def get_object(self, quiz_id):
+        """
+        Retrieves the quiz object by its ID and checks object permissions.
+
+        Args:
+            quiz_id (UUID): The ID of the quiz to be retrieved.
+
+        Returns:
+            Quiz: The retrieved quiz object.
+
+        Raises:
+            Http404: If the quiz does not exist.
+        """
+        try:
+            quiz = await Quiz.objects.select_related("classroom").aget(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise Http404
+        await self.check_object_permissions(self.request, quiz.classroom)
+        return quiz
+
+    async def get(self, request, quiz_id, *args, **kwargs):
+        """
+        Handles GET requests to retrieve the quiz details.
+
+        Args:
+            request (Request): The HTTP request object.
+            quiz_id (UUID): The ID of the quiz to be retrieved.
+
+        Returns:
+            Response: The response containing the quiz details, or a 304 Not Modified if the
+            `If-None-Match` or `If-Modified-Since` header matches.
+        """
+        quiz = await self.get_object(quiz_id)
+        etag, last_modified = get_object_validators(quiz, "last_updated")
+        response = evaluate_preconditions(request, etag, last_modified)
+        if response is None:
+            response = Response(QuizSerializer(quiz).data, status=status.HTTP_200_OK)
+        return set_validators(response, etag, last_modified)
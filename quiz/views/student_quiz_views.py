@@ -1,5 +1,6 @@
+from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiResponse
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -8,9 +9,14 @@ from rest_framework.serializers import ValidationError
 from rest_framework.views import APIView
 
 from authuser.serializers import ErrorResponseSerializer
-from classroom.permissions import IsClassroomMember, IsStudent
+from classroom.permissions import IsClassroomMember, IsClassroomOwner, IsStudent
+from quiz.grading import grade_quiz
 from quiz.models import StudentQuiz, Quiz
-from quiz.serializers import StudentAnswerSerializer, StudentQuizSerializer
+from quiz.serializers import StudentAnswerSerializer, StudentAnswerBulkSerializer, StudentQuizSerializer
+from quiz_room_hub.pagination import AnsweredAtCursorPagination
+from quiz_room_hub.prefetch import SerializerPrefetchMixin
+
+User = get_user_model()
 
 
 class StudentAnswerCreateAPIView(APIView):
@@ -73,6 +79,64 @@ class StudentAnswerCreateAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class StudentAnswerBulkCreateAPIView(APIView):
+    """
+    API view to submit a whole answer sheet for a specific quiz.
+
+    This view creates the StudentAnswer instances for every (question_id, answer_id) pair of the
+    request in a single insert. All pairs are validated against the quiz with one query; answers the
+    student already gave are reported per item as conflicts instead of failing the whole sheet.
+    It requires that the user is authenticated, a member of the classroom, and a student.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        post(request, *args, **kwargs):
+            Handles POST requests to create the student answers of the sheet.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomMember, IsStudent]
+
+    @extend_schema(
+        request=StudentAnswerBulkSerializer,
+        responses={
+            201: OpenApiResponse(description="Created answers and per-item conflicts"),
+            400: ErrorResponseSerializer,
+        },
+        description="Create the student answers of a whole answer sheet for a specific quiz."
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Handles POST requests to create the student answers of the sheet.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The response listing the created answers and the conflicting items.
+
+        Raises:
+            ValidationError: If the quiz does not exist or an answer does not belong to the quiz.
+        """
+        self.check_permissions(request)
+
+        quiz_id = self.kwargs.get("quiz_id")
+        try:
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise ValidationError(_("Quiz does not exist"))
+        self.check_object_permissions(request, quiz.classroom)
+
+        serializer = StudentAnswerBulkSerializer(data=request.data,
+                                                 context={"quiz": quiz, "student": request.user.student_profile})
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save()
+
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
 class StudentQuizCreateAPIView(CreateAPIView):
     """
     API view to create a new StudentQuiz instance.
@@ -138,7 +202,7 @@ class StudentQuizCreateAPIView(CreateAPIView):
         serializer.save()
 
 
-class StudentQuizListAPIView(ListAPIView):
+class StudentQuizListAPIView(SerializerPrefetchMixin, ListAPIView):
     """
     API view to list StudentQuiz instances.
 
@@ -148,6 +212,7 @@ class StudentQuizListAPIView(ListAPIView):
     Attributes:
         serializer_class: The serializer class to handle the student quiz listing.
         permission_classes: The list of permission classes required to access this view.
+        pagination_class: The cursor pagination over the most recent submissions first.
 
     Methods:
         get_queryset():
@@ -157,6 +222,7 @@ class StudentQuizListAPIView(ListAPIView):
     """
     serializer_class = StudentQuizSerializer
     permission_classes = [IsAuthenticated, IsClassroomMember]
+    pagination_class = AnsweredAtCursorPagination
 
     def get_queryset(self):
         """
@@ -181,7 +247,63 @@ class StudentQuizListAPIView(ListAPIView):
         classroom = quiz.classroom
         self.check_object_permissions(self.request, classroom)
 
-        if hasattr(user, "student_profile"):
-            return StudentQuiz.objects.filter(student=user.student_profile)
+        if user.role == User.STUDENT:
+            return StudentQuiz.objects.filter(student__user=user)
         else:  # user is a teacher
             return StudentQuiz.objects.filter(quiz__classroom=quiz.classroom)
+
+
+class StudentQuizGradeAPIView(APIView):
+    """
+    API view to grade every student of a quiz at once.
+
+    This view creates a StudentQuiz instance for each student enrolled in the quiz's classroom who
+    has not submitted the quiz yet, using the answers they recorded so far. It requires that the user
+    is authenticated and the owner of the classroom.
+
+    Attributes:
+        permission_classes: The list of permission classes required to access this view.
+
+    Methods:
+        post(request, *args, **kwargs):
+            Handles POST requests to grade the remaining students of the quiz.
+    """
+    permission_classes = [IsAuthenticated, IsClassroomOwner]
+
+    @extend_schema(
+        request=None,
+        responses={
+            200: OpenApiResponse(description="Number of graded students"),
+            400: ErrorResponseSerializer,
+        },
+        description="Grade every student of the classroom who has not submitted the quiz yet."
+    )
+    def post(self, request, *args, **kwargs):
+        """
+        Handles POST requests to grade the remaining students of the quiz.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The response containing the number of graded students.
+
+        Raises:
+            ValidationError: If the quiz does not exist or has no questions.
+        """
+        self.check_permissions(request)
+
+        quiz_id = self.kwargs.get("quiz_id")
+        try:
+            quiz = Quiz.objects.select_related("classroom").get(id=quiz_id)
+        except Quiz.DoesNotExist:
+            raise ValidationError(_("Quiz does not exist."))
+        self.check_object_permissions(request, quiz.classroom)
+
+        if not quiz.questions.exists():
+            raise ValidationError(_("Quiz has no questions."))
+
+        student_quizzes = grade_quiz(quiz)
+        return Response({"graded": len(student_quizzes)}, status=status.HTTP_200_OK)
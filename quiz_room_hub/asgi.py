@@ -3,6 +3,9 @@ ASGI config for quiz_room_hub project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+HTTP requests are handled by Django, and WebSocket connections by the live quiz sessions, see
+``live.websocket``.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
@@ -13,4 +16,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quiz_room_hub.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up, as it loads models.
+from live.websocket import live_quiz_application  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        await live_quiz_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,148 @@
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from authuser.authentication import AsyncJWTAuthentication
+
+
+class AsyncBasePermission:
+    """
+    Base class of the permissions checked by `AsyncAPIView`, whose checks are coroutines.
+
+    They mirror DRF's `BasePermission` but are not interchangeable with it: a sync view would take the
+    coroutine returned by a check for a granted permission.
+    """
+    message = None
+    code = None
+
+    async def has_permission(self, request, view):
+        return True
+
+    async def has_object_permission(self, request, view, obj):
+        return True
+
+
+class AsyncIsAuthenticated(AsyncBasePermission):
+    """
+    Async version of `IsAuthenticated`.
+    """
+
+    async def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
+
+class AsyncAPIView(View):
+    """
+    Base class of the async variants of the read endpoints, served without leaving the event loop under ASGI.
+
+    DRF's `APIView` is sync only, so every request it handles under ASGI is run in a worker thread. This
+    view keeps the parts of its request cycle the read endpoints rely on, as coroutines: the request is
+    wrapped in a DRF `Request`, authenticated by `authentication_classes` (see `AsyncJWTAuthentication`),
+    checked against `permission_classes` (see `AsyncBasePermission`), and the handler's errors are turned
+    into responses by DRF's exception handler, so the status codes and error bodies match the sync views.
+
+    Handlers are coroutines returning a DRF `Response`, which is always rendered as JSON by
+    `renderer_class`, or any `HttpResponse`. The response is returned already rendered, as Django would
+    otherwise render it in a worker thread.
+
+    Attributes:
+        authentication_classes (list): The authentication classes, implementing `aauthenticate`.
+        permission_classes (list): The permission classes, subclasses of `AsyncBasePermission`.
+        renderer_class: The renderer of the response data.
+    """
+    authentication_classes = [AsyncJWTAuthentication]
+    permission_classes = [AsyncIsAuthenticated]
+    renderer_class = JSONRenderer
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.request = Request(request)
+        try:
+            await self.initial(self.request)
+            method = request.method.lower()
+            handler = getattr(self, method, None) if method in self.http_method_names else None
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            response = await handler(self.request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return self.finalize_response(response)
+
+    async def initial(self, request):
+        await self.perform_authentication(request)
+        await self.check_permissions(request)
+
+    def get_authenticators(self):
+        return [authentication() for authentication in self.authentication_classes]
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    async def perform_authentication(self, request):
+        """
+        Authenticates the request with the first authenticator recognizing its credentials.
+
+        Raises:
+            AuthenticationFailed: If the credentials are invalid.
+        """
+        self.authenticators = self.get_authenticators()
+        self.authenticator = None
+        for authenticator in self.authenticators:
+            user_auth_tuple = await authenticator.aauthenticate(request)
+            if user_auth_tuple is not None:
+                self.authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request.user, request.auth = AnonymousUser(), None
+
+    async def check_permissions(self, request):
+        for permission in self.get_permissions():
+            if not await permission.has_permission(request, self):
+                self.permission_denied(request, permission.message, permission.code)
+
+    async def check_object_permissions(self, request, obj):
+        for permission in self.get_permissions():
+            if not await permission.has_object_permission(request, self, obj):
+                self.permission_denied(request, permission.message, permission.code)
+
+    def permission_denied(self, request, message=None, code=None):
+        if self.authenticators and self.authenticator is None:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(detail=message, code=code)
+
+    def get_authenticate_header(self):
+        if self.authenticators:
+            return self.authenticators[0].authenticate_header(self.request)
+
+    def handle_exception(self, exc):
+        """
+        Turns an exception raised while handling the request into a response, like `APIView.handle_exception`.
+        """
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            auth_header = self.get_authenticate_header()
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = status.HTTP_403_FORBIDDEN
+
+        context = {"view": self, "args": self.args, "kwargs": self.kwargs, "request": self.request}
+        response = exception_handler(exc, context)
+        if response is None:
+            raise exc
+        return response
+
+    def finalize_response(self, response):
+        if not isinstance(response, Response):
+            return response
+        content = b"" if response.data is None else self.renderer_class().render(response.data)
+        rendered = HttpResponse(content, status=response.status_code, content_type=self.renderer_class.media_type)
+        for header, value in response.items():
+            if header.lower() != "content-type":
+                rendered[header] = value
+        return rendered
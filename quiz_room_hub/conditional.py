@@ -0,0 +1,98 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts, weak=False):
+    """
+    Returns an entity tag made of the digest of the given parts.
+    """
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def get_object_validators(obj, field):
+    """
+    Returns the strong ETag and the Last-Modified date of an object, from its modification timestamp.
+
+    Args:
+        obj: A model instance.
+        field (str): The name of its `auto_now` field.
+
+    Returns:
+        tuple: The ETag and the modification datetime.
+    """
+    last_modified = getattr(obj, field)
+    return make_etag(obj._meta.label, obj.pk, last_modified.isoformat()), last_modified
+
+
+def get_list_validator(request, queryset, field):
+    """
+    Returns a weak ETag for a page of a list, from one aggregate query over the whole list.
+
+    The most recent modification timestamp changes when a row is added or updated and the count when a
+    row is removed, so the pair changes whenever the list does. The path is part of the tag since each
+    page and filter is a different representation. No Last-Modified is given for lists, since a removal
+    does not move the most recent modification back in time.
+    """
+    summary = queryset.order_by().aggregate(last_modified=Max(field), count=Count("pk"))
+    last_modified = summary["last_modified"]
+    return make_etag(request.get_full_path(), last_modified and last_modified.isoformat(), summary["count"],
+                     weak=True)
+
+
+async def aget_list_validator(request, queryset, field):
+    """
+    Async version of `get_list_validator`.
+    """
+    summary = await queryset.order_by().aaggregate(last_modified=Max(field), count=Count("pk"))
+    last_modified = summary["last_modified"]
+    return make_etag(request.get_full_path(), last_modified and last_modified.isoformat(), summary["count"],
+                     weak=True)
+
+
+def evaluate_preconditions(request, etag, last_modified=None):
+    """
+    Evaluates the conditional headers of a request against the current validators of the resource.
+
+    Returns:
+        Response: A 304 Not Modified for a safe request whose `If-None-Match` or `If-Modified-Since`
+            matches, a 412 Precondition Failed when `If-Match` or `If-Unmodified-Since` does not, for
+            instance on a PUT based on a stale copy, or None when the request should be processed.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+        response = Response({"detail": _("The resource was modified since it was retrieved.")},
+                            status=status.HTTP_412_PRECONDITION_FAILED)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Sets the ETag and, if given, the Last-Modified headers of a response and returns it.
+    """
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Mixin for list views that answers a 304 Not Modified, without serializing, when the list is unchanged.
+
+    The validator is computed by `get_list_validator` from `last_modified_field`, the `auto_now` field of
+    the listed model.
+    """
+    last_modified_field = "last_updated"
+
+    def list(self, request, *args, **kwargs):
+        etag = get_list_validator(request, self.filter_queryset(self.get_queryset()), self.last_modified_field)
+        response = evaluate_preconditions(request, etag) or super().list(request, *args, **kwargs)
+        return set_validators(response, etag)
@@ -0,0 +1,146 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+DEFAULT_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+
+# Headers understood by the front proxies; the value is the internal location (nginx) or the absolute path.
+ACCEL_REDIRECT = "X-Accel-Redirect"
+SENDFILE = "X-Sendfile"
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_sendfile_header():
+    return getattr(settings, "MEDIA_SENDFILE_HEADER", None)
+
+
+def get_accel_redirect_prefix():
+    return getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", DEFAULT_ACCEL_REDIRECT_PREFIX)
+
+
+def get_etag(stat):
+    """
+    Returns a strong ETag for a file, derived from its size and modification time like nginx's.
+    """
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def parse_range(header, size):
+    """
+    Parses a single byte range of a `Range` header.
+
+    Returns:
+        tuple: The first and last byte positions, or None to serve the whole file, for a missing or
+            multi-range header, which may always be answered with the full content.
+
+    Raises:
+        ValueError: If the range cannot be satisfied for a file of `size` bytes.
+    """
+    match = RANGE_RE.match(header.replace(" ", "")) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last `last` bytes.
+        length = int(last)
+        if not length or not size:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first > last:
+        raise ValueError
+    return first, last
+
+
+class RangeFile:
+    """
+    Read-only view of `length` bytes of a file starting at `offset`, streamed by `FileResponse`.
+    """
+
+    def __init__(self, file, offset, length):
+        file.seek(offset)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def serve_media(request, name):
+    """
+    Answers a request for a file of MEDIA_ROOT whose access was already checked.
+
+    With `MEDIA_SENDFILE_HEADER` set, the response is empty and only tells the front proxy which file to
+    send: nginx serves `X-Accel-Redirect` from an `internal` location mapped to MEDIA_ROOT, Apache and
+    lighttpd serve the absolute path of `X-Sendfile`. Both handle caching headers and ranges themselves.
+
+    Otherwise the file is served by Django with a strong ETag, so a repeated load is a 304 without a
+    body, and a single `Range` is honored, e.g. for resumed downloads. Full responses hand the open
+    file to the server, which sends it with `sendfile()` where supported.
+
+    Raises:
+        Http404: If the file does not exist.
+    """
+    try:
+        path = safe_join(settings.MEDIA_ROOT, name)
+        stat = os.stat(path)
+    except (OSError, SuspiciousFileOperation):
+        raise Http404
+
+    header = get_sendfile_header()
+    if header:
+        response = HttpResponse()
+        del response["Content-Type"]
+        response[header] = get_accel_redirect_prefix() + quote(name) if header == ACCEL_REDIRECT else path
+        return response
+
+    etag = get_etag(stat)
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(path)
+        content_type = content_type or "application/octet-stream"
+        byte_range = None
+        if request.headers.get("If-Range", etag) == etag:
+            try:
+                byte_range = parse_range(request.headers.get("Range"), stat.st_size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+
+        file = open(path, "rb")
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+        else:
+            first, last = byte_range
+            response = FileResponse(RangeFile(file, first, last - first + 1), status=206, content_type=content_type)
+            response["Content-Length"] = last - first + 1
+            response["Content-Range"] = f"bytes {first}-{last}/{stat.st_size}"
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Accept-Ranges"] = "bytes"
+    # Cached by the browser only, and revalidated on each use since access depends on the requester.
+    response["Cache-Control"] = "private, no-cache"
+    return response
@@ -0,0 +1,109 @@
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the newest rows first.
+
+    The primary key breaks ties between rows created at the same instant, so pages stay stable while rows
+    are being inserted. Each list is expected to be backed by a composite index ending in
+    `(-created_at, -id)` so that deep pages cost O(page) rather than O(offset).
+    """
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class DateJoinedCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination over the most recently joined rows first.
+    """
+    ordering = ("-date_joined", "-id")
+
+
+class AnsweredAtCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination over the most recently submitted quizzes first.
+    """
+    ordering = ("-answered_at", "-id")
+
+
+class PrimaryKeyCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination for rows without a timestamp, ordered by their primary key only.
+    """
+    ordering = ("id",)
+
+
+class LeaderboardCursorPagination(CreatedAtCursorPagination):
+    """
+    Keyset pagination over the best average marks first.
+    """
+    ordering = ("-average_mark", "-id")
+
+
+class AsyncCursorPaginationMixin:
+    """
+    Adds `apaginate_queryset` to a cursor pagination, fetching the page with the async ORM.
+
+    The cursor is decoded and the page query built as in `CursorPagination.paginate_queryset`, so the
+    pages and links are the same as the sync views'. Used by the views based on
+    `quiz_room_hub.async_views.AsyncAPIView`.
+    """
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if str(current_position) != "None":
+            order = self.ordering[0]
+            is_reversed = order.startswith("-")
+            order_attr = order.lstrip("-")
+            lookup = "lt" if self.cursor.reverse != is_reversed else "gt"
+            filter_query = Q(**{f"{order_attr}__{lookup}": current_position})
+            # Rows with a null position come last in the reverse order, and must not be lost.
+            if (reverse and not is_reversed) or is_reversed:
+                filter_query |= Q(**{f"{order_attr}__isnull": True})
+            queryset = queryset.filter(filter_query)
+
+        # One more row is fetched to know whether a page follows.
+        results = [obj async for obj in queryset[offset:offset + self.page_size + 1]]
+        self.page = results[:self.page_size]
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+        return self.page
+
+
+class AsyncCreatedAtCursorPagination(AsyncCursorPaginationMixin, CreatedAtCursorPagination):
+    """
+    `CreatedAtCursorPagination` for the async views.
+    """
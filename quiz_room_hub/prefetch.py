@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def resolve_relation(model, path):
+    """
+    Resolves a chain of relation names starting at `model`.
+
+    Args:
+        model: The model class the path starts from.
+        path: A list of field names, e.g. `["question", "quiz"]`.
+
+    Returns:
+        tuple: `(related_model, many)` where `many` is True when any hop of the path is a to-many relation,
+        or None when the path does not name a chain of model relations (e.g. a property or a method).
+    """
+    many = False
+    for name in path:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation or field.related_model is None:
+            return None
+        many = many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    return model, many
+
+
+def walk_serializer(serializer, model, prefix, select, prefetch, many=False):
+    """
+    Collects the relation paths read by the readable fields of `serializer` into `select` and `prefetch`.
+    """
+    for field in serializer.fields.values():
+        if field.write_only or field.source == "*":
+            continue
+
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        source = field.source_attrs
+        is_nested = isinstance(child, serializers.BaseSerializer)
+        is_related = isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField))
+
+        # Plain fields only need the relations in front of the attribute they read (`user.email`).
+        path = source if is_nested or is_related else source[:-1]
+        if not path:
+            continue
+
+        resolved = resolve_relation(model, path)
+        if resolved is None:
+            continue
+        related_model, to_many = resolved
+
+        to_many = many or to_many or isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField))
+        lookup = "__".join(prefix + path)
+        (prefetch if to_many else select).append(lookup)
+
+        if is_nested:
+            walk_serializer(child, related_model, prefix + path, select, prefetch, many=to_many)
+
+
+def collapse(paths):
+    """
+    Drops duplicated paths and paths already covered by a longer one, keeping the declaration order.
+    """
+    unique = list(dict.fromkeys(paths))
+    return tuple(path for path in unique
+                 if not any(other.startswith(f"{path}__") for other in unique))
+
+
+@lru_cache(maxsize=None)
+def get_related_paths(serializer_class):
+    """
+    Derives the `select_related` and `prefetch_related` lookups needed to serialize a model instance.
+
+    The serializer tree is walked once per serializer class: forward foreign keys and one-to-one relations
+    read by nested serializers or dotted sources (e.g. `source="user.email"`) are joined, while reverse
+    and many-to-many relations, and everything below them, are prefetched. Sources that do not resolve
+    to model relations are skipped.
+
+    Args:
+        serializer_class: A `ModelSerializer` subclass.
+
+    Returns:
+        tuple: A `(select_related, prefetch_related)` pair of tuples of lookups.
+    """
+    serializer = serializer_class()
+    select = []
+    prefetch = []
+    walk_serializer(serializer, serializer.Meta.model, [], select, prefetch)
+    return collapse(select), collapse(prefetch)
+
+
+class SerializerPrefetchMixin:
+    """
+    Mixin for generic views that loads the relations read by `serializer_class` along with the queryset.
+
+    The lookups are derived from the serializer tree by `get_related_paths`, so a list endpoint runs the
+    same number of queries whatever the page size.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        select, prefetch = get_related_paths(self.get_serializer_class())
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
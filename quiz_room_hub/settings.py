@@ -2,6 +2,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -36,6 +37,9 @@ INSTALLED_APPS = [
     "classroom",
     "post",
     "quiz",
+    "jobs",
+    "events",
+    "live",
 ]
 
 MIDDLEWARE = [
@@ -119,6 +123,13 @@ AUTH_USER_MODEL = "authuser.User"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Header handing media files to the front proxy once access is checked: "X-Accel-Redirect" (nginx) or
+# "X-Sendfile" (Apache, lighttpd); None serves them from Django with ETag and range support
+MEDIA_SENDFILE_HEADER = os.environ.get("MEDIA_SENDFILE_HEADER") or None
+
+# nginx `internal` location aliased to MEDIA_ROOT, used with X-Accel-Redirect
+MEDIA_ACCEL_REDIRECT_PREFIX = "/protected-media/"
+
 # Rest Framework Configurations
 REST_FRAMEWORK = {
     "TEST_REQUEST_DEFAULT_FORMAT": "json",
@@ -134,6 +145,8 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "quiz_room_hub.pagination.CreatedAtCursorPagination",
+    "PAGE_SIZE": 50,
 }
 
 # Simple JWT Configurations
@@ -189,3 +202,76 @@ SPECTACULAR_SETTINGS = {
 CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:3000",
 ]
+
+# Conditional request headers, so browser clients can revalidate and guard their updates
+CORS_ALLOW_HEADERS = (*default_headers, "if-match", "if-none-match", "if-modified-since")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
+
+# Cache shared by every web and `run_jobs` process. Memberships, classroom response generations and quiz
+# analytics are invalidated by the process making the write, so a per-process cache such as LocMemCache
+# would keep serving stale entries in the others (see `classroom.checks`). Redis is used when REDIS_URL is
+# set, which requires the redis package; otherwise the database cache, created by `manage.py createcachetable`.
+REDIS_URL = os.environ.get("REDIS_URL")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "quizroom_hub_cache"}}
+
+# Seconds a user's classroom membership stays cached (invalidated on membership writes)
+CLASSROOM_MEMBERSHIP_CACHE_TIMEOUT = 60
+
+# Seconds between reloads of the in-memory revocation list used by StatelessJWTAuthentication
+JWT_REVOCATION_REFRESH_INTERVAL = 30
+
+# Seconds a response of a classroom read endpoint is cached for; writes under the classroom bump its generation
+CLASSROOM_RESPONSE_CACHE_TIMEOUT = 300
+
+# Seconds a rendered quiz document is cached for; each quiz version gets its own entry
+QUIZ_DOCUMENT_CACHE_TIMEOUT = 300
+
+# Seconds computed quiz analytics are cached for; the entry is dropped on new answers and submissions
+QUIZ_ANALYTICS_CACHE_TIMEOUT = 600
+
+# Submissions read per query when streaming a gradebook export
+GRADEBOOK_EXPORT_CHUNK_SIZE = 2000
+
+# Rows deleted per statement when purging a deleted classroom
+CLASSROOM_PURGE_BATCH_SIZE = 1000
+
+# Seconds an idle `run_jobs` worker waits before polling the job queue again
+JOBS_POLL_INTERVAL = 1
+
+# Seconds before the first retry of a failed job; each further retry waits twice as long
+JOBS_RETRY_DELAY = 30
+
+# Seconds between the heartbeats a `run_jobs` worker records for the jobs it runs
+JOBS_HEARTBEAT_INTERVAL = 30
+
+# Seconds without a heartbeat after which a running job is considered abandoned by its worker and queued again
+JOBS_STALE_AFTER = 300
+
+# Attempts made at a job before it is marked as failed
+JOBS_MAX_ATTEMPTS = 3
+
+# Square thumbnail sizes, in pixels, rendered in WebP and JPEG for every uploaded profile picture
+PROFILE_PICTURE_THUMBNAIL_SIZES = (64, 256)
+
+# Longest side, in pixels, of the stored full size version of a profile picture
+PROFILE_PICTURE_MAX_SIZE = 1024
+
+# Largest accepted profile picture upload, in bytes
+PROFILE_PICTURE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+
+# Event bus of the classroom activity streams: "events.bus.InProcessEventBus" for a single process, or
+# "events.bus.BrokerEventBus" with EVENTS_BUS_OPTIONS = {"broker": "events.brokers.RedisBroker", "url": ...}
+EVENTS_BUS = "events.bus.InProcessEventBus"
+EVENTS_BUS_OPTIONS = {}
+
+# Seconds between the keep-alive comments sent on idle event streams
+EVENTS_KEEPALIVE_INTERVAL = 15
+
+# Seconds between the answer distributions sent to the host of a live quiz session
+LIVE_TALLY_INTERVAL = 0.5
+
+# Seconds a live quiz session waits for its disconnected host before ending and saving the answers
+LIVE_HOST_TIMEOUT = 300
@@ -1,10 +1,11 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from account.views import ProfilePictureAPIView
+
 urlpatterns = [
                   path('admin/', admin.site.urls),
                   path("api/", include("authuser.urls", namespace="authuser")),
@@ -12,7 +13,10 @@ urlpatterns = [
                   path("api/", include("classroom.urls", namespace="classroom")),
                   path("api/", include("quiz.urls.urls", namespace="quiz")),
                   path("api/", include("post.urls", namespace="post")),
+                  path("api/", include("jobs.urls", namespace="jobs")),
+                  path("api/", include("events.urls", namespace="events")),
                   path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
                   path('api/schema/swagger-ui/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
                   path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-              ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+                  path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", ProfilePictureAPIView.as_view(), name="media"),
+              ]